@@ -0,0 +1,4 @@
+"""Benchmarks for routers generated by DataMapperBuilder.
+
+Run with ``python -m benchmarks --help`` after ``pip install -e .[bench]``.
+"""
@@ -0,0 +1,76 @@
+"""Command line entry point: ``python -m benchmarks``."""
+import argparse
+import asyncio
+import json
+import sys
+from dataclasses import asdict
+from pathlib import Path
+
+from benchmarks.report import compare, format_table, load_report, make_report, save_report
+from benchmarks.runner import BenchConfig, run
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Benchmark DataMapperBuilder routes against in-memory SQLite.",
+    )
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--alloc-samples", type=int, default=50)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--width", type=int, default=20, help="extra parent columns")
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument(
+        "--builder-arguments",
+        type=json.loads,
+        default=None,
+        help="BuilderArguments as JSON, e.g. '{\"list_query_strategy\": \"CONCURRENT\"}'",
+    )
+    parser.add_argument("--scenario", action="append", dest="scenarios")
+    parser.add_argument("--output", type=Path, default=Path("benchmark-results.json"))
+    parser.add_argument("--compare", type=Path, help="previous results file")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=10.0,
+        help="percent change that counts as a regression in --compare",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    config = BenchConfig(
+        requests=args.requests,
+        warmup=args.warmup,
+        concurrency=args.concurrency,
+        alloc_samples=args.alloc_samples,
+        rows=args.rows,
+        width=args.width,
+        page_size=args.page_size,
+        builder_arguments=args.builder_arguments,
+        scenarios=tuple(args.scenarios) if args.scenarios else None,
+    )
+
+    results = asyncio.run(run(config))
+    report = make_report(asdict(config), results)
+    save_report(report, args.output)
+
+    print(format_table(results))
+    print("\nsaved to {0}".format(args.output))
+
+    if args.compare is None:
+        return 0
+
+    table, regressions = compare(load_report(args.compare), report, args.threshold)
+    print("\nchange against {0}\n{1}".format(args.compare, table))
+    for regression in regressions:
+        print("regression: {0}".format(regression))
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""Synthetic SQLAlchemy models for benchmarks."""
+import datetime
+from dataclasses import dataclass
+from itertools import cycle
+from typing import Any
+
+from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy.orm import DeclarativeBase, DeclarativeMeta, mapped_column, relationship
+
+wide_column_types = (Integer, String(64), Boolean, DateTime, Text)
+
+
+@dataclass
+class BenchModels:
+    base: type[DeclarativeBase]
+    parent: DeclarativeMeta
+    child: DeclarativeMeta
+    tag: DeclarativeMeta
+    parent_tag: DeclarativeMeta
+    wide_columns: dict[str, Any]
+
+
+def utcnow() -> datetime.datetime:
+    return datetime.datetime.utcnow()
+
+
+def sample_value(column_type: Any, seed: int) -> Any:
+    if column_type is Integer:
+        return seed
+    if column_type is Boolean:
+        return bool(seed % 2)
+    if column_type is DateTime:
+        return datetime.datetime(2023, 1, 1) + datetime.timedelta(seconds=seed)
+    if column_type is Text:
+        return "text {0} ".format(seed) * 8
+
+    return "value {0}".format(seed)
+
+
+def build_models(width: int = 20) -> BenchModels:
+    """Create a wide parent table with nested children and an M2M secondary to tags."""
+
+    class Base(DeclarativeBase):
+        ...
+
+    wide_columns = {}
+    parent_attrs: dict[str, Any] = {
+        "__tablename__": "bench_parent",
+        "id": mapped_column(Integer, primary_key=True),
+        "name": mapped_column(String(64)),
+        "updated_at": mapped_column(DateTime, default=utcnow, onupdate=utcnow),
+    }
+    for index, column_type in zip(range(width), cycle(wide_column_types)):
+        column_name = "field_{0}".format(index)
+        wide_columns[column_name] = column_type
+        parent_attrs[column_name] = mapped_column(
+            column_type, default=sample_value(column_type, index)
+        )
+
+    child = type(
+        "BenchChildModel",
+        (Base,),
+        {
+            "__tablename__": "bench_child",
+            "id": mapped_column(Integer, primary_key=True),
+            "title": mapped_column(String(64)),
+            "parent_id": mapped_column(ForeignKey("bench_parent.id")),
+        },
+    )
+    parent_attrs["children"] = relationship(child, lazy="selectin")
+    parent = type("BenchParentModel", (Base,), parent_attrs)
+
+    tag = type(
+        "BenchTagModel",
+        (Base,),
+        {
+            "__tablename__": "bench_tag",
+            "id": mapped_column(Integer, primary_key=True),
+            "label": mapped_column(String(32)),
+        },
+    )
+    parent_tag = type(
+        "BenchParentTagModel",
+        (Base,),
+        {
+            "__tablename__": "bench_parent_tag",
+            "parent_id": mapped_column(
+                ForeignKey("bench_parent.id"), primary_key=True
+            ),
+            "tag_id": mapped_column(ForeignKey("bench_tag.id"), primary_key=True),
+        },
+    )
+
+    return BenchModels(
+        base=Base,
+        parent=parent,
+        child=child,
+        tag=tag,
+        parent_tag=parent_tag,
+        wide_columns=wide_columns,
+    )
+
+
+def parent_row(models: BenchModels, seed: int) -> dict[str, Any]:
+    row = {"name": "parent {0}".format(seed)}
+    for column_name, column_type in models.wide_columns.items():
+        row[column_name] = sample_value(column_type, seed)
+
+    return row
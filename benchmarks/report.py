@@ -0,0 +1,87 @@
+"""Result files: save, print and compare against a previous run."""
+import datetime
+import json
+import platform
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Any
+
+tracked_packages = ("easy_api_autobuilder", "fastapi", "pydantic", "sqlalchemy")
+columns = (
+    ("throughput_rps", "rps"),
+    ("p50_ms", "p50 ms"),
+    ("p99_ms", "p99 ms"),
+    ("queries_per_request", "queries"),
+    ("alloc_peak_kib_per_request", "alloc KiB"),
+    ("cpu_us_per_row", "us/row"),
+    ("alloc_kib_per_row", "KiB/row"),
+    ("errors", "errors"),
+)
+# metrics where a larger value is an improvement
+higher_is_better = frozenset(("throughput_rps",))
+
+
+def package_version(name: str) -> str | None:
+    try:
+        return version(name)
+    except PackageNotFoundError:
+        return None
+
+
+def make_report(config: dict[str, Any], results: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "meta": {
+            "created_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "packages": {name: package_version(name) for name in tracked_packages},
+            "config": config,
+        },
+        "results": results,
+    }
+
+
+def save_report(report: dict[str, Any], path: Path) -> None:
+    path.write_text(json.dumps(report, indent=2))
+
+
+def load_report(path: Path) -> dict[str, Any]:
+    return json.loads(path.read_text())
+
+
+def format_table(results: dict[str, Any]) -> str:
+    header = ["route".ljust(18)] + [title.rjust(10) for _, title in columns]
+    lines = ["".join(header)]
+    for route, metrics in results.items():
+        cells = [route.ljust(18)]
+        cells.extend("{0:10.2f}".format(metrics[key]) for key, _ in columns)
+        lines.append("".join(cells))
+
+    return "\n".join(lines)
+
+
+def compare(
+    baseline: dict[str, Any], current: dict[str, Any], threshold: float
+) -> tuple[str, list[str]]:
+    """Return a delta table and the metrics that regressed by more than threshold percent."""
+    lines = []
+    regressions = []
+    for route, metrics in current["results"].items():
+        previous = baseline["results"].get(route)
+        if previous is None:
+            continue
+
+        cells = [route.ljust(18)]
+        for key, _ in columns:
+            # files written before a metric existed lack it
+            old, new = previous.get(key, 0.0), metrics[key]
+            change = (new - old) / old * 100 if old else 0.0
+            cells.append("{0:+9.1f}%".format(change))
+
+            worse = -change if key in higher_is_better else change
+            if key != "errors" and worse > threshold:
+                regressions.append("{0}.{1}: {2:+.1f}%".format(route, key, change))
+
+        lines.append("".join(cells))
+
+    header = "".join(["route".ljust(18)] + [title.rjust(10) for _, title in columns])
+    return "\n".join([header, *lines]), regressions
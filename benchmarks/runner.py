@@ -0,0 +1,251 @@
+"""Build the benchmark app and measure every scenario in-process."""
+import asyncio
+import contextlib
+import statistics
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Any, AsyncIterator
+from uuid import uuid4
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from benchmarks.models import BenchModels, build_models, parent_row
+from benchmarks.scenarios import Fixture, RequestSpec, Scenario, build_scenarios
+from easy_api_autobuilder import BuilderArguments, DataMapperBuilder, SchemaRegistry
+
+
+@dataclass
+class BenchConfig:
+    requests: int = 500
+    warmup: int = 50
+    concurrency: int = 1
+    alloc_samples: int = 50
+    rows: int = 1000
+    width: int = 20
+    page_size: int = 50
+    builder_arguments: dict | None = None
+    scenarios: tuple[str, ...] | None = None
+
+
+@dataclass
+class ScenarioResult:
+    requests: int
+    errors: int
+    throughput_rps: float
+    p50_ms: float
+    p99_ms: float
+    mean_ms: float
+    queries_per_request: float
+    alloc_peak_kib_per_request: float
+    # client and server share the process, CPU time includes both
+    cpu_us_per_row: float
+    alloc_kib_per_row: float
+
+
+class QueryCounter:
+    def __init__(self, engine: AsyncEngine):
+        self.count = 0
+        event.listen(engine.sync_engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args: Any) -> None:
+        self.count += 1
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    index = min(int(round(fraction * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+async def seed(
+    session_factory: async_sessionmaker, models: BenchModels, config: BenchConfig
+) -> Fixture:
+    per_scenario = config.warmup + config.requests + config.alloc_samples
+    tags = max(per_scenario // config.rows + 2, 2)
+
+    parents = [parent_row(models, seed) for seed in range(config.rows + per_scenario)]
+    children = [
+        {"title": "child {0}".format(index), "parent_id": index % config.rows + 1}
+        for index in range(config.rows * 3)
+    ]
+    async with session_factory() as session:
+        await session.execute(insert(models.parent), parents)
+        await session.execute(insert(models.child), children)
+        await session.execute(
+            insert(models.tag),
+            [{"label": "tag {0}".format(index)} for index in range(tags)],
+        )
+        await session.execute(
+            insert(models.parent_tag),
+            [{"parent_id": index + 1, "tag_id": 1} for index in range(config.rows)],
+        )
+        await session.commit()
+
+    return Fixture(
+        models=models,
+        rows=config.rows,
+        delete_offset=config.rows,
+        deletable=per_scenario,
+        tags=tags,
+        page_size=config.page_size,
+    )
+
+
+def build_app(
+    models: BenchModels, session_factory: async_sessionmaker, config: BenchConfig
+) -> FastAPI:
+    arguments = BuilderArguments.model_validate(config.builder_arguments or {})
+    app = FastAPI()
+    builder = DataMapperBuilder(
+        "/parents",
+        models.parent,
+        secondary={"tags": (models.parent_tag, None)},
+        arguments=arguments,
+        session_factory=session_factory,
+        registry=SchemaRegistry.for_app(app),
+    )
+    app.include_router(builder.build().router)
+    return app
+
+
+async def send(client: httpx.AsyncClient, spec: RequestSpec) -> httpx.Response:
+    return await client.request(spec.method, spec.url, json=spec.json, params=spec.params)
+
+
+async def measure_latency(
+    client: httpx.AsyncClient, scenario: Scenario, start: int, config: BenchConfig
+) -> tuple[list[float], int, float]:
+    latencies: list[float] = []
+    errors = 0
+    next_index = iter(range(start, start + config.requests))
+
+    async def worker() -> None:
+        nonlocal errors
+        for index in next_index:
+            began = time.perf_counter()
+            response = await send(client, scenario.make_request(index))
+            latencies.append(time.perf_counter() - began)
+            errors += response.status_code >= 400
+
+    began = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(config.concurrency)))
+    return latencies, errors, time.perf_counter() - began
+
+
+async def measure_allocations(
+    client: httpx.AsyncClient, scenario: Scenario, start: int, config: BenchConfig
+) -> float:
+    if not config.alloc_samples:
+        return 0.0
+
+    peaks = []
+    tracemalloc.start()
+    try:
+        for index in range(start, start + config.alloc_samples):
+            spec = scenario.make_request(index)
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            await send(client, spec)
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - current)
+    finally:
+        tracemalloc.stop()
+
+    return statistics.fmean(peaks) / 1024
+
+
+def check_capacity(scenario: Scenario, config: BenchConfig) -> None:
+    """ValueError when the run needs more distinct requests than the rows allow."""
+    issued = config.warmup + config.requests + config.alloc_samples
+    if scenario.capacity is not None and issued > scenario.capacity:
+        raise ValueError(
+            "scenario {0} issues {1} requests, its rows allow {2}".format(
+                scenario.name, issued, scenario.capacity
+            )
+        )
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    counter: QueryCounter,
+    config: BenchConfig,
+) -> ScenarioResult:
+    check_capacity(scenario, config)
+    for index in range(config.warmup):
+        await send(client, scenario.make_request(index))
+
+    queries_before = counter.count
+    cpu_before = time.process_time()
+    latencies, errors, elapsed = await measure_latency(
+        client, scenario, config.warmup, config
+    )
+    cpu = time.process_time() - cpu_before
+    queries = counter.count - queries_before
+
+    alloc_kib = await measure_allocations(
+        client, scenario, config.warmup + config.requests, config
+    )
+    rows = config.requests * scenario.rows_per_request
+
+    return ScenarioResult(
+        requests=config.requests,
+        errors=errors,
+        throughput_rps=config.requests / elapsed,
+        p50_ms=percentile(latencies, 0.5) * 1000,
+        p99_ms=percentile(latencies, 0.99) * 1000,
+        mean_ms=statistics.fmean(latencies) * 1000,
+        queries_per_request=queries / config.requests,
+        alloc_peak_kib_per_request=alloc_kib,
+        cpu_us_per_row=cpu / rows * 1e6 if rows else 0.0,
+        alloc_kib_per_row=(
+            alloc_kib / scenario.rows_per_request if scenario.rows_per_request else 0.0
+        ),
+    )
+
+
+@contextlib.asynccontextmanager
+async def bench_engine() -> AsyncIterator[AsyncEngine]:
+    # shared-cache in-memory database, so every pooled connection sees the same tables
+    url = "sqlite+aiosqlite:///file:bench-{0}?mode=memory&cache=shared&uri=true".format(
+        uuid4().hex
+    )
+    engine = create_async_engine(url, poolclass=AsyncAdaptedQueuePool)
+    try:
+        # the database lives as long as one connection to it stays open
+        async with engine.connect():
+            yield engine
+    finally:
+        await engine.dispose()
+
+
+async def run(config: BenchConfig) -> dict[str, dict[str, Any]]:
+    models = build_models(config.width)
+
+    async with bench_engine() as engine:
+        async with engine.begin() as connection:
+            await connection.run_sync(models.base.metadata.create_all)
+
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+        fixture = await seed(session_factory, models, config)
+        counter = QueryCounter(engine)
+
+        results = {}
+        app = build_app(models, session_factory, config)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench"
+        ) as client:
+            for scenario in build_scenarios(fixture):
+                if config.scenarios and scenario.name not in config.scenarios:
+                    continue
+
+                result = await run_scenario(client, scenario, counter, config)
+                results[scenario.name] = asdict(result)
+
+    return results
@@ -0,0 +1,101 @@
+"""Requests issued against the generated routes, one scenario per route."""
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from pydantic_core import to_jsonable_python
+
+from benchmarks.models import BenchModels, parent_row
+
+
+@dataclass
+class RequestSpec:
+    method: str
+    url: str
+    json: Any = None
+    params: dict | None = None
+
+
+@dataclass
+class Scenario:
+    name: str
+    make_request: Callable[[int], RequestSpec]
+    # number of distinct requests the scenario can issue before it runs out of rows,
+    # the runner refuses to issue more
+    capacity: int | None = None
+    # rows a response carries, per row metrics are left at 0 without them
+    rows_per_request: int = 0
+
+
+@dataclass
+class Fixture:
+    """Row id ranges seeded before the run."""
+
+    models: BenchModels
+    rows: int
+    delete_offset: int
+    # parents seeded past delete_offset for the delete scenario
+    deletable: int
+    tags: int
+    page_size: int
+
+
+def build_scenarios(fixture: Fixture) -> list[Scenario]:
+    models = fixture.models
+    rows = fixture.rows
+
+    def list_request(index: int) -> RequestSpec:
+        page = index % max(rows // fixture.page_size, 1) + 1
+        return RequestSpec(
+            "GET", "/parents", params={"page": page, "size": fixture.page_size}
+        )
+
+    def detail_request(index: int) -> RequestSpec:
+        return RequestSpec("GET", "/parents/{0}".format(index % rows + 1))
+
+    def secondary_list_request(index: int) -> RequestSpec:
+        return RequestSpec("GET", "/parents/{0}/tags".format(index % rows + 1))
+
+    def put_request(index: int) -> RequestSpec:
+        return RequestSpec(
+            "PUT",
+            "/parents/{0}".format(index % rows + 1),
+            json={"name": "renamed {0}".format(index)},
+        )
+
+    def post_request(index: int) -> RequestSpec:
+        return RequestSpec(
+            "POST",
+            "/parents",
+            json=to_jsonable_python(parent_row(models, rows + index)),
+        )
+
+    def secondary_pair(index: int) -> tuple[int, int]:
+        # tags linked during seeding occupy the first tag of every parent
+        return index // (fixture.tags - 1) + 1, index % (fixture.tags - 1) + 2
+
+    def secondary_post_request(index: int) -> RequestSpec:
+        parent_id, tag_id = secondary_pair(index)
+        return RequestSpec(
+            "POST", "/parents/tags", json={"parent_id": parent_id, "tag_id": tag_id}
+        )
+
+    def secondary_delete_request(index: int) -> RequestSpec:
+        parent_id, tag_id = secondary_pair(index)
+        return RequestSpec("DELETE", "/parents/{0}/tags/{1}".format(parent_id, tag_id))
+
+    def delete_request(index: int) -> RequestSpec:
+        return RequestSpec(
+            "DELETE", "/parents/{0}".format(fixture.delete_offset + index + 1)
+        )
+
+    secondary_capacity = rows * (fixture.tags - 1)
+    return [
+        Scenario("list", list_request, rows_per_request=fixture.page_size),
+        Scenario("detail", detail_request, rows_per_request=1),
+        Scenario("secondary_list", secondary_list_request),
+        Scenario("put", put_request),
+        Scenario("post", post_request),
+        Scenario("secondary_post", secondary_post_request, secondary_capacity),
+        Scenario("secondary_delete", secondary_delete_request, secondary_capacity),
+        Scenario("delete", delete_request, fixture.deletable),
+    ]
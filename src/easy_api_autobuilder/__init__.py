@@ -1,44 +1,137 @@
 from easy_api_autobuilder.arguments import (
+    AdmissionArguments,
+    AdmissionBudget,
+    AggregateArguments,
     BaseCreationArguments,
     BuilderArguments,
+    ChangesArguments,
     DetailArguments,
+    FacetArguments,
+    ImportArguments,
     ListArguments,
+    OpenAPIArguments,
     PostArguments,
     PutArguments,
+    ReadOnlyArguments,
     SchemaCreationArguments,
+    SlowQueryArguments,
+    StatementTimeoutArguments,
+    WriteBehindArguments,
+)
+from easy_api_autobuilder.base_enum import (
+    AggregateFunctionEnum,
+    ListQueryStrategyEnum,
+    OrderDirectionEnum,
+    ResponseEncodingEnum,
 )
-from easy_api_autobuilder.base_enum import OrderDirectionEnum
 from easy_api_autobuilder.builder import (
     DataMapperBuilder,
+    configured_repo_factory,
     repo_deps_factory,
     repo_factory,
     secondary_repo_factory,
     secondary_service_factory,
     service_deps_factory,
     service_factory,
+    session_dependency_factory,
+    target_repo_factory,
+)
+from easy_api_autobuilder.cache import TTLCache
+from easy_api_autobuilder.openapi import (
+    FragmentStore,
+    OpenAPIDocument,
+    model_fingerprint,
+    model_metadata,
+    related_models,
+    router_fragment,
+)
+from easy_api_autobuilder.page import ChangeFeed, ChangesParams, Page, PageParams
+from easy_api_autobuilder.profiling import (
+    ProfilingMiddleware,
+    Timings,
+    profile_signature,
+    profile_token,
+    request_timings,
+    timed,
+)
+from easy_api_autobuilder.repo import (
+    BaseRepo,
+    QueryShape,
+    SecondaryBaseRepo,
+    SeekCursor,
+    SlowQueryLog,
+    StatementTimeout,
+    WriteBatcher,
+    begin_read_only,
+    read_only,
+    read_only_options,
+    session_context,
+    slow_query_context,
+    statement_timeout,
+)
+from easy_api_autobuilder.response import (
+    EncodedResponse,
+    PageStream,
+    PageStreamResponse,
+    encode_page,
+    response_class_factory,
 )
-from easy_api_autobuilder.page import Page, PageParams
-from easy_api_autobuilder.repo import BaseRepo, SecondaryBaseRepo
 from easy_api_autobuilder.schema import (
+    AggregateResult,
+    AggregateRow,
     BaseModel,
     BaseSchemaCreationStrategy,
+    BatchOperation,
+    BatchOperationResult,
+    BatchRequest,
+    BatchResult,
+    ExpansionVariant,
+    Facet,
+    FacetResult,
+    FacetValue,
+    ImportResult,
+    ImportRowError,
     IntegerIdSchema,
     RequestTypes,
     SchemaCreationStrategy,
+    SchemaExpansion,
     SchemaFactory,
+    SchemaRegistry,
     SecondarySchemaCreationStrategy,
     StrategyReturn,
     UUIDIdSchema,
+    arguments_hash,
+    default_registry,
+    defer_unused_columns,
+    eager_load_relationships,
     post_response_schema_factory,
+    schema_columns,
+    schema_load_options,
 )
 from easy_api_autobuilder.service import (
+    AggregateService,
     BaseRepoService,
     BaseService,
+    ChangesService,
     DeleteService,
     DetailService,
+    FacetService,
+    ImportService,
     ListService,
     PostService,
     PutService,
     SecondaryBaseService,
+    eval_filters,
+)
+from easy_api_autobuilder.view import (
+    AdmissionController,
+    BaseView,
+    ExcludeFieldAnnotation,
+    SecondaryView,
+    SessionBoundService,
+    batch_router,
+    exclude_parameter,
+    slow_query_router,
+    warmup_handlers,
+    warmup_lifespan,
 )
-from easy_api_autobuilder.view import BaseView, ExcludeFieldAnnotation, SecondaryView, exclude_parameter
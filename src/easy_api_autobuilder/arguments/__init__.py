@@ -1,4 +1,17 @@
 from easy_api_autobuilder.arguments.arguments import BuilderArguments
+from easy_api_autobuilder.arguments.openapi import OpenAPIArguments
+from easy_api_autobuilder.arguments.routes import (
+    AdmissionArguments,
+    AdmissionBudget,
+    AggregateArguments,
+    ChangesArguments,
+    FacetArguments,
+    ImportArguments,
+    ReadOnlyArguments,
+    SlowQueryArguments,
+    StatementTimeoutArguments,
+    WriteBehindArguments,
+)
 from easy_api_autobuilder.arguments.schema_factory import (
     BaseCreationArguments,
     DetailArguments,
@@ -1,7 +1,55 @@
 from pydantic import BaseModel
 
+from easy_api_autobuilder.arguments.openapi import OpenAPIArguments
+from easy_api_autobuilder.arguments.routes import (
+    AdmissionArguments,
+    AggregateArguments,
+    ChangesArguments,
+    FacetArguments,
+    ImportArguments,
+    ReadOnlyArguments,
+    SlowQueryArguments,
+    StatementTimeoutArguments,
+    WriteBehindArguments,
+)
 from easy_api_autobuilder.arguments.schema_factory import SchemaCreationArguments
+from easy_api_autobuilder.base_enum import ListQueryStrategyEnum, ResponseEncodingEnum
 
 
 class BuilderArguments(BaseModel):
     schema_creation_args: SchemaCreationArguments | None = None
+    # CONCURRENT requires DataMapperBuilder(session_factory=...)
+    list_query_strategy: ListQueryStrategyEnum = ListQueryStrategyEnum.CONSISTENT
+    # build services and repos once per route, pass the session through session_context
+    stateless_services: bool = False
+    # None keeps FastAPI's own response serialization
+    response_encoding: ResponseEncodingEnum | None = None
+    # gzip bodies of at least this many bytes for clients accepting gzip
+    gzip_min_size: int | None = None
+    # adds GET /aggregate when set
+    aggregate: AggregateArguments | None = None
+    # adds GET /facets when set, distinct values and counts of filterable fields
+    facets: FacetArguments | None = None
+    # adds GET /changes when set, the model needs an updated_at or version column
+    changes: ChangesArguments | None = None
+    # adds POST /import taking NDJSON or CSV records of the post schema
+    bulk_import: ImportArguments | None = None
+    # batch concurrent POSTs into multi-row inserts, requires session_factory
+    write_behind: WriteBehindArguments | None = None
+    # per route concurrency limits with 503 load shedding
+    admission: AdmissionArguments | None = None
+    # statements over the deadline fail the request with 504
+    statement_timeouts: StatementTimeoutArguments | None = None
+    # GET routes read outside of a writable transaction
+    read_only: ReadOnlyArguments | None = None
+    # log statements over a threshold, see DataMapperBuilder.slow_query_log
+    slow_queries: SlowQueryArguments | None = None
+    # cancel the handler when the client disconnects, answered with the non standard
+    # 499 of nginx that only access logs see. The query stops with it on PostgreSQL
+    # drivers that cancel on task cancellation, e.g. asyncpg; elsewhere it runs on
+    cancel_on_disconnect: bool = False
+    # list and detail select only the schema columns, as rows instead of ORM objects,
+    # schemas with relationships keep the ORM path
+    core_reads: bool = False
+    # build the OpenAPI fragment of the router with the router, see OpenAPIDocument
+    openapi: OpenAPIArguments | None = None
@@ -0,0 +1,6 @@
+from pydantic import BaseModel
+
+
+class OpenAPIArguments(BaseModel):
+    # keep fragments as <fingerprint>.json files here, None keeps them in memory
+    cache_dir: str | None = None
@@ -0,0 +1,94 @@
+from pydantic import BaseModel
+
+
+class AdmissionBudget(BaseModel):
+    # requests running at once per route
+    concurrency: int
+    # requests waiting for a slot before new ones get 503
+    queue_size: int
+
+
+class AdmissionArguments(BaseModel):
+    # slots are taken once FastAPI parsed the body and resolved dependencies,
+    # the limits protect the database, not request parsing
+    # detail and write routes
+    cheap: AdmissionBudget = AdmissionBudget(concurrency=32, queue_size=64)
+    # list, aggregate, facets, changes and import routes
+    expensive: AdmissionBudget = AdmissionBudget(concurrency=8, queue_size=16)
+    # seconds a queued request waits for a slot, None to wait as long as it takes
+    queue_timeout: float | None = 5
+    retry_after: int = 1
+
+
+class AggregateArguments(BaseModel):
+    # seconds a result is served from memory, None to always query
+    cache_ttl: float | None = None
+    cache_size: int = 256
+
+
+class FacetArguments(BaseModel):
+    # distinct values returned per field, most frequent first
+    limit: int = 20
+    # seconds a result is served from memory, writes of the route clear it,
+    # None to always query
+    cache_ttl: float | None = 60
+    cache_size: int = 256
+
+
+class ImportArguments(BaseModel):
+    # records per multi-row insert
+    chunk_size: int = 1000
+    # commit after every chunk instead of once at the end
+    commit_per_chunk: bool = False
+    max_errors: int = 100
+    max_line_bytes: int = 1024 * 1024
+
+
+class StatementTimeoutArguments(BaseModel):
+    # seconds per repo statement, None for no deadline. PostgreSQL cancels the
+    # statement server side with SET LOCAL statement_timeout. Other dialects, and
+    # PostgreSQL in autocommit, only stop awaiting it: the request gets its 504 but
+    # the query runs on in the database, SQLite's in the aiosqlite thread
+    default: float | None = None
+    # by handler name: list, detail, post, put, delete, aggregate, facets, changes,
+    # bulk_import
+    routes: dict[str, float | None] = {}
+
+    def for_handler(self, handler_name: str) -> float | None:
+        return self.routes.get(handler_name, self.default)
+
+
+class WriteBehindArguments(BaseModel):
+    # flush once this many creates are queued
+    max_batch_size: int = 100
+    # or this many milliseconds after the first one
+    max_latency_ms: float = 5
+
+
+class ChangesArguments(BaseModel):
+    # seek column, the first of default_change_fields the model has when None
+    field: str | None = None
+    # bool or nullable column marking soft deleted rows, sent as tombstones
+    soft_delete_field: str | None = None
+
+
+class ReadOnlyArguments(BaseModel):
+    # statements of GET routes run in autocommit, no BEGIN or ROLLBACK round trips;
+    # their statement_timeouts are then asyncio deadlines, not SET LOCAL
+    autocommit: bool = False
+    # else a READ ONLY transaction, PostgreSQL only, in one REPEATABLE READ snapshot
+    # for the list count and page queries when consistent
+    consistent: bool = False
+    # SERIALIZABLE READ ONLY DEFERRABLE instead, waits for a safe snapshot
+    deferrable: bool = False
+
+
+class SlowQueryArguments(BaseModel):
+    # repo statements taking longer are logged and ranked
+    threshold_ms: float = 200
+    # read the plan of a slow statement on its connection
+    explain: bool = False
+    # slowest query shapes kept for the admin router
+    top_n: int = 20
+    # log parameter values instead of their types, they may hold client data
+    log_values: bool = False
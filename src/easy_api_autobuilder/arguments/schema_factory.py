@@ -15,16 +15,26 @@ class BaseCreationArguments(BaseModel):
 class ListArguments(BaseCreationArguments):
     nested: bool = False
     name_postfix: str = "List"
+    # leave Text, JSON and LargeBinary columns out of the schema (and the query) unless included
+    defer_large: bool = False
+    # accept ?expand=<relationship> to embed related rows in the response
+    expand: bool = False
+    # encode the page row by row while the rows are fetched, requires session_factory
+    stream: bool = False
 
 
 class DetailArguments(BaseCreationArguments):
     name_postfix: str = "Detail"
+    expand: bool = False
 
 
 class PostArguments(BaseCreationArguments):
     excluded: set = default_excluded_fields
     nested: bool = False
     name_postfix: str = "InCreate"
+    # one-to-many relationships whose children the body may list, inserted with
+    # the parent in one transaction, requires INSERT ... RETURNING
+    nested_create: set[str] | None = None
 
 
 class PutArguments(BaseCreationArguments):
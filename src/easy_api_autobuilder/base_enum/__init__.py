@@ -1 +1,6 @@
-from easy_api_autobuilder.base_enum.enums import OrderDirectionEnum
+from easy_api_autobuilder.base_enum.enums import (
+    AggregateFunctionEnum,
+    ListQueryStrategyEnum,
+    OrderDirectionEnum,
+    ResponseEncodingEnum,
+)
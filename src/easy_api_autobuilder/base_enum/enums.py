@@ -4,3 +4,38 @@ from enum import StrEnum
 class OrderDirectionEnum(StrEnum):
     ASC = "ASC"
     DESC = "DESC"
+
+
+class AggregateFunctionEnum(StrEnum):
+    SUM = "sum"
+    MIN = "min"
+    MAX = "max"
+    AVG = "avg"
+
+
+class ListQueryStrategyEnum(StrEnum):
+    """How the list route runs its count and page queries.
+
+    CONSISTENT: both queries run one after another on the request session, inside one
+    transaction. At the default READ COMMITTED level each statement still sees its
+    own snapshot, a write committed in between shows in one and not the other; for
+    one snapshot use ReadOnlyArguments.consistent, REPEATABLE READ on PostgreSQL.
+    CONCURRENT: both queries run at the same time on two pooled connections taken from
+    the builder session factory. Latency is max(count, page) instead of their sum,
+    but a concurrent write may land between them.
+    """
+
+    CONSISTENT = "CONSISTENT"
+    CONCURRENT = "CONCURRENT"
+
+
+class ResponseEncodingEnum(StrEnum):
+    """Body encoding of generated routes.
+
+    JSON: pydantic-core serializes the response models to JSON bytes.
+    MSGPACK: MessagePack for clients sending ``Accept: application/msgpack``,
+    JSON for everyone else. Needs the msgpack package.
+    """
+
+    JSON = "JSON"
+    MSGPACK = "MSGPACK"
@@ -1,9 +1,12 @@
 from easy_api_autobuilder.builder.base import (
     DataMapperBuilder,
+    configured_repo_factory,
     repo_deps_factory,
     repo_factory,
     secondary_repo_factory,
     secondary_service_factory,
     service_deps_factory,
     service_factory,
+    session_dependency_factory,
+    target_repo_factory,
 )
@@ -1,19 +1,50 @@
-from typing import Annotated
+from typing import Annotated, AsyncIterator
 
 from fastapi import APIRouter, Depends
 from fastapi.params import Depends as DependsClass
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.orm import DeclarativeMeta
 
-from easy_api_autobuilder.arguments import BuilderArguments
-from easy_api_autobuilder.repo import BaseRepo, SecondaryBaseRepo
-from easy_api_autobuilder.schema import SchemaCreationStrategy, SchemaFactory, SecondarySchemaCreationStrategy
+from easy_api_autobuilder.arguments import (
+    BuilderArguments,
+    ChangesArguments,
+    FacetArguments,
+    ImportArguments,
+    WriteBehindArguments,
+)
+from easy_api_autobuilder.base_enum import ListQueryStrategyEnum, ResponseEncodingEnum
+from easy_api_autobuilder.cache import TTLCache
+from easy_api_autobuilder.constants.constants import default_change_fields
+from easy_api_autobuilder.openapi import FragmentStore, model_fingerprint, router_fragment
+from easy_api_autobuilder.repo import (
+    BaseRepo,
+    SecondaryBaseRepo,
+    SeekCursor,
+    SlowQueryLog,
+    WriteBatcher,
+)
+from easy_api_autobuilder.response import EncodedResponse, response_class_factory
+from easy_api_autobuilder.schema import (
+    SchemaCreationStrategy,
+    SchemaFactory,
+    SchemaRegistry,
+    SecondarySchemaCreationStrategy,
+)
 from easy_api_autobuilder.service import BaseService, SecondaryBaseService
-from easy_api_autobuilder.view import BaseView, SecondaryView
+from easy_api_autobuilder.view import BaseView, SecondaryView, SessionBoundService
 
 
 def service_factory(
-    schema_strategy: SchemaCreationStrategy, class_name: str | None = None
+    schema_strategy: SchemaCreationStrategy,
+    class_name: str | None = None,
+    aggregate_cache: TTLCache | None = None,
+    facets: FacetArguments | None = None,
+    facet_cache: TTLCache | None = None,
+    changes: ChangesArguments | None = None,
+    changes_cursor: SeekCursor | None = None,
+    bulk_import: ImportArguments | None = None,
+    write_batcher: WriteBatcher | None = None,
+    core_reads: bool = False,
 ) -> type[BaseService]:
     class AnonymousService(BaseService):
         _output_list = schema_strategy.list.response
@@ -22,6 +53,28 @@ def service_factory(
         _input_create = schema_strategy.post.request.body
         _create_response = schema_strategy.post.response
         _input_update = schema_strategy.put.request.body
+        _list_load_options = schema_strategy.list.load_options
+        _detail_load_options = schema_strategy.detail.load_options
+        _list_expansion = schema_strategy.list.expansion
+        _stream_list = schema_strategy.list.stream
+        _core_reads = core_reads
+        _list_columns = schema_strategy.list.columns
+        _detail_columns = schema_strategy.detail.columns
+        _detail_expansion = schema_strategy.detail.expansion
+        _aggregate_cache = aggregate_cache
+        _facets = facets
+        _facet_cache = facet_cache
+        _output_changes = schema_strategy.changes.response
+        _changes_data_type = schema_strategy.changes.inner_response_type
+        _changes_load_options = schema_strategy.changes.load_options
+        _changes = changes
+        _changes_cursor = changes_cursor
+        _import = bulk_import
+        _input_import = schema_strategy.bulk_import.request.record_body
+        _write_batcher = write_batcher
+        _nested_create = tuple(
+            sorted(schema_strategy.arguments.post_args.nested_create or ())
+        )
 
     if class_name is not None:
         AnonymousService.__name__ = class_name
@@ -30,11 +83,17 @@ def service_factory(
 
 
 def secondary_service_factory(
-    schema_strategy: SecondarySchemaCreationStrategy, class_name: str | None = None
+    schema_strategy: SecondarySchemaCreationStrategy,
+    class_name: str | None = None,
+    core_reads: bool = False,
 ) -> type[SecondaryBaseService]:
     class AnonymousSecondaryService(SecondaryBaseService):
         _output_list = schema_strategy.list.response
         _input_create = schema_strategy.post.request.body
+        _list_load_options = schema_strategy.list.load_options
+        _inner_data_type = schema_strategy.list.inner_response_type
+        _core_reads = core_reads
+        _list_columns = schema_strategy.list.columns
 
     if class_name is not None:
         AnonymousSecondaryService.__name__ = class_name
@@ -60,6 +119,28 @@ def repo_deps_factory(
     return Depends(inner)
 
 
+def session_dependency_factory(session_factory: async_sessionmaker) -> DependsClass:
+    async def inner() -> AsyncIterator[AsyncSession]:
+        async with session_factory() as session:
+            yield session
+
+    return Depends(inner)
+
+
+def configured_repo_factory(
+    repo: type[BaseRepo],
+    session_factory: async_sessionmaker | None = None,
+    concurrent_page: bool = True,
+) -> type[BaseRepo]:
+    class ConfiguredRepo(repo):
+        _session_factory = session_factory
+        _concurrent_page = concurrent_page
+
+    ConfiguredRepo.__name__ = repo.__name__
+
+    return ConfiguredRepo
+
+
 def repo_factory(model: DeclarativeMeta) -> type[BaseRepo]:
     class AnonymousRepo(BaseRepo):
         _cls_model = model
@@ -69,33 +150,67 @@ def repo_factory(model: DeclarativeMeta) -> type[BaseRepo]:
     return AnonymousRepo
 
 
-def secondary_repo_factory(model: DeclarativeMeta) -> type[SecondaryBaseRepo]:
+def secondary_repo_factory(
+    model: DeclarativeMeta, target: DeclarativeMeta | None = None
+) -> type[SecondaryBaseRepo]:
     class AnonymousRepo(SecondaryBaseRepo):
         _cls_model = model
+        _target_model = target
 
     AnonymousRepo.__name__ = model.__name__.split("Model")[0]
 
     return AnonymousRepo
 
 
+def target_repo_factory(
+    repo: type[SecondaryBaseRepo], target: DeclarativeMeta
+) -> type[SecondaryBaseRepo]:
+    class TargetRepo(repo):
+        _target_model = target
+
+    TargetRepo.__name__ = repo.__name__
+
+    return TargetRepo
+
+
 class DataMapperBuilder:
     def __init__(
         self,
         prefix: str,
         model: DeclarativeMeta,
-        session_dependency: DependsClass,
+        session_dependency: DependsClass | None = None,
         repo: type[BaseRepo] | None = None,
-        secondary: dict[str, tuple[DeclarativeMeta, type[BaseRepo] | None]]
+        # {route: (association model, repo or None[, target model])}
+        secondary: dict[
+            str,
+            tuple[DeclarativeMeta, type[SecondaryBaseRepo] | None]
+            | tuple[DeclarativeMeta, type[SecondaryBaseRepo] | None, DeclarativeMeta],
+        ]
         | None = None,
         arguments: BuilderArguments | None = None,
+        session_factory: async_sessionmaker | None = None,
+        registry: SchemaRegistry | None = None,
+        slow_query_log: SlowQueryLog | None = None,
     ):
+        if session_dependency is None:
+            if session_factory is None:
+                raise ValueError("session_dependency or session_factory is required")
+
+            session_dependency = session_dependency_factory(session_factory)
+
         self.prefix = prefix
 
         self.session_dependency = session_dependency
+        self.session_factory = session_factory
         self.model = model
         self.repo = repo
         self.secondary = secondary
         self.arguments = BuilderArguments() if arguments is None else arguments
+        # None shares the process wide default_registry, see SchemaRegistry.for_app()
+        self.registry = registry
+        self.view: BaseView | None = None
+        # share one log between builders, else one is made from arguments.slow_queries
+        self.slow_query_log = slow_query_log
 
     def build(self) -> BaseView:
         router = APIRouter(prefix=self.prefix)
@@ -103,27 +218,252 @@ class DataMapperBuilder:
         if self.repo is None:
             self.repo = repo_factory(self.model)
 
-        schema_factory = SchemaFactory(self.model)
+        self.repo = self.configure_repo(self.repo)
+
+        schema_factory = SchemaFactory.for_model(self.model, self.registry)
         schema_strategy = SchemaCreationStrategy(
             schema_factory, self.arguments.schema_creation_args
         )
 
+        changes = self.get_changes_arguments()
         service = service_factory(
-            schema_strategy, self.model.__name__.split("Model")[0]
+            schema_strategy,
+            self.model.__name__.split("Model")[0],
+            aggregate_cache=self.get_aggregate_cache(),
+            facets=self.arguments.facets,
+            facet_cache=self.get_facet_cache(),
+            changes=changes,
+            changes_cursor=self.get_changes_cursor(schema_factory, changes),
+            bulk_import=self.arguments.bulk_import,
+            write_batcher=self.get_write_batcher(),
+            core_reads=self.arguments.core_reads,
         )
         service_dependency = self.get_service_dependency(service, self.repo)
 
         secondary_views = self.get_secondary_views()
 
-        return BaseView(
-            router, service, service_dependency, schema_strategy, secondary_views
+        view = BaseView(
+            router,
+            service,
+            service_dependency,
+            schema_strategy,
+            secondary_views,
+            response_class=self.get_response_class(),
+            extra_handlers=self.get_extra_handlers(),
+            admission=self.arguments.admission,
+            statement_timeouts=self.arguments.statement_timeouts,
+            cancel_on_disconnect=self.arguments.cancel_on_disconnect,
+            repo=self.repo,
+            session_factory=self.session_factory,
+            slow_query_log=self.get_slow_query_log(),
+            read_only=self.arguments.read_only,
+        )
+        view.openapi_fragment = self.get_openapi_fragment(view)
+        self.view = view
+
+        return view
+
+    async def warmup(self, connections: int = 1) -> dict:
+        """BaseView.warmup() of the built view."""
+        if self.view is None:
+            raise ValueError("build() the view before warming it up")
+
+        return await self.view.warmup(connections)
+
+    def get_openapi_fragment(self, view: BaseView) -> dict | None:
+        openapi_arguments = self.arguments.openapi
+        if openapi_arguments is None:
+            return None
+
+        if openapi_arguments.cache_dir is None:
+            return router_fragment(view.router)
+
+        secondary = self.secondary or {}
+        # association and target models, repos sit at index 1
+        secondary_models = [
+            model
+            for models in secondary.values()
+            for model in (models[0], *models[2:])
+        ]
+        fingerprint = model_fingerprint(
+            (self.model, *secondary_models),
+            self.prefix,
+            sorted(secondary),
+            self.arguments.model_dump(),
+            # schema names, a name taken by another builder gets a suffix
+            [
+                (
+                    route.path,
+                    sorted(route.methods),
+                    repr(route.response_model),
+                    repr(route.body_field and route.body_field.field_info.annotation),
+                )
+                for route in view.router.routes
+            ],
+        )
+        store = FragmentStore(openapi_arguments.cache_dir)
+        fragment = store.load(fingerprint)
+        if fragment is None:
+            fragment = router_fragment(view.router)
+            store.save(fingerprint, fragment)
+
+        return fragment
+
+    def get_extra_handlers(self) -> tuple[str, ...]:
+        extra_handlers = []
+        if self.arguments.aggregate is not None:
+            extra_handlers.append("aggregate")
+
+        if self.arguments.facets is not None:
+            extra_handlers.append("facets")
+
+        if self.arguments.changes is not None:
+            extra_handlers.append("changes")
+
+        if self.arguments.bulk_import is not None:
+            extra_handlers.append("bulk_import")
+
+        return tuple(extra_handlers)
+
+    def get_slow_query_log(self) -> SlowQueryLog | None:
+        slow_queries = self.arguments.slow_queries
+        if self.slow_query_log is None and slow_queries is not None:
+            self.slow_query_log = SlowQueryLog(
+                slow_queries.threshold_ms / 1000,
+                explain=slow_queries.explain,
+                top_n=slow_queries.top_n,
+                log_values=slow_queries.log_values,
+            )
+
+        return self.slow_query_log
+
+    def get_write_batcher(self) -> WriteBatcher | None:
+        write_behind = self.arguments.write_behind
+        if write_behind is None:
+            return None
+
+        if self.session_factory is None:
+            raise ValueError(
+                "write_behind requires DataMapperBuilder(session_factory=...)"
+            )
+
+        schema_creation_args = self.arguments.schema_creation_args
+        nested_create = (
+            schema_creation_args is not None
+            and schema_creation_args.post_args.nested_create
+        )
+        if nested_create:
+            raise ValueError("write_behind can't batch PostArguments.nested_create")
+
+        return WriteBatcher(
+            self.model,
+            self.session_factory,
+            max_size=write_behind.max_batch_size,
+            max_latency=write_behind.max_latency_ms / 1000,
+        )
+
+    def get_changes_arguments(self) -> ChangesArguments | None:
+        """Changes arguments with the seek field resolved against the model."""
+        changes = self.arguments.changes
+        if changes is None:
+            return None
+
+        columns = self.model.__mapper__.column_attrs.keys()
+        field = changes.field
+        if field is None:
+            field = next(
+                (name for name in default_change_fields if name in columns), None
+            )
+
+        for column in (field, changes.soft_delete_field):
+            if column is not None and column not in columns:
+                raise ValueError(f"{self.model.__name__} has no column {column}")
+
+        if field is None:
+            raise ValueError(
+                f"{self.model.__name__} has none of {default_change_fields}, "
+                "set ChangesArguments.field"
+            )
+
+        return changes.model_copy(update={"field": field})
+
+    def get_changes_cursor(
+        self, schema_factory: SchemaFactory, changes: ChangesArguments | None
+    ) -> SeekCursor | None:
+        if changes is None:
+            return None
+
+        return SeekCursor(
+            getattr(self.model, changes.field).type.python_type,
+            schema_factory.pk_annotations[0],
+        )
+
+    def get_aggregate_cache(self) -> TTLCache | None:
+        aggregate_arguments = self.arguments.aggregate
+        if aggregate_arguments is None or aggregate_arguments.cache_ttl is None:
+            return None
+
+        return TTLCache(aggregate_arguments.cache_ttl, aggregate_arguments.cache_size)
+
+    def get_facet_cache(self) -> TTLCache | None:
+        facet_arguments = self.arguments.facets
+        if facet_arguments is None or facet_arguments.cache_ttl is None:
+            return None
+
+        return TTLCache(facet_arguments.cache_ttl, facet_arguments.cache_size)
+
+    def get_response_class(self) -> type[EncodedResponse] | None:
+        encoding = self.arguments.response_encoding
+        if encoding is None and self.arguments.gzip_min_size is None:
+            return None
+
+        return response_class_factory(
+            encoding or ResponseEncodingEnum.JSON, self.arguments.gzip_min_size
+        )
+
+    def configure_repo(self, repo: type[BaseRepo]) -> type[BaseRepo]:
+        concurrent = (
+            self.arguments.list_query_strategy == ListQueryStrategyEnum.CONCURRENT
+        )
+        if concurrent and self.session_factory is None:
+            raise ValueError(
+                "ListQueryStrategyEnum.CONCURRENT requires DataMapperBuilder(session_factory=...)"
+            )
+
+        schema_creation_args = self.arguments.schema_creation_args
+        stream = (
+            schema_creation_args is not None and schema_creation_args.list_args.stream
+        )
+        if stream and self.session_factory is None:
+            raise ValueError(
+                "ListArguments.stream requires DataMapperBuilder(session_factory=...)"
+            )
+
+        read_only = self.arguments.read_only
+        if read_only is not None and read_only.consistent and concurrent:
+            # count and page would run on connections of their own, streamed lists
+            # run both on the streaming session
+            raise ValueError(
+                "ReadOnlyArguments.consistent requires ListQueryStrategyEnum.CONSISTENT"
+            )
+
+        if not concurrent and not stream:
+            return repo
+
+        return configured_repo_factory(
+            repo, session_factory=self.session_factory, concurrent_page=concurrent
         )
 
     def get_service_dependency(
         self,
         service: type[BaseService | SecondaryBaseService],
         repo: type[BaseRepo | SecondaryBaseRepo],
-    ) -> DependsClass:
+    ) -> DependsClass | SessionBoundService:
+        if self.arguments.stateless_services:
+            return SessionBoundService(
+                service=service(repo()), session_deps=self.session_dependency
+            )
+
         repo_deps = repo_deps_factory(repo, self.session_dependency)
         return service_deps_factory(service, repo_deps)
 
@@ -132,20 +472,31 @@ class DataMapperBuilder:
             return
 
         s_views_container = []
-        for secondary_prefix, (
-            secondary_model,
-            secondary_repo,
-        ) in self.secondary.items():
+        for secondary_prefix, secondary_models in self.secondary.items():
+            secondary_model, secondary_repo = secondary_models[:2]
+            target_model = secondary_models[2] if len(secondary_models) > 2 else None
             if secondary_repo is None:
-                secondary_repo = secondary_repo_factory(secondary_model)
+                secondary_repo = secondary_repo_factory(secondary_model, target_model)
+            elif target_model is not None:
+                secondary_repo = target_repo_factory(secondary_repo, target_model)
+
+            secondary_schema_factory = SchemaFactory.for_model(
+                secondary_model, self.registry
+            )
+            target_schema_factory = None
+            if target_model is not None:
+                target_schema_factory = SchemaFactory.for_model(
+                    target_model, self.registry
+                )
 
-            secondary_schema_factory = SchemaFactory(secondary_model)
             secondary_schema_strategy = SecondarySchemaCreationStrategy(
-                secondary_schema_factory
+                secondary_schema_factory, target_factory=target_schema_factory
             )
 
             secondary_service = secondary_service_factory(
-                secondary_schema_strategy, secondary_model.__name__.split("Model")[0]
+                secondary_schema_strategy,
+                secondary_model.__name__.split("Model")[0],
+                core_reads=self.arguments.core_reads,
             )
 
             secondary_service_deps = self.get_service_dependency(
@@ -158,6 +509,7 @@ class DataMapperBuilder:
                     schemas=secondary_schema_strategy,
                     service=secondary_service,
                     service_deps=secondary_service_deps,
+                    target=target_model,
                 )
             )
 
@@ -0,0 +1 @@
+from easy_api_autobuilder.cache.ttl import TTLCache
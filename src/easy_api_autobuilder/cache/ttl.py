@@ -0,0 +1,40 @@
+"""In process result cache."""
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+missing = object()
+
+
+class TTLCache:
+    """LRU cache whose entries expire ttl seconds after they were stored."""
+
+    def __init__(self, ttl: float, maxsize: int = 256):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        expires_at, cached_value = self._entries.get(key, (0, missing))
+        if cached_value is missing:
+            return default
+
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return default
+
+        self._entries.move_to_end(key)
+        return cached_value
+
+    def set(self, key: Hashable, cached_value: Any) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, cached_value)
+        self._entries.move_to_end(key)
+
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
@@ -1,9 +1,17 @@
 ALLOW_NONE_FIELD_NAME = "allow_none"
 PARAM_ORDER_BY_FIELD_NAME = "order_by"
 PARAM_ORDER_DIRECTION_FIELD_NAME = "order_direction"
+PARAM_GROUP_BY_FIELD_NAME = "group_by"
+PARAM_FACET_FIELDS_NAME = "fields"
+# group_by=<datetime field>__date groups by the calendar day
+GROUP_BY_DATE_SUFFIX = "__date"
 
 allocated_l = []
 allocated_s = {}
+default_change_fields = (
+    "updated_at",
+    "version",
+)
 default_order_fields = (
     "updated_at",
     "created_at",
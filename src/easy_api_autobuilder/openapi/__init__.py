@@ -0,0 +1,8 @@
+from easy_api_autobuilder.openapi.document import OpenAPIDocument
+from easy_api_autobuilder.openapi.fragment import (
+    FragmentStore,
+    model_fingerprint,
+    model_metadata,
+    related_models,
+    router_fragment,
+)
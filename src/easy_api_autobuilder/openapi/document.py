@@ -0,0 +1,97 @@
+"""OpenAPI document merged from router fragments."""
+from typing import Any, Iterable
+
+from fastapi import FastAPI
+from fastapi.openapi.utils import get_openapi
+
+from easy_api_autobuilder.openapi.fragment import router_fragment
+from easy_api_autobuilder.view import BaseView
+
+
+class OpenAPIDocument:
+    """OpenAPI document built by merging fragments instead of walking every route.
+
+    A fragment is merged once, adding a router later only merges its own paths and
+    components.
+    """
+
+    def __init__(self, **info: Any):
+        info.setdefault("title", "FastAPI")
+        info.setdefault("version", "0.1.0")
+        self.document = get_openapi(routes=[], **info)
+        self.document.setdefault("paths", {})
+        self.document.setdefault("components", {})
+
+    @classmethod
+    def for_app(cls, app: FastAPI) -> "OpenAPIDocument":
+        return cls(
+            title=app.title,
+            version=app.version,
+            openapi_version=app.openapi_version,
+            summary=app.summary,
+            description=app.description,
+            terms_of_service=app.terms_of_service,
+            contact=app.contact,
+            license_info=app.license_info,
+            webhooks=app.webhooks.routes,
+            tags=app.openapi_tags,
+            servers=app.servers,
+            separate_input_output_schemas=app.separate_input_output_schemas,
+        )
+
+    def add(self, fragment: dict[str, Any], prefix: str = "") -> None:
+        """Merge the paths and components of fragment.
+
+        ValueError when a component name is taken by a different definition.
+        """
+        paths = self.document["paths"]
+        for path, operations in fragment.get("paths", {}).items():
+            paths.setdefault(prefix + path, {}).update(operations)
+
+        components = self.document["components"]
+        for section, definitions in fragment.get("components", {}).items():
+            # registry names are unique, a taken name should be the same schema
+            merged = components.setdefault(section, {})
+            for name, definition in definitions.items():
+                existing = merged.setdefault(name, definition)
+                if existing != definition:
+                    raise ValueError(
+                        f"components/{section}/{name} is already defined differently,"
+                        " rename one of the schemas"
+                    )
+
+    def install(self, app: FastAPI, views: Iterable[BaseView], prefix: str = "") -> None:
+        """Serve this document as app.openapi(), views included with prefix.
+
+        Fragments of the views are merged now, routes of the app outside the views
+        are documented on the first call.
+        """
+        routers = set()
+        endpoints = set()
+        for view in views:
+            self.add(view.openapi_fragment or router_fragment(view.router), prefix)
+            routers.add(id(view.router))
+            endpoints.update(
+                getattr(route, "endpoint", None) for route in view.router.routes
+            )
+        endpoints.discard(None)
+
+        other_routes_added = False
+
+        def openapi() -> dict[str, Any]:  # noqa: WPS430
+            nonlocal other_routes_added
+            if not other_routes_added:
+                other_routes = [
+                    route
+                    for route in app.routes
+                    if id(getattr(route, "original_router", None)) not in routers
+                    and getattr(route, "endpoint", None) not in endpoints
+                ]
+                other = get_openapi(title="", version="", routes=other_routes)
+                self.add(other)
+                other_routes_added = True
+
+            app.openapi_schema = self.document
+            return self.document
+
+        app.openapi = openapi
@@ -0,0 +1,135 @@
+"""OpenAPI fragments of generated routers."""
+import inspect
+import json
+import os
+import tempfile
+from importlib import metadata
+from pathlib import Path
+from typing import Any, Iterable
+
+import fastapi
+import pydantic
+from fastapi import APIRouter
+from fastapi.openapi.utils import get_openapi
+from sqlalchemy.orm import DeclarativeMeta
+
+from easy_api_autobuilder.schema import arguments_hash
+
+
+def package_version() -> str:
+    try:
+        return metadata.version("easy_api_autobuilder")
+    except metadata.PackageNotFoundError:
+        return ""
+
+
+def model_metadata(model: DeclarativeMeta) -> dict[str, Any]:
+    """What the generated schemas of a model are made of."""
+    columns = []
+    for column in model.__table__.columns:
+        default = column.default
+        if default is not None:
+            default = (
+                getattr(default.arg, "__qualname__", "callable")
+                if default.is_callable
+                else repr(default.arg)
+            )
+
+        columns.append(
+            (
+                column.key,
+                str(column.type),
+                column.nullable,
+                column.primary_key,
+                default,
+            )
+        )
+
+    return {
+        "name": model.__name__,
+        "table": model.__tablename__,
+        "annotations": {
+            name: repr(annotation)
+            for name, annotation in inspect.get_annotations(model).items()
+        },
+        "columns": columns,
+        "relationships": [
+            (key, relationship.mapper.class_.__name__, relationship.uselist)
+            for key, relationship in model.__mapper__.relationships.items()
+        ],
+    }
+
+
+def related_models(models: Iterable[DeclarativeMeta]) -> list[DeclarativeMeta]:
+    """models and every model reachable through their relationships."""
+    pending = list(models)
+    seen = []
+    while pending:
+        model = pending.pop()
+        if model in seen:
+            continue
+
+        seen.append(model)
+        pending.extend(
+            relationship.mapper.class_
+            for relationship in model.__mapper__.relationships.values()
+        )
+
+    return sorted(seen, key=lambda model: model.__name__)
+
+
+def model_fingerprint(models: Iterable[DeclarativeMeta], *extra: Any) -> str:
+    """Hash of the model metadata, extra values and the versions generating schemas.
+
+    Equal fingerprints mean an equal OpenAPI fragment.
+    """
+    return arguments_hash(
+        {
+            "models": [model_metadata(model) for model in related_models(models)],
+            "extra": extra,
+            "versions": (package_version(), fastapi.__version__, pydantic.VERSION),
+        }
+    )
+
+
+def router_fragment(router: APIRouter) -> dict[str, Any]:
+    """Paths and components of the routes of router."""
+    document = get_openapi(title="", version="", routes=router.routes)
+    return {
+        "paths": document.get("paths", {}),
+        "components": document.get("components", {}),
+    }
+
+
+class FragmentStore:
+    """Fragments on disk, one <fingerprint>.json file each.
+
+    Files are replaced atomically, workers building the same app can share a directory.
+    """
+
+    def __init__(self, directory: str | Path):
+        self._directory = Path(directory)
+
+    def path(self, fingerprint: str) -> Path:
+        return self._directory / f"{fingerprint}.json"
+
+    def load(self, fingerprint: str) -> dict[str, Any] | None:
+        try:
+            with self.path(fingerprint).open() as fragment_file:
+                return json.load(fragment_file)
+        except (OSError, ValueError):
+            return None
+
+    def save(self, fingerprint: str, fragment: dict[str, Any]) -> None:
+        self._directory.mkdir(parents=True, exist_ok=True)
+        file_descriptor, temporary = tempfile.mkstemp(
+            dir=self._directory, suffix=".tmp"
+        )
+        try:
+            with os.fdopen(file_descriptor, "w") as fragment_file:
+                json.dump(fragment, fragment_file)
+
+            os.replace(temporary, self.path(fingerprint))
+        except BaseException:
+            os.unlink(temporary)
+            raise
@@ -1 +1,2 @@
+from easy_api_autobuilder.page.changes import ChangeFeed, ChangesParams
 from easy_api_autobuilder.page.page import Page, PageParams
@@ -0,0 +1,21 @@
+"""Change feed route params and response."""
+from typing import Any, Generic
+
+from fastapi import Query
+
+from easy_api_autobuilder.page.page import PageData
+from easy_api_autobuilder.schema import BaseModel
+
+
+class ChangesParams(BaseModel):
+    since: str | None = Query(default=None)
+    size: int = Query(default=100, ge=1, le=1000)
+
+
+class ChangeFeed(BaseModel, Generic[PageData]):
+    data: PageData
+    # primary keys of soft deleted rows
+    deleted: list[Any]
+    # pass as since to get the rows changed after this page
+    next_cursor: str | None
+    has_more: bool
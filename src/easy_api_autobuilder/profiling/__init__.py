@@ -0,0 +1,6 @@
+from easy_api_autobuilder.profiling.middleware import (
+    ProfilingMiddleware,
+    profile_signature,
+    profile_token,
+)
+from easy_api_autobuilder.profiling.timings import Timings, request_timings, timed
@@ -0,0 +1,136 @@
+"""Opt-in profiling of single requests."""
+import cProfile
+import hashlib
+import hmac
+import random
+import re
+import time
+from pathlib import Path
+from typing import Iterable
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from easy_api_autobuilder.profiling.timings import Timings, request_timings
+
+unsafe_file_characters = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+def profile_signature(secret: str, method: str, path: str, timestamp: int) -> str:
+    message = "{0}:{1}:{2}".format(timestamp, method.upper(), path).encode()
+    return hmac.new(secret.encode(), message, hashlib.sha256).hexdigest()
+
+
+def profile_token(
+    secret: str, method: str, path: str, timestamp: int | None = None
+) -> str:
+    """Value of the profiling header for one request, "<timestamp>.<signature>"."""
+    if timestamp is None:
+        timestamp = int(time.time())
+
+    return "{0}.{1}".format(
+        timestamp, profile_signature(secret, method, path, timestamp)
+    )
+
+
+class ProfilingMiddleware:
+    """Profile requests carrying a signed header, or a sample of all requests.
+
+    A profiled request gets a Server-Timing header with the time spent in the
+    params, db, validation and encoding phases of the generated route, plus the
+    total. With output_dir, the request also runs under cProfile and the stats are
+    saved there as <time>-<method>-<path>.pstats, one profiled request at a time as
+    cProfile sees everything the event loop runs meanwhile.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        secret: str | None = None,
+        sample_rate: float = 0.0,
+        output_dir: str | Path | None = None,
+        prefixes: Iterable[str] = ("",),
+        header: str = "x-profile",
+        max_age: int = 300,
+    ):
+        self.app = app
+        self.secret = secret
+        self.sample_rate = sample_rate
+        self.output_dir = None if output_dir is None else Path(output_dir)
+        # paths of the generated routers, e.g. the prefixes of their views
+        self.prefixes = tuple(prefixes)
+        self.header = header
+        self.max_age = max_age
+        self._profiling = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.triggered(scope):
+            await self.app(scope, receive, send)
+            return
+
+        timings = Timings()
+        token = request_timings.set(timings)
+        profiler = self._start_profiler()
+        began = time.perf_counter()
+
+        async def send_timed(message: Message) -> None:  # noqa: WPS430
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing", timings.server_timing(time.perf_counter() - began)
+                )
+
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_timed)
+        finally:
+            request_timings.reset(token)
+            if profiler is not None:
+                self._save_profile(profiler, scope)
+
+    def triggered(self, scope: Scope) -> bool:
+        if not scope["path"].startswith(self.prefixes):
+            return False
+
+        if self.secret is not None:
+            value = Headers(scope=scope).get(self.header)
+            if value is not None and self._valid_token(value, scope):
+                return True
+
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def _valid_token(self, value: str, scope: Scope) -> bool:
+        timestamp, _, signature = value.partition(".")
+        try:
+            timestamp = int(timestamp)
+        except ValueError:
+            return False
+
+        if abs(time.time() - timestamp) > self.max_age:
+            return False
+
+        expected = profile_signature(
+            self.secret, scope["method"], scope["path"], timestamp
+        )
+        return hmac.compare_digest(signature, expected)
+
+    def _start_profiler(self) -> cProfile.Profile | None:
+        if self.output_dir is None or self._profiling:
+            return None
+
+        self._profiling = True
+        profiler = cProfile.Profile()
+        profiler.enable()
+        return profiler
+
+    def _save_profile(self, profiler: cProfile.Profile, scope: Scope) -> None:
+        profiler.disable()
+        self._profiling = False
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        file_name = "{0}-{1}-{2}.pstats".format(
+            time.time_ns(),
+            scope["method"],
+            unsafe_file_characters.sub("_", scope["path"]).strip("_"),
+        )
+        profiler.dump_stats(self.output_dir / file_name)
@@ -0,0 +1,44 @@
+"""Per request time spent in each phase of a generated route."""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+
+class Timings:
+    def __init__(self):
+        # {phase: seconds}
+        self.phases: dict[str, float] = {}
+
+    def add(self, phase: str, seconds: float) -> None:
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def server_timing(self, total: float) -> str:
+        """Server-Timing header value, durations in milliseconds."""
+        metrics = [
+            "{0};dur={1:.3f}".format(phase, seconds * 1000)
+            for phase, seconds in self.phases.items()
+        ]
+        metrics.append("total;dur={0:.3f}".format(total * 1000))
+        return ", ".join(metrics)
+
+
+# set by ProfilingMiddleware for the requests it profiles
+request_timings: ContextVar[Timings | None] = ContextVar(
+    "request_timings", default=None
+)
+
+
+@contextmanager
+def timed(phase: str) -> Iterator[None]:
+    """Add the time spent in the block to phase of the profiled request, if any."""
+    timings = request_timings.get()
+    if timings is None:
+        yield
+        return
+
+    began = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(phase, time.perf_counter() - began)
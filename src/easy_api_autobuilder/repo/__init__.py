@@ -1 +1,15 @@
 from easy_api_autobuilder.repo.base_repo import BaseRepo, SecondaryBaseRepo
+from easy_api_autobuilder.repo.batcher import WriteBatcher
+from easy_api_autobuilder.repo.context import session_context
+from easy_api_autobuilder.repo.cursor import SeekCursor
+from easy_api_autobuilder.repo.read_only import (
+    begin_read_only,
+    read_only,
+    read_only_options,
+)
+from easy_api_autobuilder.repo.slow_queries import (
+    QueryShape,
+    SlowQueryLog,
+    slow_query_context,
+)
+from easy_api_autobuilder.repo.timeouts import StatementTimeout, statement_timeout
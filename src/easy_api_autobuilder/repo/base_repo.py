@@ -1,27 +1,73 @@
 """Base repo implementation."""
-from typing import Any
-
-from sqlalchemy import delete, func, insert, select, update
-from sqlalchemy.ext.asyncio import AsyncSession
+import asyncio
+import logging
+from contextlib import aclosing
+from contextvars import ContextVar
+from functools import partial
+from typing import Any, AsyncIterator
+
+from sqlalchemy import and_, delete, func, insert, or_, select, update
+from sqlalchemy.engine import Result
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.inspection import inspect
 from sqlalchemy.orm import DeclarativeMeta
 
 from easy_api_autobuilder.base_enum import OrderDirectionEnum
-from easy_api_autobuilder.constants.constants import allocated_l, default_order_fields
+from easy_api_autobuilder.constants.constants import (
+    GROUP_BY_DATE_SUFFIX,
+    allocated_l,
+    default_order_fields,
+)
+from easy_api_autobuilder.repo.context import session_context
+from easy_api_autobuilder.repo.read_only import begin_read_only, read_only
+from easy_api_autobuilder.repo.timeouts import (
+    execute,
+    restored,
+    route_statement_context,
+    stream,
+)
 
+logger = logging.getLogger(__name__)
 
-class BaseRepo:
-    """Base repo for models."""
 
-    _cls_model: DeclarativeMeta
+class SessionMixin:
+    """Repo session: the one given to __init__, else the one in session_context."""
 
-    def __init__(self, session: AsyncSession):
+    _bound_session: AsyncSession | None
+
+    def __init__(self, session: AsyncSession | None = None):
         self._session = session
 
+    @property
+    def _session(self) -> AsyncSession:
+        if self._bound_session is not None:
+            return self._bound_session
+
+        return session_context.get()
+
+    @_session.setter
+    def _session(self, session: AsyncSession | None) -> None:
+        self._bound_session = session
+
+    async def _execute(self, query: Any, params: Any = None) -> Result:
+        return await execute(self._session, query, params)
+
+
+class BaseRepo(SessionMixin):
+    """Base repo for models."""
+
+    _cls_model: DeclarativeMeta
+    # set by the builder for queries on sessions of their own
+    _session_factory: async_sessionmaker | None = None
+    # run the list count and page queries concurrently, requires _session_factory
+    _concurrent_page: bool = True
+    # rows fetched per round trip by stream_by_page
+    _stream_chunk_size: int = 100
+
     async def bulk_create(self, *, model_data: list[dict[str, Any]]) -> Any:
         bulk_query = insert(self._cls_model).values(model_data)
 
-        res = await self._session.execute(bulk_query)
+        res = await self._execute(bulk_query)
         await self._session.commit()
         return res.inserted_primary_key
 
@@ -29,10 +75,72 @@ class BaseRepo:
         """Create object."""
         query = insert(self._cls_model).values(**model_data)
 
-        res = await self._session.execute(query)
+        res = await self._execute(query)
         await self._session.commit()
         return res.inserted_primary_key[0]
 
+    async def create_nested(
+        self, *, model_data: dict[str, Any], children: dict[str, list[dict[str, Any]]]
+    ) -> dict[str, Any]:
+        """Create object and the children of its one-to-many relationships at once.
+
+        The object comes back from INSERT ... RETURNING with the columns the
+        children point to, each relationship is one multi-row insert returning
+        its primary keys in the order of the given rows. One commit for all.
+        """
+        mapper = inspect(self._cls_model)
+        relationships = [mapper.relationships[name] for name in children]
+        returned = [*mapper.primary_key]
+        for relationship in relationships:
+            returned.extend(
+                column
+                for column, _ in relationship.local_remote_pairs
+                if column not in returned
+            )
+
+        query = insert(self._cls_model).values(**model_data).returning(*returned)
+        res = await self._execute(query)
+        parent_row = res.one()._mapping
+        created = {"id": parent_row[mapper.primary_key[0]]}
+
+        for relationship in relationships:
+            rows = children[relationship.key]
+            created[relationship.key] = []
+            if not rows:
+                continue
+
+            child_mapper = relationship.mapper
+            foreign_keys = {
+                child_mapper.get_property_by_column(child_column).key: (
+                    parent_row[column]
+                )
+                for column, child_column in relationship.local_remote_pairs
+            }
+            child_query = insert(child_mapper.class_).returning(
+                child_mapper.primary_key[0], sort_by_parameter_order=True
+            )
+            child_res = await self._execute(
+                child_query, [{**row, **foreign_keys} for row in rows]
+            )
+            created[relationship.key] = child_res.scalars().all()
+
+        await self._session.commit()
+        return created
+
+    async def insert_many(
+        self, *, model_data: list[dict[str, Any]], commit: bool = True
+    ) -> None:
+        """executemany insert, batched by the dialect's insertmanyvalues path."""
+        await self._execute(insert(self._cls_model), model_data)
+        if commit:
+            await self._session.commit()
+
+    async def commit(self) -> None:
+        await self._session.commit()
+
+    async def rollback(self) -> None:
+        await self._session.rollback()
+
     async def update(
         self,
         *,
@@ -48,7 +156,7 @@ class BaseRepo:
             .execution_options(synchronize_session="fetch")
         )
 
-        await self._session.execute(query)
+        await self._execute(query)
         await self._session.commit()
 
     async def bulk_update_by_field(
@@ -66,7 +174,7 @@ class BaseRepo:
             .execution_options(synchronize_session="fetch")
         )
 
-        await self._session.execute(bulk_query)
+        await self._execute(bulk_query)
         await self._session.commit()
 
     async def delete(self, *, pkey_val: Any) -> None:
@@ -78,23 +186,35 @@ class BaseRepo:
             .execution_options(synchronize_session="fetch")
         )
 
-        await self._session.execute(query)
+        await self._execute(query)
         await self._session.commit()
 
-    async def get(self, *, pkey_val: Any) -> Any:
-        """Get object by primary key."""
+    async def get(
+        self,
+        *,
+        pkey_val: Any,
+        options: tuple = (),
+        columns: tuple[str, ...] | None = None,
+    ) -> Any:
+        """Get object, or the row mapping of columns, by primary key."""
         primary_key = inspect(self._cls_model).primary_key[0]
-        query = select(self._cls_model).where(primary_key == pkey_val)
+        query = self._select(options, columns).where(primary_key == pkey_val)
+
+        rows = await self._execute(query)
+        return self._rows(rows, columns).one()
 
-        rows = await self._session.execute(query)
-        return rows.scalars().one()
+    async def sample_pk(self) -> Any:
+        """Primary key of some row, None for an empty table."""
+        primary_key = inspect(self._cls_model).primary_key[0]
+        rows = await self._execute(select(primary_key).limit(1))
+        return rows.scalar()
 
     async def get_or_none(self, *, pkey_val: Any) -> Any:
         """Get object by primary key or none."""
         primary_key = inspect(self._cls_model).primary_key[0]
         query = select(self._cls_model).where(primary_key == pkey_val)
 
-        rows = await self._session.execute(query)
+        rows = await self._execute(query)
         return rows.scalar()
 
     async def all(
@@ -103,7 +223,7 @@ class BaseRepo:
         """Get all objects by db model."""
         query = select(self._cls_model)
 
-        rows = await self._session.execute(query)
+        rows = await self._execute(query)
         return rows.scalars().all()
 
     def _eval_filters(self, filters: dict[str, Any] | None) -> list:
@@ -148,16 +268,109 @@ class BaseRepo:
         filters: dict[str, Any] | None,
         order_by: str | None,
         order_dir: OrderDirectionEnum | None,
+        options: tuple = (),
+        columns: tuple[str, ...] | None = None,
     ) -> tuple[Any, int]:
+        """Page of model objects, or of row mappings of columns when given."""
+        query, count_query = self._page_queries(
+            page, page_size, filters, order_by, order_dir, options, columns
+        )
+
+        if self._session_factory is not None and self._concurrent_page:
+            return await self._get_page_concurrently(query, count_query, columns)
+
+        logger.debug("count query %s", count_query)
+        count_result = await self._execute(count_query)
+        count = count_result.scalar()
+        if not count:
+            return tuple(), count
+
+        logger.debug("page query %s", query)
+        rows = await self._execute(query)
+
+        return self._rows(rows, columns).all(), count
+
+    async def stream_by_page(
+        self,
+        page: int | None,
+        page_size: int | None,
+        filters: dict[str, Any] | None,
+        order_by: str | None,
+        order_dir: OrderDirectionEnum | None,
+        options: tuple = (),
+        columns: tuple[str, ...] | None = None,
+    ) -> tuple[AsyncIterator[Any], int]:
+        """get_by_page() with the rows fetched while they are iterated.
+
+        Count and page query share a session of their own, the request session may
+        be gone once the rows are iterated, and so a transaction: with
+        ReadOnlyArguments.consistent they see the same snapshot. The count runs
+        now, the page query while the body is sent, under the statement timeout,
+        read_only and slow query log of the route; past the deadline the body is
+        cut short.
+        """
+        if self._session_factory is None:
+            raise RuntimeError(f"{type(self).__name__} has no _session_factory")
+
+        query, count_query = self._page_queries(
+            page, page_size, filters, order_by, order_dir, options, columns
+        )
+        rows = self._stream_rows(query, count_query, columns, route_statement_context())
+        count = await anext(rows)
+        if not count:
+            await rows.aclose()
+            return self._no_rows(), count
+
+        return rows, count
+
+    async def _stream_rows(
+        self,
+        query: Any,
+        count_query: Any,
+        columns: tuple[str, ...] | None,
+        captured: list[tuple[ContextVar, Any]],
+    ) -> AsyncIterator[Any]:
+        """The count, then the rows, each fetch with the route settings restored."""
+        query = query.execution_options(yield_per=self._stream_chunk_size)
+        async with self._session_factory() as session:
+            await begin_read_only(session, read_only.get(), server_side=True)
+            count_result = await execute(session, count_query)
+            yield count_result.scalar()
+
+            rows = partial(self._rows, columns=columns)
+            async with aclosing(stream(session, query, rows)) as partitions:
+                while True:
+                    with restored(captured):
+                        partition = await anext(partitions, None)
+                    if partition is None:
+                        return
+
+                    for row in partition:
+                        yield row
+
+    async def _no_rows(self) -> AsyncIterator[Any]:
+        return
+        yield
+
+    def _page_queries(
+        self,
+        page: int | None,
+        page_size: int | None,
+        filters: dict[str, Any] | None,
+        order_by: str | None,
+        order_dir: OrderDirectionEnum | None,
+        options: tuple = (),
+        columns: tuple[str, ...] | None = None,
+    ) -> tuple[Any, Any]:
+        """Page query and the count query of the filtered rows."""
         if page is None:
             page = 1
 
         if page_size is None:
             page_size = 10
 
-        print(filters)
         filters_exp = self._eval_filters(filters)
-        print(filters_exp)
+        logger.debug("filters %s", filters)
 
         order_exp = self._eval_order(order_by, order_dir)
 
@@ -165,26 +378,145 @@ class BaseRepo:
         offset = page_size * (page - 1)
 
         count_query = select(func.count()).select_from(self._cls_model).order_by(None)
-        query = select(self._cls_model)
+        query = self._select(options, columns)
 
         if filters_exp:
             count_query = count_query.where(*filters_exp)
             query = query.where(*filters_exp)
 
-        print(count_query)
-        count_result = await self._session.execute(count_query)
-        count = count_result.scalar()
-        if not count:
-            return tuple(), count
-
         if order_exp is not None:
             query = query.order_by(order_exp)
 
         query = query.limit(limit).offset(offset)
-        print(query)
-        rows = await self._session.execute(query)
 
-        return rows.scalars().all(), count
+        return query, count_query
+
+    async def _get_page_concurrently(
+        self, query: Any, count_query: Any, columns: tuple[str, ...] | None = None
+    ) -> tuple[Any, int]:
+        """Run count and page queries at once, each on its own pooled connection."""
+        rows, count = await asyncio.gather(
+            self._detached_rows(query, columns), self._detached_scalar(count_query)
+        )
+        if not count:
+            return tuple(), count
+
+        return rows, count
+
+    async def _detached_scalar(self, query: Any) -> Any:
+        async with self._session_factory() as session:
+            result = await execute(session, query)
+            return result.scalar()
+
+    async def _detached_rows(
+        self, query: Any, columns: tuple[str, ...] | None = None
+    ) -> Any:
+        async with self._session_factory() as session:
+            rows = await execute(session, query)
+            return self._rows(rows, columns).all()
+
+    def _select(
+        self, options: tuple = (), columns: tuple[str, ...] | None = None
+    ) -> Any:
+        """select() of the model, or of just columns, skipping the ORM on load."""
+        if columns:
+            return select(*(getattr(self._cls_model, column) for column in columns))
+
+        query = select(self._cls_model)
+        if options:
+            query = query.options(*options)
+
+        return query
+
+    def _rows(self, result: Any, columns: tuple[str, ...] | None) -> Any:
+        if columns:
+            return result.mappings()
+
+        return result.scalars()
+
+    def _group_expression(self, group_field: str) -> Any:
+        if group_field.endswith(GROUP_BY_DATE_SUFFIX):
+            field_name = group_field.removesuffix(GROUP_BY_DATE_SUFFIX)
+            return func.date(getattr(self._cls_model, field_name))
+
+        return getattr(self._cls_model, group_field)
+
+    async def aggregate(
+        self,
+        *,
+        filters: dict[str, Any] | None,
+        group_by: list[str],
+        aggregates: dict[str, list[str]],
+    ) -> Any:
+        """One GROUP BY query, rows are (*groups, count, *aggregates in given order)."""
+        group_exp = [self._group_expression(group_field) for group_field in group_by]
+        columns = [*group_exp, func.count()]
+        for function_name, field_names in aggregates.items():
+            aggregate_function = getattr(func, function_name)
+            for field_name in field_names:
+                columns.append(aggregate_function(getattr(self._cls_model, field_name)))
+
+        query = select(*columns).select_from(self._cls_model)
+
+        filters_exp = self._eval_filters(filters)
+        if filters_exp:
+            query = query.where(*filters_exp)
+
+        if group_exp:
+            query = query.group_by(*group_exp).order_by(*group_exp)
+
+        rows = await self._execute(query)
+        return rows.all()
+
+    async def facet(
+        self, *, filters: dict[str, Any] | None, field: str, limit: int
+    ) -> Any:
+        """Up to limit (value, count) rows of field, most frequent first."""
+        column = getattr(self._cls_model, field)
+        query = select(column, func.count()).select_from(self._cls_model)
+
+        filters_exp = self._eval_filters(filters)
+        if filters_exp:
+            query = query.where(*filters_exp)
+
+        query = query.group_by(column).order_by(func.count().desc(), column)
+        rows = await self._execute(query.limit(limit))
+        return rows.all()
+
+    async def get_changes(
+        self,
+        *,
+        field: str,
+        after: tuple[Any, Any] | None,
+        limit: int,
+        deleted_field: str | None = None,
+        options: tuple = (),
+    ) -> Any:
+        """Rows after the (field, pk) cursor values, as (object, field, pk[, deleted])."""
+        seek_column = getattr(self._cls_model, field)
+        primary_key = inspect(self._cls_model).primary_key[0]
+
+        columns = [self._cls_model, seek_column, primary_key]
+        if deleted_field is not None:
+            columns.append(getattr(self._cls_model, deleted_field))
+
+        query = select(*columns)
+        if options:
+            query = query.options(*options)
+
+        if after is not None:
+            seek_value, pkey_val = after
+            query = query.where(
+                or_(
+                    seek_column > seek_value,
+                    and_(seek_column == seek_value, primary_key > pkey_val),
+                )
+            )
+
+        query = query.order_by(seek_column, primary_key).limit(limit)
+
+        rows = await self._execute(query)
+        return rows.all()
 
     async def get_by_field(self, *, field: str, field_value: Any) -> Any:
         """Return objects from db with condition field=val."""
@@ -192,7 +524,7 @@ class BaseRepo:
             getattr(self._cls_model, field) == field_value
         )
 
-        rows = await self._session.execute(query)
+        rows = await self._execute(query)
         return rows.scalars().all()
 
     async def get_by_field_or_none(self, *, field: str, field_value: Any) -> Any:
@@ -201,23 +533,22 @@ class BaseRepo:
             getattr(self._cls_model, field) == field_value
         )
 
-        rows = await self._session.execute(custom_query)
+        rows = await self._execute(custom_query)
         return rows.scalar()
 
 
-class SecondaryBaseRepo:
+class SecondaryBaseRepo(SessionMixin):
     """Base repo for M2M models."""
 
     _cls_model: DeclarativeMeta
-
-    def __init__(self, session: AsyncSession):
-        self._session = session
+    # model the second primary key points to, see get_targets_by_page
+    _target_model: DeclarativeMeta | None = None
 
     async def create(self, *, model_data: dict[str, Any]) -> Any:
         """Create object."""
         query = insert(self._cls_model).values(**model_data)
 
-        await self._session.execute(query)
+        await self._execute(query)
         await self._session.commit()
 
     async def delete(self, *, pkey_val: Any, secondary_pkey_val: Any) -> None:
@@ -226,9 +557,6 @@ class SecondaryBaseRepo:
         first_primary_key = p_keys[0].name
         secondary_primary_key = p_keys[1].name
 
-        print(first_primary_key)
-        print(secondary_primary_key)
-
         query = (
             delete(self._cls_model)
             .where(
@@ -238,8 +566,8 @@ class SecondaryBaseRepo:
             .execution_options(synchronize_session="fetch")
         )
 
-        print(query)
-        await self._session.execute(query)
+        logger.debug("delete query %s", query)
+        await self._execute(query)
         await self._session.commit()
 
     async def all(
@@ -248,18 +576,79 @@ class SecondaryBaseRepo:
         """Get all objects by db model."""
         query = select(self._cls_model)
 
-        rows = await self._session.execute(query)
+        rows = await self._execute(query)
         return rows.scalars().all()
 
-    async def get_by_first_pk(self, *, pkey_val: Any) -> Any:
+    def _target_join(self) -> Any:
+        """Join condition of the target model and the association model."""
+        first_primary_key = inspect(self._cls_model).primary_key[0]
+        target_table = inspect(self._target_model).local_table
+        conditions = [
+            foreign_key.parent == foreign_key.column
+            for foreign_key in self._cls_model.__table__.foreign_keys
+            if foreign_key.references(target_table)
+            and foreign_key.parent is not first_primary_key
+        ]
+        if not conditions:
+            raise ValueError(
+                f"{self._cls_model.__name__} has no foreign key to "
+                f"{self._target_model.__name__}"
+            )
+
+        return and_(*conditions)
+
+    async def get_targets_by_page(
+        self,
+        *,
+        pkey_val: Any,
+        page: int,
+        page_size: int,
+        options: tuple = (),
+        columns: tuple[str, ...] | None = None,
+    ) -> tuple[Any, int]:
+        """Page of the target objects linked to pkey_val, or row mappings of columns."""
+        first_primary_key = inspect(self._cls_model).primary_key[0]
+        count_query = (
+            select(func.count())
+            .select_from(self._cls_model)
+            .where(first_primary_key == pkey_val)
+        )
+        count_result = await self._execute(count_query)
+        count = count_result.scalar()
+        if not count:
+            return tuple(), count
+
+        if columns:
+            query = select(*(getattr(self._target_model, column) for column in columns))
+        else:
+            query = select(self._target_model)
+            if options:
+                query = query.options(*options)
+
+        query = (
+            query.join(self._cls_model, self._target_join())
+            .where(first_primary_key == pkey_val)
+            .order_by(*inspect(self._target_model).primary_key)
+            .limit(page_size)
+            .offset(page_size * (page - 1))
+        )
+        rows = await self._execute(query)
+        if columns:
+            return rows.mappings().all(), count
+
+        return rows.scalars().all(), count
+
+    async def get_by_first_pk(self, *, pkey_val: Any, options: tuple = ()) -> Any:
         """Return objects from db with condition field=val."""
         first_primary_key = inspect(self._cls_model).primary_key[0].name
 
         query = select(self._cls_model).where(
             getattr(self._cls_model, first_primary_key) == pkey_val
         )
+        if options:
+            query = query.options(*options)
 
-        rows = await self._session.execute(query)
+        rows = await self._execute(query)
         return rows.scalars().all()
 
     async def get_by_field(self, *, field: str, field_value: Any) -> Any:
@@ -268,7 +657,7 @@ class SecondaryBaseRepo:
             getattr(self._cls_model, field) == field_value
         )
 
-        rows = await self._session.execute(query)
+        rows = await self._execute(query)
         return rows.scalars().all()
 
     async def get_by_field_or_none(self, *, field: str, field_value: Any) -> Any:
@@ -277,5 +666,5 @@ class SecondaryBaseRepo:
             getattr(self._cls_model, field) == field_value
         )
 
-        rows = await self._session.execute(custom_query)
+        rows = await self._execute(custom_query)
         return rows.scalar()
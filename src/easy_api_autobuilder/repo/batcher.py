@@ -0,0 +1,141 @@
+"""Write-behind batching of single row inserts."""
+import asyncio
+from typing import Any
+
+from sqlalchemy import insert
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.inspection import inspect
+from sqlalchemy.orm import DeclarativeMeta
+
+from easy_api_autobuilder.repo.timeouts import execute
+
+# what a single bad row makes a batch raise, worth retrying row by row
+row_errors = (IntegrityError, DataError)
+
+
+class WriteBatcher:
+    """Coalesce concurrent creates into one multi-row INSERT ... RETURNING.
+
+    Rows wait until max_size rows are queued or max_latency seconds passed since the
+    first one, then go to the database in one transaction on a session of their own.
+    Each submit() returns the primary key of its row. When a bad row fails the batch,
+    an IntegrityError or DataError, every row is retried in its own transaction so
+    it only fails its own request; other errors, e.g. a StatementTimeout, fail
+    the whole batch. Statements go through execute(), under the statement timeout
+    and slow query log of the route that started the flush.
+    """
+
+    def __init__(
+        self,
+        model: DeclarativeMeta,
+        session_factory: async_sessionmaker,
+        max_size: int = 100,
+        max_latency: float = 0.005,
+    ):
+        self._model = model
+        self._session_factory = session_factory
+        self.max_size = max_size
+        self.max_latency = max_latency
+
+        self._primary_key = inspect(model).primary_key[0]
+        self._pending: list[tuple[dict[str, Any], asyncio.Future]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._flushes: set[asyncio.Task] = set()
+
+    async def submit(self, model_data: dict[str, Any]) -> Any:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((model_data, future))
+
+        if len(self._pending) >= self.max_size:
+            self._start_flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_latency, self._start_flush)
+
+        try:
+            return await future
+        except asyncio.CancelledError:
+            # not flushed yet, the row goes with its request
+            self._pending = [entry for entry in self._pending if entry[1] is not future]
+            raise
+
+    async def close(self) -> None:
+        """Flush queued rows and wait for running flushes."""
+        if self._pending:
+            self._start_flush()
+
+        await asyncio.gather(*self._flushes, return_exceptions=True)
+
+    def _start_flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        flush = asyncio.create_task(self._flush(batch))
+        self._flushes.add(flush)
+        flush.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, batch: list[tuple[dict[str, Any], asyncio.Future]]) -> None:
+        try:
+            async with self._session_factory() as session:
+                primary_keys = await self._insert(
+                    session, [model_data for model_data, _future in batch]
+                )
+                await session.commit()
+        except row_errors:
+            await self._flush_one_by_one(batch)
+            return
+        except Exception as error:
+            for _model_data, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+            return
+
+        for (_model_data, future), primary_key in zip(batch, primary_keys):
+            if not future.done():
+                future.set_result(primary_key)
+
+    async def _insert(
+        self, session: AsyncSession, rows: list[dict[str, Any]]
+    ) -> list[Any]:
+        dialect = session.get_bind().dialect
+        if dialect.insert_executemany_returning_sort_by_parameter_order:
+            query = insert(self._model).returning(
+                self._primary_key, sort_by_parameter_order=True
+            )
+            result = await execute(session, query, rows)
+            return result.scalars().all()
+
+        # no ordered RETURNING for executemany, one statement per row, still one commit
+        primary_keys = []
+        for model_data in rows:
+            result = await execute(session, insert(self._model).values(**model_data))
+            primary_keys.append(result.inserted_primary_key[0])
+
+        return primary_keys
+
+    async def _flush_one_by_one(
+        self, batch: list[tuple[dict[str, Any], asyncio.Future]]
+    ) -> None:
+        for model_data, future in batch:
+            if future.cancelled():
+                continue
+
+            try:
+                async with self._session_factory() as session:
+                    result = await execute(
+                        session, insert(self._model).values(**model_data)
+                    )
+                    await session.commit()
+            except Exception as error:
+                if not future.done():
+                    future.set_exception(error)
+                continue
+
+            if not future.done():
+                future.set_result(result.inserted_primary_key[0])
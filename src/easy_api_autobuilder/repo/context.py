@@ -0,0 +1,7 @@
+"""Request scoped state read by repos."""
+from contextvars import ContextVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# request session for repos built without one, see SessionBoundService
+session_context: ContextVar[AsyncSession] = ContextVar("session_context")
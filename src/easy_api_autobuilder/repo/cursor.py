@@ -0,0 +1,19 @@
+"""Keyset cursors for seek queries."""
+import base64
+from typing import Any
+
+from pydantic import TypeAdapter
+
+
+class SeekCursor:
+    """Opaque cursor holding the (seek field, primary key) of the last row sent."""
+
+    def __init__(self, field_type: type, pk_type: type):
+        self._adapter = TypeAdapter(tuple[field_type, pk_type])
+
+    def encode(self, cursor_values: tuple[Any, Any]) -> str:
+        return base64.urlsafe_b64encode(self._adapter.dump_json(cursor_values)).decode()
+
+    def decode(self, cursor: str) -> tuple[Any, Any]:
+        """Raise ValueError for cursors this route did not issue."""
+        return self._adapter.validate_json(base64.urlsafe_b64decode(cursor.encode()))
@@ -0,0 +1,53 @@
+"""Read only transactions of GET routes."""
+from contextvars import ContextVar
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from easy_api_autobuilder.arguments import ReadOnlyArguments
+
+# set per GET route by the view
+read_only: ContextVar[ReadOnlyArguments | None] = ContextVar("read_only", default=None)
+
+
+def read_only_options(
+    arguments: ReadOnlyArguments, dialect_name: str, server_side: bool = False
+) -> dict[str, Any]:
+    """Connection execution options, reset by the pool once the connection is back.
+
+    Server side cursors need a transaction, they never get autocommit.
+    """
+    if arguments.autocommit and not server_side:
+        return {"isolation_level": "AUTOCOMMIT"}
+
+    if dialect_name != "postgresql":
+        return {}
+
+    options = {"postgresql_readonly": True}
+    if arguments.deferrable:
+        options["isolation_level"] = "SERIALIZABLE"
+        options["postgresql_deferrable"] = True
+    elif arguments.consistent:
+        options["isolation_level"] = "REPEATABLE READ"
+
+    return options
+
+
+async def begin_read_only(
+    session: AsyncSession,
+    arguments: ReadOnlyArguments | None,
+    server_side: bool = False,
+) -> None:
+    """Check out the session connection with the read only options.
+
+    A session already in a transaction, e.g. used by another dependency of the
+    route first, keeps the one it has.
+    """
+    if arguments is None or session.in_transaction():
+        return
+
+    options = read_only_options(
+        arguments, session.get_bind().dialect.name, server_side
+    )
+    if options:
+        await session.connection(execution_options=options)
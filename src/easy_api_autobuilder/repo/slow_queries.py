@@ -0,0 +1,242 @@
+"""Slow query log of repo statements."""
+import logging
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy.engine import CursorResult, Result
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger("easy_api_autobuilder.slow_queries")
+
+explain_prefixes = {"sqlite": "EXPLAIN QUERY PLAN "}
+# longest parameter value kept when values are logged
+max_value_length = 64
+
+
+@dataclass
+class QueryShape:
+    """Statements of one SQL text, whatever their parameter values."""
+
+    sql: str
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    # of the slowest one
+    route: str | None = None
+    params: Any = None
+    rows: int | None = None
+    plan: list[str] | None = field(default=None, repr=False)
+    # what the statement raised, e.g. StatementTimeout
+    error: str | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "sql": self.sql,
+            "count": self.count,
+            "total_ms": self.total * 1000,
+            "max_ms": self.max * 1000,
+            "mean_ms": self.total / self.count * 1000,
+            "route": self.route,
+            "params": self.params,
+            "rows": self.rows,
+            "plan": self.plan,
+            "error": self.error,
+        }
+
+
+def normalize_value(value: Any, log_values: bool) -> Any:
+    if not log_values:
+        return type(value).__name__
+
+    if isinstance(value, (int, float, bool)) or value is None:
+        return value
+
+    text = str(value)
+    if len(text) > max_value_length:
+        return text[:max_value_length] + "..."
+
+    return text
+
+
+class SlowQueryLog:
+    """Logs repo statements over threshold seconds and keeps the top_n slowest shapes.
+
+    Parameters are logged as their type names unless log_values, filters come from
+    clients. With explain, the plan of a slow statement is read on its connection.
+    """
+
+    def __init__(
+        self,
+        threshold: float,
+        explain: bool = False,
+        top_n: int = 20,
+        log_values: bool = False,
+    ):
+        self.threshold = threshold
+        self.explain = explain
+        self.top_n = top_n
+        self.log_values = log_values
+        self._shapes: dict[str, QueryShape] = {}
+
+    def top(self) -> list[dict[str, Any]]:
+        shapes = sorted(self._shapes.values(), key=lambda shape: shape.max, reverse=True)
+        return [shape.as_dict() for shape in shapes]
+
+    def clear(self) -> None:
+        self._shapes.clear()
+
+    async def record(
+        self,
+        session: AsyncSession,
+        query: Any,
+        params: Any,
+        result: Result,
+        duration: float,
+        route: str | None,
+    ) -> Result:
+        """Log a statement over the threshold, returns the result to use instead."""
+        is_dml = getattr(query, "is_dml", False)
+        if is_dml and isinstance(result, CursorResult):
+            # kept as is, callers read inserted_primary_key off the cursor result
+            rows = result.rowcount
+        elif is_dml and not query.exported_columns:
+            # ORM bulk statement without RETURNING, no rowcount, one row per set
+            rows = len(params) if isinstance(params, list) else None
+        else:
+            # buffered already, freeze to count the rows and hand out a fresh copy
+            frozen = result.freeze()
+            rows = len(frozen.data)
+            result = frozen()
+
+        await self.record_rows(session, query, params, rows, duration, route)
+        return result
+
+    async def record_rows(
+        self,
+        session: AsyncSession,
+        query: Any,
+        params: Any,
+        rows: int | None,
+        duration: float,
+        route: str | None,
+    ) -> None:
+        """Log a statement over the threshold that returned rows rows."""
+        dialect = session.get_bind().dialect
+        sql = str(query.compile(dialect=dialect))
+        normalized = self._normalize_params(query, params, dialect)
+        plan = None
+        if self.explain and not isinstance(params, list):
+            plan = await self._explain(session, query, dialect)
+
+        logger.warning(
+            "slow query %.1fms route=%s rows=%s sql=%s params=%s plan=%s",
+            duration * 1000,
+            route,
+            rows,
+            sql,
+            normalized,
+            plan,
+        )
+        self._add(sql, duration, route, normalized, rows, plan)
+
+    def record_failure(
+        self,
+        session: AsyncSession,
+        query: Any,
+        params: Any,
+        duration: float,
+        route: str | None,
+        error: BaseException,
+    ) -> None:
+        """Log a statement that raised over the threshold, without its plan."""
+        dialect = session.get_bind().dialect
+        sql = str(query.compile(dialect=dialect))
+        normalized = self._normalize_params(query, params, dialect)
+        failure = type(error).__name__
+
+        logger.warning(
+            "failed slow query %.1fms route=%s error=%s sql=%s params=%s",
+            duration * 1000,
+            route,
+            failure,
+            sql,
+            normalized,
+        )
+        self._add(sql, duration, route, normalized, None, None, failure)
+
+    def _normalize_params(self, query: Any, params: Any, dialect: Any) -> Any:
+        if isinstance(params, list):
+            # executemany
+            return {"rows": len(params)}
+
+        if params is None:
+            params = query.compile(dialect=dialect).params
+
+        return {
+            name: normalize_value(value, self.log_values)
+            for name, value in params.items()
+        }
+
+    async def _explain(
+        self, session: AsyncSession, query: Any, dialect: Any
+    ) -> list[str] | None:
+        try:
+            statement = str(
+                query.compile(dialect=dialect, compile_kwargs={"literal_binds": True})
+            )
+        except (SQLAlchemyError, NotImplementedError, TypeError) as error:
+            return ["not explained: {0}".format(error)]
+
+        explain = explain_prefixes.get(dialect.name, "EXPLAIN ") + statement
+        connection = await session.connection()
+        try:
+            if dialect.name == "postgresql":
+                # a failing EXPLAIN must not abort the request transaction
+                async with connection.begin_nested():
+                    rows = await connection.exec_driver_sql(explain)
+            else:
+                rows = await connection.exec_driver_sql(explain)
+        except SQLAlchemyError as error:
+            return ["not explained: {0}".format(error)]
+
+        return [" ".join(str(column) for column in row) for row in rows.all()]
+
+    def _add(
+        self,
+        sql: str,
+        duration: float,
+        route: str | None,
+        params: Any,
+        rows: int | None,
+        plan: list[str] | None,
+        error: str | None = None,
+    ) -> None:
+        shape = self._shapes.get(sql)
+        if shape is None:
+            if len(self._shapes) >= self.top_n:
+                fastest = min(self._shapes.values(), key=lambda shape: shape.max)
+                if fastest.max >= duration:
+                    return
+
+                del self._shapes[fastest.sql]
+
+            shape = QueryShape(sql)
+            self._shapes[sql] = shape
+
+        shape.count += 1
+        shape.total += duration
+        if duration >= shape.max:
+            shape.max = duration
+            shape.route = route
+            shape.params = params
+            shape.rows = rows
+            shape.plan = plan
+            shape.error = error
+
+
+# the log and the route of the current request, set per route by the view
+slow_query_context: ContextVar[tuple[SlowQueryLog, str] | None] = ContextVar(
+    "slow_query_context", default=None
+)
@@ -0,0 +1,176 @@
+"""Statement deadlines of repo queries."""
+import asyncio
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterator
+
+from sqlalchemy import text
+from sqlalchemy.engine import Result
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from easy_api_autobuilder.profiling import request_timings, timed
+from easy_api_autobuilder.repo.read_only import begin_read_only, read_only
+from easy_api_autobuilder.repo.slow_queries import slow_query_context
+
+# seconds, set per route by the view
+statement_timeout: ContextVar[float | None] = ContextVar(
+    "statement_timeout", default=None
+)
+
+postgres_query_canceled = "57014"
+timeout_info_key = "easy_api_autobuilder_statement_timeout"
+
+
+class StatementTimeout(Exception):
+    pass
+
+
+# what statements read off the route, see route_statement_context()
+statement_variables = (statement_timeout, read_only, slow_query_context, request_timings)
+
+
+def route_statement_context() -> list[tuple[ContextVar, Any]]:
+    """The statement settings of the current route, for restored() later on."""
+    return [(variable, variable.get()) for variable in statement_variables]
+
+
+@contextmanager
+def restored(captured: list[tuple[ContextVar, Any]]) -> Iterator[None]:
+    """Statement settings captured by route_statement_context() set again.
+
+    For statements run once the route returned, e.g. the rows of a streamed body.
+    """
+    tokens = [variable.set(value) for variable, value in captured]
+    try:
+        yield
+    finally:
+        for (variable, _), token in zip(reversed(captured), reversed(tokens)):
+            variable.reset(token)
+
+
+async def execute(session: AsyncSession, query: Any, params: Any = None) -> Result:
+    """Every repo statement goes through here, see execute_with_timeout()."""
+    recording = slow_query_context.get()
+    with timed("db"):
+        await begin_read_only(session, read_only.get())
+        if recording is None:
+            return await execute_with_timeout(session, query, params)
+
+        slow_query_log, route = recording
+        began = time.perf_counter()
+        try:
+            result = await execute_with_timeout(session, query, params)
+        except Exception as error:
+            duration = time.perf_counter() - began
+            if duration >= slow_query_log.threshold:
+                slow_query_log.record_failure(
+                    session, query, params, duration, route, error
+                )
+            raise
+
+        duration = time.perf_counter() - began
+
+    if duration < slow_query_log.threshold:
+        return result
+
+    return await slow_query_log.record(
+        session, query, params, result, duration, route
+    )
+
+
+async def execute_with_timeout(
+    session: AsyncSession, query: Any, params: Any = None
+) -> Result:
+    """session.execute() under the statement_timeout of the current route."""
+    return await within_deadline(session, session.execute(query, params))
+
+
+async def stream(
+    session: AsyncSession, query: Any, rows: Callable[[Any], Any]
+) -> AsyncIterator[list[Any]]:
+    """Partitions of rows(session.stream(query)), fetched under the same deadline
+    and slow query log as execute(), the deadline applying to each fetch.
+
+    The statement is logged once its rows are all fetched, duration the time spent
+    in the database, not in between fetches.
+    """
+    slow_query_log, route = slow_query_context.get() or (None, None)
+    fetching = 0.0
+    fetched = 0
+    try:
+        began = time.perf_counter()
+        with timed("db"):
+            partitions = rows(
+                await within_deadline(session, session.stream(query))
+            ).partitions()
+        fetching += time.perf_counter() - began
+        while True:
+            began = time.perf_counter()
+            with timed("db"):
+                partition = await within_deadline(session, anext(partitions, None))
+            fetching += time.perf_counter() - began
+            if partition is None:
+                break
+
+            fetched += len(partition)
+            yield partition
+    except Exception as error:
+        if slow_query_log is not None and fetching >= slow_query_log.threshold:
+            slow_query_log.record_failure(session, query, None, fetching, route, error)
+        raise
+
+    if slow_query_log is not None and fetching >= slow_query_log.threshold:
+        await slow_query_log.record_rows(session, query, None, fetched, fetching, route)
+
+
+async def within_deadline(session: AsyncSession, statement: Awaitable) -> Any:
+    """Await statement, run on session, under the statement_timeout of the route.
+
+    PostgreSQL enforces it server side with SET LOCAL statement_timeout, once per
+    transaction. Other dialects, and PostgreSQL connections in autocommit where
+    SET LOCAL has no transaction to apply to, e.g. GET routes with
+    ReadOnlyArguments.autocommit, get an asyncio timeout around the call.
+    """
+    timeout = statement_timeout.get()
+    if timeout is None:
+        return await statement
+
+    if session.get_bind().dialect.name != "postgresql" or await _in_autocommit(
+        session
+    ):
+        try:
+            return await asyncio.wait_for(statement, timeout)
+        except asyncio.TimeoutError as error:
+            raise StatementTimeout(f"statement exceeded {timeout}s") from error
+
+    await _set_local_timeout(session, int(timeout * 1000))
+    try:
+        return await statement
+    except DBAPIError as error:
+        if getattr(error.orig, "pgcode", None) == postgres_query_canceled:
+            raise StatementTimeout(f"statement exceeded {timeout}s") from error
+
+        raise
+
+
+async def _in_autocommit(session: AsyncSession) -> bool:
+    connection = await session.connection()
+    options = connection.sync_connection.get_execution_options()
+    return options.get("isolation_level") == "AUTOCOMMIT"
+
+
+async def _set_local_timeout(session: AsyncSession, milliseconds: int) -> None:
+    transaction = session.sync_session.get_transaction()
+    if transaction is not None and session.info.get(timeout_info_key) == (
+        transaction,
+        milliseconds,
+    ):
+        return
+
+    await session.execute(text(f"SET LOCAL statement_timeout = {milliseconds}"))
+    session.info[timeout_info_key] = (
+        session.sync_session.get_transaction(),
+        milliseconds,
+    )
@@ -0,0 +1,6 @@
+from easy_api_autobuilder.response.response import EncodedResponse, response_class_factory
+from easy_api_autobuilder.response.stream import (
+    PageStream,
+    PageStreamResponse,
+    encode_page,
+)
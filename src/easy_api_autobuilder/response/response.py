@@ -0,0 +1,152 @@
+"""Responses encoded straight from pydantic models."""
+import gzip
+from typing import Any, Mapping
+
+from pydantic_core import to_json, to_jsonable_python
+from starlette.background import BackgroundTask
+from starlette.datastructures import Headers
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+from easy_api_autobuilder.base_enum import ResponseEncodingEnum
+from easy_api_autobuilder.profiling import timed
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+msgpack_media_types = ("application/msgpack", "application/x-msgpack")
+# most specific first, see quality()
+json_media_ranges = ("application/json", "application/*", "*/*")
+gzip_codings = ("gzip", "x-gzip", "*")
+
+
+def quality_values(header: str) -> dict[str, float]:
+    """Lowercased tokens of an Accept or Accept-Encoding header and their q-values.
+
+    Tokens with a malformed q-value are left out.
+    """
+    qualities = {}
+    for item in header.split(","):
+        token, *parameters = item.split(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+
+        qualities[token] = 1.0
+        for parameter in parameters:
+            name, _, parameter_value = parameter.partition("=")
+            if name.strip().lower() != "q":
+                continue
+
+            try:
+                qualities[token] = float(parameter_value)
+            except ValueError:
+                del qualities[token]
+            break
+
+    return qualities
+
+
+def quality(qualities: dict[str, float], tokens: tuple[str, ...]) -> float:
+    """q-value of the first of tokens the header lists, 0 when it lists none."""
+    for token in tokens:
+        if token in qualities:
+            return qualities[token]
+
+    return 0.0
+
+
+class EncodedResponse(Response):
+    """Response rendered when it is sent, so encoding can follow the request headers.
+
+    JSON is produced by pydantic-core directly from the models, without the
+    jsonable_encoder pass FastAPI applies to plain return values.
+    """
+
+    media_type = "application/json"
+    negotiate_msgpack: bool = False
+    gzip_min_size: int | None = None
+    gzip_level: int = 6
+
+    def __init__(
+        self,
+        content: Any,
+        status_code: int = 200,
+        headers: Mapping[str, str] | None = None,
+        media_type: str | None = None,
+        background: BackgroundTask | None = None,
+    ):
+        self.content = content
+        self.status_code = status_code
+        self.background = background
+        self.body = b""
+        if media_type is not None:
+            self.media_type = media_type
+
+        self.raw_headers = [
+            (name.lower().encode("latin-1"), header_value.encode("latin-1"))
+            for name, header_value in (headers or {}).items()
+        ]
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
+
+    def encode(self, accept: str) -> tuple[bytes, str]:
+        """MessagePack when the client prefers it to JSON, ties going to it.
+
+        Only explicit msgpack media types count, */* is answered with JSON.
+        """
+        if self.negotiate_msgpack and accept:
+            qualities = quality_values(accept)
+            json_quality = quality(qualities, json_media_ranges)
+            for msgpack_media_type in msgpack_media_types:
+                msgpack_quality = qualities.get(msgpack_media_type, 0.0)
+                if msgpack_quality > 0 and msgpack_quality >= json_quality:
+                    packed = msgpack.packb(to_jsonable_python(self.content))
+                    return packed, msgpack_media_type
+
+        return self.render(self.content), self.media_type
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        request_headers = Headers(scope=scope)
+        with timed("encoding"):
+            body, media_type = self.encode(request_headers.get("accept", ""))
+        headers = [(b"content-type", media_type.encode("latin-1"))]
+
+        if self.negotiate_msgpack:
+            headers.append((b"vary", b"Accept"))
+
+        if self.gzip_min_size is not None:
+            headers.append((b"vary", b"Accept-Encoding"))
+            accept_encoding = quality_values(
+                request_headers.get("accept-encoding", "")
+            )
+            if (
+                len(body) >= self.gzip_min_size
+                and quality(accept_encoding, gzip_codings) > 0
+            ):
+                body = gzip.compress(body, compresslevel=self.gzip_level)
+                headers.append((b"content-encoding", b"gzip"))
+
+        headers.append((b"content-length", str(len(body)).encode("latin-1")))
+        self.body = body
+        self.raw_headers = [*self.raw_headers, *headers]
+        await super().__call__(scope, receive, send)
+
+
+def response_class_factory(
+    encoding: ResponseEncodingEnum, gzip_threshold: int | None = None
+) -> type[EncodedResponse]:
+    msgpack_negotiation = encoding == ResponseEncodingEnum.MSGPACK
+    if msgpack_negotiation and msgpack is None:
+        raise RuntimeError("ResponseEncodingEnum.MSGPACK requires the msgpack package")
+
+    class AnonymousResponse(EncodedResponse):
+        negotiate_msgpack = msgpack_negotiation
+        gzip_min_size = gzip_threshold
+
+    AnonymousResponse.__name__ = "{0}Response".format(encoding.capitalize())
+
+    return AnonymousResponse
@@ -0,0 +1,68 @@
+"""Page responses encoded while their rows are fetched."""
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator, AsyncIterator, Callable, Mapping
+
+from pydantic import BaseModel
+from pydantic_core import to_json
+from starlette.background import BackgroundTask
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+# bytes collected before a chunk is sent
+stream_chunk_size = 64 * 1024
+
+
+@dataclass
+class PageStream:
+    """Page fields and the rows of page_data, still to be fetched."""
+
+    envelope: dict[str, Any]
+    rows: AsyncGenerator[Any, None]
+    schema: type[BaseModel]
+
+
+async def encode_page(page: PageStream) -> AsyncIterator[bytes]:
+    """JSON of a Page, the envelope first and then page_data one row at a time."""
+    chunk = bytearray(to_json(page.envelope)[:-1])
+    chunk.extend(b',"page_data":[' if page.envelope else b'"page_data":[')
+    separator = b""
+    try:
+        async for row in page.rows:
+            chunk.extend(separator)
+            chunk.extend(to_json(page.schema.model_validate(row)))
+            separator = b","
+            if len(chunk) >= stream_chunk_size:
+                yield bytes(chunk)
+                chunk.clear()
+    finally:
+        # a client gone mid body, the rows hold a session
+        await page.rows.aclose()
+
+    chunk.extend(b"]}")
+    yield bytes(chunk)
+
+
+class PageStreamResponse(StreamingResponse):
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        content: PageStream,
+        status_code: int = 200,
+        headers: Mapping[str, str] | None = None,
+        media_type: str | None = None,
+        background: BackgroundTask | None = None,
+    ):
+        super().__init__(
+            encode_page(content), status_code, headers, media_type, background
+        )
+        # run once the body is sent, failed or not, e.g. to release the
+        # admission slot its rows are fetched in
+        self.on_sent: list[Callable[[], None]] = []
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            for callback in self.on_sent:
+                callback()
@@ -1,4 +1,12 @@
+from easy_api_autobuilder.schema.aggregate import AggregateResult, AggregateRow
 from easy_api_autobuilder.schema.base import BaseModel, IntegerIdSchema, UUIDIdSchema
+from easy_api_autobuilder.schema.batch import (
+    BatchOperation,
+    BatchOperationResult,
+    BatchRequest,
+    BatchResult,
+)
+from easy_api_autobuilder.schema.bulk_import import ImportResult, ImportRowError
 from easy_api_autobuilder.schema.creation_strategy import (
     BaseSchemaCreationStrategy,
     RequestTypes,
@@ -7,4 +15,17 @@ from easy_api_autobuilder.schema.creation_strategy import (
     StrategyReturn,
     post_response_schema_factory,
 )
+from easy_api_autobuilder.schema.expansion import ExpansionVariant, SchemaExpansion
+from easy_api_autobuilder.schema.facets import Facet, FacetResult, FacetValue
 from easy_api_autobuilder.schema.factory import SchemaFactory
+from easy_api_autobuilder.schema.load_options import (
+    defer_unused_columns,
+    eager_load_relationships,
+    schema_columns,
+    schema_load_options,
+)
+from easy_api_autobuilder.schema.registry import (
+    SchemaRegistry,
+    arguments_hash,
+    default_registry,
+)
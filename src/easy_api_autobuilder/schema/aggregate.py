@@ -0,0 +1,20 @@
+"""Aggregation route response."""
+from typing import Any
+
+from pydantic import Field
+
+from easy_api_autobuilder.schema.base import BaseModel
+
+
+class AggregateRow(BaseModel):
+    group: dict[str, Any] = Field(default_factory=dict)
+    count: int
+    # {function: {field: value}}
+    sum: dict[str, Any] = Field(default_factory=dict)
+    min: dict[str, Any] = Field(default_factory=dict)
+    max: dict[str, Any] = Field(default_factory=dict)
+    avg: dict[str, Any] = Field(default_factory=dict)
+
+
+class AggregateResult(BaseModel):
+    data: list[AggregateRow]
@@ -0,0 +1,33 @@
+"""Batch route request and response."""
+from typing import Any
+
+from pydantic import Field
+
+from easy_api_autobuilder.schema.base import BaseModel
+
+
+class BatchOperation(BaseModel):
+    method: str = "GET"
+    # path of a generated route with its query string, e.g. /authors?size=5
+    path: str
+    # sent as the JSON body
+    body: Any = None
+    # on top of the headers of the batch request
+    headers: dict[str, str] = Field(default_factory=dict)
+
+
+class BatchRequest(BaseModel):
+    operations: list[BatchOperation]
+
+
+class BatchOperationResult(BaseModel):
+    status: int
+    headers: dict[str, str] = Field(default_factory=dict)
+    # parsed JSON, text, or base64 of other bodies
+    body: Any = None
+    base64: bool = False
+
+
+class BatchResult(BaseModel):
+    # in the order of the operations
+    results: list[BatchOperationResult]
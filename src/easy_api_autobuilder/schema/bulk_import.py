@@ -0,0 +1,19 @@
+"""Import route response."""
+from typing import Any
+
+from easy_api_autobuilder.schema.base import BaseModel
+
+
+class ImportRowError(BaseModel):
+    line: int
+    detail: Any
+
+
+class ImportResult(BaseModel):
+    received: int
+    inserted: int
+    failed: int
+    # first ImportArguments.max_errors record errors, then the abort reason if any
+    errors: list[ImportRowError]
+    # set when a database error stopped the import
+    aborted: bool = False
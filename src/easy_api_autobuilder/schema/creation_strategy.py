@@ -7,9 +7,14 @@ from uuid import UUID
 from fastapi import Response
 
 from easy_api_autobuilder.arguments import SchemaCreationArguments
-from easy_api_autobuilder.page import Page, PageParams
+from easy_api_autobuilder.page import ChangeFeed, ChangesParams, Page, PageParams
+from easy_api_autobuilder.schema.aggregate import AggregateResult
 from easy_api_autobuilder.schema.base import BaseModel, IntegerIdSchema, UUIDIdSchema
+from easy_api_autobuilder.schema.bulk_import import ImportResult
+from easy_api_autobuilder.schema.expansion import SchemaExpansion
+from easy_api_autobuilder.schema.facets import FacetResult
 from easy_api_autobuilder.schema.factory import SchemaFactory
+from easy_api_autobuilder.schema.load_options import schema_columns, schema_load_options
 
 
 def post_response_schema_factory(
@@ -28,6 +33,13 @@ class RequestTypes:
     body: type[BaseModel] | None
     secondary_model_pk: type[int | UUID] | None = None
     allow_none: Any = None
+    expand: Any = None
+    # more list query parameters, {name: annotation}, each defaults to []
+    query_lists: dict[str, Any] | None = None
+    # pass the starlette Request, for handlers reading the body themselves
+    raw_request: bool = False
+    # schema of the records such a handler validates
+    record_body: type[BaseModel] | None = None
 
 
 @dataclass
@@ -35,6 +47,13 @@ class StrategyReturn:
     request: RequestTypes
     response: type[BaseModel] | type[list[BaseModel]] | type[Response]
     inner_response_type: type[BaseModel] | None = None
+    # loader options for the queries of the route, see schema_load_options
+    load_options: tuple = ()
+    expansion: SchemaExpansion | None = None
+    # the service returns a PageStream, sent as a PageStreamResponse
+    stream: bool = False
+    # columns a core read selects, None when the schema needs ORM objects
+    columns: tuple[str, ...] | None = None
 
 
 class BaseSchemaCreationStrategy:
@@ -46,6 +65,17 @@ class BaseSchemaCreationStrategy:
         self._schema_factory = schema_factory
         self.arguments = SchemaCreationArguments() if arguments is None else arguments
 
+    def _expansion(
+        self, expand: bool, return_schema: type[BaseModel]
+    ) -> SchemaExpansion | None:
+        if not expand or self._schema_factory.expand_annotation is None:
+            return None
+
+        return SchemaExpansion(self._schema_factory, return_schema)
+
+    def _specialize(self, generic: Any, *parameters: Any) -> Any:
+        return self._schema_factory.registry.specialize(generic, *parameters)
+
 
 class SchemaCreationStrategy(BaseSchemaCreationStrategy):
     @cached_property
@@ -57,55 +87,139 @@ class SchemaCreationStrategy(BaseSchemaCreationStrategy):
             nested=self.arguments.list_args.nested,
             put=self.arguments.list_args.put,
             included=self.arguments.list_args.included,
+            defer_large=self.arguments.list_args.defer_large,
         )
         (
             params_schema,
             allow_none_annotation,
         ) = self._schema_factory.create_params_from_model(PageParams)
+        expansion = self._expansion(self.arguments.list_args.expand, return_schema)
+        page_schema = expansion.full_schema if expansion else return_schema
         return StrategyReturn(
             request=RequestTypes(
                 model_pk=None,
                 params=params_schema,
                 body=None,
                 allow_none=allow_none_annotation,
+                expand=expansion and self._schema_factory.expand_annotation,
             ),
-            response=Page[list[return_schema]],
+            response=self._specialize(Page, list[page_schema]),
             inner_response_type=return_schema,
+            load_options=schema_load_options(self._schema_factory.model, return_schema),
+            expansion=expansion,
+            stream=self.arguments.list_args.stream,
+            columns=schema_columns(self._schema_factory.model, return_schema),
         )
 
     @cached_property
     def detail(self) -> StrategyReturn:
+        return_schema = self._schema_factory.create_schema_from_model(
+            defaults=self.arguments.detail_args.defaults,
+            excluded=self.arguments.detail_args.excluded,
+            name_postfix=self.arguments.detail_args.name_postfix,
+            nested=self.arguments.detail_args.nested,
+            put=self.arguments.detail_args.put,
+            included=self.arguments.detail_args.included,
+        )
+        expansion = self._expansion(self.arguments.detail_args.expand, return_schema)
         return StrategyReturn(
             request=RequestTypes(
-                model_pk=self._schema_factory.pk_annotations[0], params=None, body=None
+                model_pk=self._schema_factory.pk_annotations[0],
+                params=None,
+                body=None,
+                expand=expansion and self._schema_factory.expand_annotation,
             ),
-            response=self._schema_factory.create_schema_from_model(
-                defaults=self.arguments.detail_args.defaults,
-                excluded=self.arguments.detail_args.excluded,
-                name_postfix=self.arguments.detail_args.name_postfix,
-                nested=self.arguments.detail_args.nested,
-                put=self.arguments.detail_args.put,
-                included=self.arguments.detail_args.included,
+            response=expansion.full_schema if expansion else return_schema,
+            load_options=schema_load_options(self._schema_factory.model, return_schema),
+            expansion=expansion,
+            columns=schema_columns(self._schema_factory.model, return_schema),
+        )
+
+    @cached_property
+    def changes(self) -> StrategyReturn:
+        return StrategyReturn(
+            request=RequestTypes(model_pk=None, params=ChangesParams, body=None),
+            response=self._specialize(
+                ChangeFeed, list[self.list.inner_response_type]
             ),
+            inner_response_type=self.list.inner_response_type,
+            load_options=self.list.load_options,
         )
 
     @cached_property
-    def post(self) -> StrategyReturn:
+    def bulk_import(self) -> StrategyReturn:
         return StrategyReturn(
             request=RequestTypes(
                 model_pk=None,
                 params=None,
-                body=self._schema_factory.create_schema_from_model(
-                    defaults=self.arguments.post_args.defaults,
-                    excluded=self.arguments.post_args.excluded,
-                    name_postfix=self.arguments.post_args.name_postfix,
-                    nested=self.arguments.post_args.nested,
-                    put=self.arguments.post_args.put,
-                ),
+                body=None,
+                raw_request=True,
+                record_body=self._create_body,
             ),
-            response=post_response_schema_factory(
-                self._schema_factory.pk_annotations[0]
+            response=ImportResult,
+        )
+
+    @cached_property
+    def aggregate(self) -> StrategyReturn:
+        (
+            params_schema,
+            allow_none_annotation,
+            list_annotations,
+        ) = self._schema_factory.create_aggregate_params()
+        return StrategyReturn(
+            request=RequestTypes(
+                model_pk=None,
+                params=params_schema,
+                body=None,
+                allow_none=allow_none_annotation,
+                query_lists=list_annotations,
             ),
+            response=AggregateResult,
+        )
+
+    @cached_property
+    def facets(self) -> StrategyReturn:
+        (
+            params_schema,
+            allow_none_annotation,
+            list_annotations,
+        ) = self._schema_factory.create_facet_params()
+        return StrategyReturn(
+            request=RequestTypes(
+                model_pk=None,
+                params=params_schema,
+                body=None,
+                allow_none=allow_none_annotation,
+                query_lists=list_annotations,
+            ),
+            response=FacetResult,
+        )
+
+    @cached_property
+    def _create_body(self) -> type[BaseModel]:
+        """Body of a single row, without the children of nested_create."""
+        post_args = self.arguments.post_args
+        return self._schema_factory.create_schema_from_model(
+            defaults=post_args.defaults,
+            excluded=post_args.excluded,
+            name_postfix=post_args.name_postfix,
+            nested=post_args.nested,
+            put=post_args.put,
+        )
+
+    @cached_property
+    def post(self) -> StrategyReturn:
+        post_args = self.arguments.post_args
+        body = self._create_body
+        response = post_response_schema_factory(self._schema_factory.pk_annotations[0])
+        if post_args.nested_create:
+            body, response = self._schema_factory.create_nested_create_schemas(
+                body, response, post_args.nested_create, post_args.excluded
+            )
+
+        return StrategyReturn(
+            request=RequestTypes(model_pk=None, params=None, body=body),
+            response=response,
         )
 
     @cached_property
@@ -128,28 +242,68 @@ class SchemaCreationStrategy(BaseSchemaCreationStrategy):
     @cached_property
     def delete(self) -> StrategyReturn:
         return StrategyReturn(
-            request=self.detail.request,
+            request=RequestTypes(
+                model_pk=self._schema_factory.pk_annotations[0], params=None, body=None
+            ),
             response=Response,
         )
 
 
 class SecondarySchemaCreationStrategy(BaseSchemaCreationStrategy):
+    def __init__(
+        self,
+        schema_factory: SchemaFactory,
+        arguments: SchemaCreationArguments | None = None,
+        target_factory: SchemaFactory | None = None,
+    ):
+        super().__init__(schema_factory, arguments)
+        # the list route returns pages of the target model, joined through the
+        # association model of schema_factory
+        self._target_factory = target_factory
+
     @cached_property
     def list(self) -> StrategyReturn:
+        if self._target_factory is not None:
+            return self._target_list()
+
+        return_schema = self._schema_factory.create_schema_from_model(
+            defaults=self.arguments.list_args.defaults,
+            excluded=self.arguments.list_args.excluded,
+            name_postfix=self.arguments.list_args.name_postfix,
+            nested=self.arguments.list_args.nested,
+            put=self.arguments.list_args.put,
+            included=self.arguments.list_args.included,
+            defer_large=self.arguments.list_args.defer_large,
+        )
         return StrategyReturn(
             request=RequestTypes(
                 model_pk=self._schema_factory.pk_annotations[0], params=None, body=None
             ),
-            response=list[
-                self._schema_factory.create_schema_from_model(
-                    defaults=self.arguments.list_args.defaults,
-                    excluded=self.arguments.list_args.excluded,
-                    name_postfix=self.arguments.list_args.name_postfix,
-                    nested=self.arguments.list_args.nested,
-                    put=self.arguments.list_args.put,
-                    included=self.arguments.list_args.included,
-                )
-            ]
+            response=list[return_schema],
+            load_options=schema_load_options(self._schema_factory.model, return_schema),
+        )
+
+    def _target_list(self) -> StrategyReturn:
+        target_model = self._target_factory.model
+        return_schema = self._target_factory.create_schema_from_model(
+            defaults=self.arguments.list_args.defaults,
+            excluded=self.arguments.list_args.excluded,
+            name_postfix=self.arguments.list_args.name_postfix,
+            nested=self.arguments.list_args.nested,
+            put=self.arguments.list_args.put,
+            included=self.arguments.list_args.included,
+            defer_large=self.arguments.list_args.defer_large,
+        )
+        return StrategyReturn(
+            request=RequestTypes(
+                model_pk=self._schema_factory.pk_annotations[0],
+                params=PageParams,
+                body=None,
+            ),
+            response=self._specialize(Page, list[return_schema]),
+            inner_response_type=return_schema,
+            load_options=schema_load_options(target_model, return_schema),
+            columns=schema_columns(target_model, return_schema),
         )
 
     @cached_property
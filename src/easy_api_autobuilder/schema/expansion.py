@@ -0,0 +1,47 @@
+"""Per request relation expansion of response schemas."""
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Iterable
+
+from easy_api_autobuilder.page import Page
+from easy_api_autobuilder.schema.base import BaseModel
+from easy_api_autobuilder.schema.factory import SchemaFactory
+from easy_api_autobuilder.schema.load_options import schema_columns, schema_load_options
+
+
+@dataclass(frozen=True)
+class ExpansionVariant:
+    schema: type[BaseModel]
+    page: type[Page]
+    load_options: tuple
+    # see schema_columns()
+    columns: tuple[str, ...] | None = None
+
+
+class SchemaExpansion:
+    """Schema variants of one route, built once per requested set of relationships."""
+
+    def __init__(self, schema_factory: SchemaFactory, base_schema: type[BaseModel]):
+        self._schema_factory = schema_factory
+        self._base_schema = base_schema
+        self._variants: dict[frozenset[str], ExpansionVariant] = {}
+
+    @cached_property
+    def full_schema(self) -> type[BaseModel]:
+        """Variant with every relationship, documents the route response."""
+        return self.resolve(self._schema_factory.relationships).schema
+
+    def resolve(self, expand: Iterable[str] | None) -> ExpansionVariant:
+        key = frozenset(expand or ())
+        try:
+            return self._variants[key]
+        except KeyError:
+            schema = self._schema_factory.create_expanded_schema(self._base_schema, key)
+            variant = ExpansionVariant(
+                schema=schema,
+                page=self._schema_factory.registry.specialize(Page, list[schema]),
+                load_options=schema_load_options(self._schema_factory.model, schema),
+                columns=schema_columns(self._schema_factory.model, schema),
+            )
+            self._variants[key] = variant
+            return variant
@@ -0,0 +1,21 @@
+"""Facets route response."""
+from typing import Any
+
+from easy_api_autobuilder.schema.base import BaseModel
+
+
+class FacetValue(BaseModel):
+    value: Any
+    count: int
+
+
+class Facet(BaseModel):
+    # most frequent first
+    values: list[FacetValue]
+    # the field has more distinct values than FacetArguments.limit
+    truncated: bool = False
+
+
+class FacetResult(BaseModel):
+    # {field: facet}
+    data: dict[str, Facet]
@@ -1,7 +1,8 @@
 """Schema from db model factory."""
 import datetime
 import inspect
-from enum import StrEnum
+import logging
+from decimal import Decimal
 from functools import cached_property
 from types import UnionType
 from typing import Annotated, Any, Generic
@@ -9,21 +10,38 @@ from uuid import UUID
 
 from fastapi import Query
 from pydantic import Field, create_model
-from sqlalchemy.orm import DeclarativeMeta, InstrumentedAttribute, Relationship
+from sqlalchemy import JSON, LargeBinary, Text
+from sqlalchemy.orm import (
+    DeclarativeMeta,
+    InstrumentedAttribute,
+    Relationship,
+    RelationshipDirection,
+)
 
-from easy_api_autobuilder.base_enum import OrderDirectionEnum
+from easy_api_autobuilder.base_enum import AggregateFunctionEnum, OrderDirectionEnum
 from easy_api_autobuilder.constants.constants import (
+    GROUP_BY_DATE_SUFFIX,
+    PARAM_FACET_FIELDS_NAME,
+    PARAM_GROUP_BY_FIELD_NAME,
     PARAM_ORDER_BY_FIELD_NAME,
     PARAM_ORDER_DIRECTION_FIELD_NAME,
     allocated_s,
     default_order_fields,
 )
 from easy_api_autobuilder.schema.base import BaseModel
+from easy_api_autobuilder.schema.registry import (
+    SchemaRegistry,
+    arguments_hash,
+    default_registry,
+)
 
-schema_cache: dict[str, type[BaseModel]] = {}
-schema_factory_cache: dict[str, DeclarativeMeta] = {}  # {__tablename__: Model}
-# models_cache: dict[str, DeclarativeMeta] = {}  # {ModelClassName as str: Model}
+logger = logging.getLogger(__name__)
 
+large_column_types = (
+    Text,
+    JSON,
+    LargeBinary,
+)
 
 filter_types = (
     bool,
@@ -57,19 +75,9 @@ def extract_field_type(field: InstrumentedAttribute) -> type:
 
 
 class SchemaFactory:
-    def __new__(cls, model: DeclarativeMeta) -> "SchemaFactory":
-        if model.__tablename__ in schema_factory_cache:
-            return schema_factory_cache[model.__tablename__]
-
-        instance = super().__new__(cls)
-        instance.__init__(model)
-        return instance
-
-    def __init__(self, model: DeclarativeMeta):
-        if model.__tablename__ in schema_factory_cache:
-            return
-
+    def __init__(self, model: DeclarativeMeta, registry: SchemaRegistry | None = None):
         self._model = model
+        self._registry = default_registry if registry is None else registry
         self._model_annotations = inspect.get_annotations(self._model)
         self._model_annotations.update(
             dict(
@@ -77,18 +85,87 @@ class SchemaFactory:
                 for name, field in inspect.getmembers(self._model, lambda attr: isinstance(attr, InstrumentedAttribute))
             )
         )
-        schema_factory_cache[self._model.__tablename__] = self
+
+    @classmethod
+    def for_model(
+        cls, model: DeclarativeMeta, registry: SchemaRegistry | None = None
+    ) -> "SchemaFactory":
+        """The one factory of the model in the registry."""
+        registry = default_registry if registry is None else registry
+        schema_factory = registry.schema_factories.get(model)
+        if schema_factory is None:
+            schema_factory = cls(model, registry)
+            registry.schema_factories[model] = schema_factory
+
+        return schema_factory
+
+    @property
+    def model(self) -> DeclarativeMeta:
+        return self._model
+
+    @property
+    def registry(self) -> SchemaRegistry:
+        return self._registry
+
+    @cached_property
+    def relationships(self) -> dict[str, Relationship]:
+        return dict(self._model.__mapper__.relationships.items())
+
+    @cached_property
+    def expand_annotation(self) -> Any:
+        """Query annotation listing the relationships a response can be expanded with."""
+        if not self.relationships:
+            return None
+
+        ExpandEnum = self._registry.enum(
+            "{0}{1}".format(self._pure_name, "ExpandEnum"), list(self.relationships)
+        )
+        return Annotated[list[ExpandEnum], Query()]
 
     @property
     def _pure_name(self) -> str:
         return self._model.__name__.split("Model")[0]
 
+    @cached_property
+    def numeric_fields(self) -> tuple[str, ...]:
+        """Columns sum/min/max/avg apply to, keys excluded."""
+        numeric_fields = []
+        for column_attr in self._model.__mapper__.column_attrs:
+            column = column_attr.columns[0]
+            if column.primary_key or column.foreign_keys:
+                continue
+
+            try:
+                python_type = column.type.python_type
+            except NotImplementedError:
+                continue
+
+            if python_type is not bool and issubclass(python_type, (int, float, Decimal)):
+                numeric_fields.append(column_attr.key)
+
+        return tuple(numeric_fields)
+
     def create_params_from_model(
-        self, primary_schema: type[BaseModel] | None = None, name_postfix: str = "List"
+        self,
+        primary_schema: type[BaseModel] | None = None,
+        name_postfix: str = "List",
+        order: bool = True,
     ) -> tuple[type[BaseModel], Any]:
         if primary_schema is None:
             primary_schema = BaseModel
 
+        key = ("params", self._model, primary_schema, name_postfix, order)
+        return self._registry.get_or_build(
+            key, lambda: self._build_params(key, primary_schema, name_postfix, order)
+        )
+
+    def _build_params(
+        self,
+        key: tuple,
+        primary_schema: type[BaseModel],
+        name_postfix: str,
+        order: bool,
+    ) -> tuple[type[BaseModel], Any]:
         schema_annotations = {}
         order_fields = []
         allow_none = []
@@ -111,19 +188,14 @@ class SchemaFactory:
         allow_none_annotation = None
 
         if allow_none:
-            AllowNoneEnum = StrEnum(
-                "{0}{1}".format(self._pure_name, "AllowNoneEnum"),
-                {allow_none_field: allow_none_field for allow_none_field in allow_none},
+            AllowNoneEnum = self._registry.enum(
+                "{0}{1}".format(self._pure_name, "AllowNoneEnum"), allow_none
             )
             allow_none_annotation = Annotated[list[AllowNoneEnum], Query()]
 
-        if order_fields:
-            OrderEnum = StrEnum(
-                "{0}{1}".format(self._pure_name, "OrderByEnum"),
-                {
-                    order_field_name: order_field_name
-                    for order_field_name in order_fields
-                },
+        if order and order_fields:
+            OrderEnum = self._registry.enum(
+                "{0}{1}".format(self._pure_name, "OrderByEnum"), order_fields
             )
 
             default_enum = OrderEnum(OrderEnum._member_names_[0])
@@ -132,7 +204,6 @@ class SchemaFactory:
                     default_enum = OrderEnum(field)
                     break
 
-            print(default_enum)
             schema_annotations[PARAM_ORDER_BY_FIELD_NAME] = (
                 Annotated[OrderEnum, Query(default_enum)],
                 default_enum,
@@ -142,16 +213,79 @@ class SchemaFactory:
                 Query(OrderDirectionEnum.ASC),
             )
 
-        schema_name = "{0}{1}{2}".format(self._pure_name, "Params", name_postfix)
+        schema_name = self._registry.unique_name(
+            "{0}{1}{2}".format(self._pure_name, "Params", name_postfix), key
+        )
         schema = create_model(
             schema_name, **schema_annotations, __base__=primary_schema
         )
-        schema_cache[schema_name] = schema
 
-        print(f"{self._model.__tablename__}, {schema_name}\n{schema_annotations}\n\n")
+        logger.debug("%s params schema %s", self._model.__tablename__, schema_name)
 
         return schema, allow_none_annotation
 
+    def create_aggregate_params(self) -> tuple[type[BaseModel], Any, dict[str, Any]]:
+        """Filter params, allow_none and the group_by and function list parameters."""
+        return self._registry.get_or_build(
+            ("aggregate_params", self._model), self._build_aggregate_params
+        )
+
+    def _build_aggregate_params(self) -> tuple[type[BaseModel], Any, dict[str, Any]]:
+        params_schema, allow_none_annotation = self.create_params_from_model(
+            name_postfix="Aggregate", order=False
+        )
+
+        group_fields = []
+        for field_name in params_schema.model_fields:
+            group_fields.append(field_name)
+            if eval_type(self._model_annotations[field_name]) is datetime.datetime:
+                group_fields.append(field_name + GROUP_BY_DATE_SUFFIX)
+
+        # list parameters stay out of the params model, like allow_none
+        list_annotations = {}
+        if group_fields:
+            GroupByEnum = self._registry.enum(
+                "{0}{1}".format(self._pure_name, "GroupByEnum"), group_fields
+            )
+            list_annotations[PARAM_GROUP_BY_FIELD_NAME] = Annotated[
+                list[GroupByEnum], Query()
+            ]
+
+        if self.numeric_fields:
+            NumericFieldEnum = self._registry.enum(
+                "{0}{1}".format(self._pure_name, "NumericFieldEnum"),
+                list(self.numeric_fields),
+            )
+            for function in AggregateFunctionEnum:
+                list_annotations[function.value] = Annotated[
+                    list[NumericFieldEnum], Query()
+                ]
+
+        return params_schema, allow_none_annotation, list_annotations
+
+    def create_facet_params(self) -> tuple[type[BaseModel], Any, dict[str, Any]]:
+        """Filter params, allow_none and the fields list parameter."""
+        return self._registry.get_or_build(
+            ("facet_params", self._model), self._build_facet_params
+        )
+
+    def _build_facet_params(self) -> tuple[type[BaseModel], Any, dict[str, Any]]:
+        params_schema, allow_none_annotation = self.create_params_from_model(
+            name_postfix="Facets", order=False
+        )
+
+        list_annotations = {}
+        if params_schema.model_fields:
+            FacetFieldEnum = self._registry.enum(
+                "{0}{1}".format(self._pure_name, "FacetFieldEnum"),
+                list(params_schema.model_fields),
+            )
+            list_annotations[PARAM_FACET_FIELDS_NAME] = Annotated[
+                list[FacetFieldEnum], Query()
+            ]
+
+        return params_schema, allow_none_annotation, list_annotations
+
     def create_schema_from_model(
         self,
         defaults: dict[str, Any] | None = None,
@@ -160,26 +294,140 @@ class SchemaFactory:
         name_postfix: str | None = None,
         put: bool = False,
         included: set | None = None,
+        defer_large: bool = False,
     ) -> type[BaseModel]:
-        schema_name = "".join((self._pure_name, "Schema", name_postfix))
-
-        if schema_name in schema_cache:
-            return schema_cache[schema_name]
-
         defaults = defaults or allocated_s
         excluded = excluded or allocated_s
         included = included or allocated_s
+        # nested changes nothing for models without relationships
+        nested = nested and bool(self.relationships)
+
+        arguments = arguments_hash(
+            {
+                "defaults": defaults,
+                "excluded": excluded,
+                "nested": nested,
+                "put": put,
+                "included": included,
+                "defer_large": defer_large,
+            }
+        )
+        key = ("schema", self._model, name_postfix, arguments)
+        schema_name = "".join((self._pure_name, "Schema", name_postfix))
+
+        def build() -> type[BaseModel]:  # noqa: WPS430
+            schema_annotations = self._create_schema_annotations(
+                defaults, excluded, nested, put, included, defer_large
+            )
 
-        schema_annotations = self._create_schema_annotations(
-            defaults, excluded, nested, put, included
+            logger.debug("%s schema %s", self._model.__tablename__, schema_name)
+
+            return create_model(
+                self._registry.unique_name(schema_name, key),
+                **schema_annotations,
+                __base__=BaseModel,
+            )
+
+        return self._registry.get_or_build(key, build)
+
+    def create_expanded_schema(
+        self, base_schema: type[BaseModel], expand: frozenset[str]
+    ) -> type[BaseModel]:
+        """base_schema plus the flat schemas of the expanded relationships."""
+        if not expand:
+            return base_schema
+
+        expand = tuple(sorted(expand))
+        key = ("expanded", self._model, base_schema, expand)
+        schema_name = "{0}Expand{1}".format(
+            base_schema.__name__,
+            "".join(relationship.title().replace("_", "") for relationship in expand),
         )
 
-        print(f"{self._model.__tablename__}, {schema_name}\n{schema_annotations}\n\n")
+        def build() -> type[BaseModel]:  # noqa: WPS430
+            schema_annotations = {
+                relationship: self._resolve_nested(
+                    self.relationships[relationship], nested=False
+                )
+                for relationship in expand
+                if relationship not in base_schema.model_fields
+            }
+
+            return create_model(
+                self._registry.unique_name(schema_name, key),
+                **schema_annotations,
+                __base__=base_schema,
+            )
+
+        return self._registry.get_or_build(key, build)
 
-        schema = create_model(schema_name, **schema_annotations, __base__=BaseModel)
-        schema_cache[schema_name] = schema
+    def create_nested_create_schemas(
+        self,
+        base_schema: type[BaseModel],
+        id_schema: type[BaseModel],
+        relationships: set[str],
+        excluded: set,
+    ) -> tuple[type[BaseModel], type[BaseModel]]:
+        """POST body taking child lists of one-to-many relationships and its response.
+
+        Children leave out excluded and their foreign keys to the model, the
+        response lists the new primary keys of every relationship next to id.
+        """
+        relationships = tuple(sorted(relationships))
+        key = ("nested_create", self._model, base_schema, id_schema, relationships)
+
+        def build() -> tuple[type[BaseModel], type[BaseModel]]:  # noqa: WPS430
+            body_annotations = {}
+            response_annotations = {}
+            for name in relationships:
+                relationship = self.relationships.get(name)
+                if (
+                    relationship is None
+                    or relationship.direction is not RelationshipDirection.ONETOMANY
+                    or relationship.secondary is not None
+                ):
+                    raise ValueError(
+                        f"{self._model.__name__}.{name} is not a one-to-many "
+                        "relationship"
+                    )
+
+                child_mapper = relationship.mapper
+                foreign_keys = {
+                    child_mapper.get_property_by_column(column).key
+                    for column in relationship.remote_side
+                }
+                child_factory = SchemaFactory.for_model(
+                    child_mapper.class_, self._registry
+                )
+                child_schema = child_factory.create_schema_from_model(
+                    excluded={*excluded, *foreign_keys},
+                    nested=False,
+                    name_postfix="InNestedCreate",
+                )
+                body_annotations[name] = (
+                    list[child_schema],
+                    Field(default_factory=list),
+                )
+                response_annotations[name] = (
+                    list[child_factory.pk_annotations[0]],
+                    Field(default_factory=list),
+                )
+
+            body = create_model(
+                self._registry.unique_name(base_schema.__name__ + "Nested", key),
+                **body_annotations,
+                __base__=base_schema,
+            )
+            response = create_model(
+                self._registry.unique_name(
+                    self._pure_name + "NestedCreateResponse", key
+                ),
+                **response_annotations,
+                __base__=id_schema,
+            )
+            return body, response
 
-        return schema
+        return self._registry.get_or_build(key, build)
 
     @cached_property
     def pk_annotations(self) -> tuple:
@@ -198,6 +446,7 @@ class SchemaFactory:
         nested: bool,
         put: bool,
         included: set,
+        defer_large: bool = False,
     ) -> dict[str, Any]:
         schema_annotations = {}
         for field_name, annotation in self._model_annotations.items():
@@ -206,6 +455,9 @@ class SchemaFactory:
 
             model_field: InstrumentedAttribute = getattr(self._model, field_name)
 
+            if defer_large and field_name not in included and self._is_large(model_field):
+                continue
+
             if isinstance(model_field.property, Relationship):
                 if not nested and field_name not in included:
                     continue
@@ -243,21 +495,32 @@ class SchemaFactory:
 
         return schema_annotations
 
-    def _resolve_nested(self, field_property: Relationship):
+    def _is_large(self, model_field: InstrumentedAttribute) -> bool:
+        if isinstance(model_field.property, Relationship):
+            return False
+
+        return isinstance(model_field.type, large_column_types)
+
+    def _resolve_nested(self, field_property: Relationship, nested: bool = True):
         sub_model = field_property.argument
         if isinstance(sub_model, str):
             sub_model = field_property.entity.entity
 
-        nested_schema_factory = SchemaFactory(sub_model)
+        nested_schema_factory = SchemaFactory.for_model(sub_model, self._registry)
+        postfix = "" if nested else "Expand"
 
         if field_property.uselist:
             annotation = list[
-                nested_schema_factory.create_schema_from_model(name_postfix="List")
+                nested_schema_factory.create_schema_from_model(
+                    nested=nested, name_postfix=postfix + "List"
+                )
             ]
             default_value = Field(default_factory=list)
         else:
             annotation = (
-                nested_schema_factory.create_schema_from_model(name_postfix="Detail")
+                nested_schema_factory.create_schema_from_model(
+                    nested=nested, name_postfix=postfix + "Detail"
+                )
                 | None
             )
             default_value = None
@@ -0,0 +1,77 @@
+"""ORM loader options derived from response schemas."""
+from typing import Any, get_args
+
+from sqlalchemy.inspection import inspect
+from sqlalchemy.orm import DeclarativeMeta, defer, selectinload
+from sqlalchemy.orm.strategy_options import Load
+
+from easy_api_autobuilder.schema.base import BaseModel
+
+
+def nested_schema(annotation: Any) -> type[BaseModel] | None:
+    """Schema inside annotations like list[Schema] or Schema | None."""
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+
+    for argument in get_args(annotation):
+        schema = nested_schema(argument)
+        if schema is not None:
+            return schema
+
+    return None
+
+
+def defer_unused_columns(model: DeclarativeMeta, schema: type[BaseModel]) -> tuple:
+    """defer() every non primary key column the schema never emits."""
+    emitted = schema.model_fields.keys()
+    options = []
+    for column_attr in inspect(model).column_attrs:
+        if column_attr.key in emitted:
+            continue
+
+        if any(column.primary_key for column in column_attr.columns):
+            continue
+
+        options.append(defer(column_attr.class_attribute))
+
+    return tuple(options)
+
+
+def eager_load_relationships(
+    model: DeclarativeMeta, schema: type[BaseModel], parent: Load | None = None
+) -> tuple:
+    """selectinload() every relationship the schema emits, nested schemas included."""
+    options = []
+    for relationship in inspect(model).relationships:
+        field = schema.model_fields.get(relationship.key)
+        if field is None:
+            continue
+
+        attribute = relationship.class_attribute
+        loader = selectinload(attribute) if parent is None else parent.selectinload(attribute)
+        options.append(loader)
+
+        sub_schema = nested_schema(field.annotation)
+        if sub_schema is not None:
+            options.extend(
+                eager_load_relationships(relationship.mapper.class_, sub_schema, loader)
+            )
+
+    return tuple(options)
+
+
+def schema_columns(
+    model: DeclarativeMeta, schema: type[BaseModel]
+) -> tuple[str, ...] | None:
+    """Columns of every schema field, None when a field is not a plain column."""
+    column_keys = inspect(model).column_attrs.keys()
+    columns = tuple(schema.model_fields)
+    if any(field_name not in column_keys for field_name in columns):
+        return None
+
+    return columns
+
+
+def schema_load_options(model: DeclarativeMeta, schema: type[BaseModel]) -> tuple:
+    """Load exactly what the schema emits."""
+    return defer_unused_columns(model, schema) + eager_load_relationships(model, schema)
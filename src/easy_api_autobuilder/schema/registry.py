@@ -0,0 +1,109 @@
+"""Registry of generated schemas."""
+import hashlib
+import json
+from enum import StrEnum
+from typing import Any, Callable, Hashable, TypeVar
+
+from sqlalchemy.orm import DeclarativeMeta
+
+Built = TypeVar("Built")
+
+
+def canonical(value: Any) -> Any:
+    """JSON friendly value that does not depend on dict or set ordering."""
+    if isinstance(value, dict):
+        return {str(key): canonical(item) for key, item in value.items()}
+
+    if isinstance(value, (set, frozenset)):
+        return sorted((canonical(item) for item in value), key=repr)
+
+    if isinstance(value, (list, tuple)):
+        return [canonical(item) for item in value]
+
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+
+    return repr(value)
+
+
+def arguments_hash(arguments: Any) -> str:
+    dumped = json.dumps(canonical(arguments), sort_keys=True)
+    return hashlib.sha256(dumped.encode()).hexdigest()[:16]
+
+
+class SchemaRegistry:
+    """Generated schemas, enums and generic specializations, each built once.
+
+    Entries are keyed by model and a canonical hash of the arguments they were built
+    from, so builders of one model with different SchemaCreationArguments get schemas
+    of their own. A name already taken by another key gets a hash suffix, OpenAPI
+    component names stay unique.
+
+    Use one registry per app, see for_app(); builders fall back to default_registry.
+    """
+
+    def __init__(self):
+        self._entries: dict[Hashable, Any] = {}
+        self._names: dict[str, Hashable] = {}
+        # {model: SchemaFactory}, see SchemaFactory.for_model()
+        self.schema_factories: dict[DeclarativeMeta, Any] = {}
+        self.built = 0
+        self.reused = 0
+
+    @classmethod
+    def for_app(cls, app: Any) -> "SchemaRegistry":
+        registry = getattr(app.state, "schema_registry", None)
+        if registry is None:
+            registry = cls()
+            app.state.schema_registry = registry
+
+        return registry
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "built": self.built,
+            "reused": self.reused,
+            "entries": len(self._entries),
+        }
+
+    def get_or_build(self, key: Hashable, build: Callable[[], Built]) -> Built:
+        try:
+            built = self._entries[key]
+        except KeyError:
+            built = build()
+            self._entries[key] = built
+            self.built += 1
+            return built
+
+        self.reused += 1
+        return built
+
+    def unique_name(self, name: str, key: Hashable) -> str:
+        owner = self._names.setdefault(name, key)
+        if owner == key:
+            return name
+
+        key_hash = hashlib.sha256(repr(key).encode()).hexdigest()[:8]
+        return "{0}_{1}".format(name, key_hash)
+
+    def named(self, key: Hashable, name: str, build: Callable[[str], Built]) -> Built:
+        """get_or_build() for classes named after name."""
+        return self.get_or_build(key, lambda: build(self.unique_name(name, key)))
+
+    def enum(self, name: str, members: list[str]) -> type[StrEnum]:
+        key = ("enum", name, tuple(members))
+        return self.named(
+            key,
+            name,
+            lambda unique_name: StrEnum(
+                unique_name, {member: member for member in members}
+            ),
+        )
+
+    def specialize(self, generic: Any, *parameters: Any) -> Any:
+        """generic[parameters], e.g. Page[list[Schema]]."""
+        key = ("generic", generic, parameters)
+        return self.get_or_build(key, lambda: generic[parameters])
+
+
+default_registry = SchemaRegistry()
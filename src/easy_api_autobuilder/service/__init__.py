@@ -1,10 +1,15 @@
 from easy_api_autobuilder.service.base import (
+    AggregateService,
     BaseRepoService,
     BaseService,
+    ChangesService,
     DeleteService,
     DetailService,
+    FacetService,
+    ImportService,
     ListService,
     PostService,
     PutService,
     SecondaryBaseService,
+    eval_filters,
 )
@@ -1,26 +1,97 @@
+import csv
+import logging
 from types import GenericAlias
 from typing import Any
 from uuid import UUID
 
+from fastapi import HTTPException, Request
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+
+from easy_api_autobuilder.arguments import (
+    ChangesArguments,
+    FacetArguments,
+    ImportArguments,
+)
+from easy_api_autobuilder.base_enum import AggregateFunctionEnum
+from easy_api_autobuilder.cache import TTLCache
 from easy_api_autobuilder.constants.constants import (
     ALLOW_NONE_FIELD_NAME,
     PARAM_ORDER_BY_FIELD_NAME,
     PARAM_ORDER_DIRECTION_FIELD_NAME,
     allocated_l,
 )
-from easy_api_autobuilder.page import Page, PageParams
-from easy_api_autobuilder.repo import BaseRepo, SecondaryBaseRepo
-from easy_api_autobuilder.schema import BaseModel
+from easy_api_autobuilder.page import ChangeFeed, ChangesParams, Page, PageParams
+from easy_api_autobuilder.profiling import timed
+from easy_api_autobuilder.repo import (
+    BaseRepo,
+    SecondaryBaseRepo,
+    SeekCursor,
+    WriteBatcher,
+)
+from easy_api_autobuilder.response import PageStream
+from easy_api_autobuilder.schema import (
+    AggregateResult,
+    AggregateRow,
+    BaseModel,
+    Facet,
+    FacetResult,
+    FacetValue,
+    ImportResult,
+    ImportRowError,
+    SchemaExpansion,
+)
+from easy_api_autobuilder.service.records import (
+    RecordTooLarge,
+    csv_header,
+    csv_record,
+    iter_lines,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def eval_filters(params: dict[str, Any], allow_none: list | None) -> dict | None:
+    """Drop None filters unless their field is listed in allow_none."""
+    if allow_none is None:
+        allow_none = allocated_l
+
+    logger.debug("allow none %s", allow_none)
+    filters = None
+    if params:
+        filters = {}
+        for field_name, field_value in params.items():
+            if field_value is None and field_name not in allow_none:
+                logger.debug("none filter %s dropped", field_name)
+                continue
+
+            filters[field_name] = field_value
+
+    return filters
 
 
 class BaseRepoService:
+    # cleared by every write of the service, see FacetArguments
+    _facet_cache: TTLCache | None = None
+
     def __init__(self, repo: BaseRepo):
         self._repo = repo
 
+    def _written(self) -> None:
+        """Drop cached results the write may have changed."""
+        if self._facet_cache is not None:
+            self._facet_cache.clear()
+
 
 class ListService(BaseRepoService):
     _output_list: type[Page]
     _inner_data_type: type[BaseModel]
+    _list_load_options: tuple = ()
+    _list_expansion: SchemaExpansion | None = None
+    _stream_list: bool = False
+    # pass the columns of the schema to the repo, see BuilderArguments.core_reads
+    _core_reads: bool = False
+    _list_columns: tuple[str, ...] | None = None
 
     def _eval_params(
         self, request_params: PageParams | None, allow_none: list | None
@@ -49,82 +120,398 @@ class ListService(BaseRepoService):
             exclude_unset=True,
         )
 
-        if allow_none is None:
-            allow_none = allocated_l
-
-        print(allow_none)
-        filters = None
-        if params:
-            filters = {}
-            for field_name, field_value in params.items():
-                if field_value is None and field_name not in allow_none:
-                    print(field_name, " dissallow")
-                    continue
-
-                filters[field_name] = field_value
+        filters = eval_filters(params, allow_none)
 
         return request_params, filters, order_by, order_direction
 
     async def list(
-        self, request_params: PageParams | None = None, allow_none: list | None = None
-    ) -> Page:
+        self,
+        request_params: PageParams | None = None,
+        allow_none: list | None = None,
+        expand: list | None = None,
+    ) -> Page | PageStream:
         """Here must be logic for converting query params to bd limit, offset, filters."""
-        request_params, filters, order_by, order_direction = self._eval_params(
-            request_params, allow_none
+        with timed("params"):
+            request_params, filters, order_by, order_direction = self._eval_params(
+                request_params, allow_none
+            )
+
+        output_list = self._output_list
+        inner_data_type = self._inner_data_type
+        load_options = self._list_load_options
+        columns = self._list_columns
+        if self._list_expansion is not None:
+            variant = self._list_expansion.resolve(expand)
+            output_list, inner_data_type = variant.page, variant.schema
+            load_options, columns = variant.load_options, variant.columns
+
+        logger.debug(
+            "list %s filters=%s order=%s %s",
+            request_params,
+            filters,
+            order_by,
+            order_direction,
         )
 
-        print(request_params, filters, order_by, order_direction)
+        get_page = self._repo.get_by_page
+        if self._stream_list:
+            get_page = self._repo.stream_by_page
 
-        rows_in_db, count = await self._repo.get_by_page(
+        rows_in_db, count = await get_page(
             page=request_params.page,
             page_size=request_params.size,
             filters=filters,
             order_by=order_by,
             order_dir=order_direction,
+            options=load_options,
+            columns=columns if self._core_reads else None,
         )
 
         total_pages = count // request_params.size + int(
             (count % request_params.size) > 0
         )
 
-        print(rows_in_db)
-        print(self._inner_data_type)
-
-        return self._output_list(
-            page=request_params.page,
-            size=request_params.size,
-            total_pages=total_pages,
-            page_data=[self._inner_data_type.model_validate(row) for row in rows_in_db],
-        )
+        if self._stream_list:
+            return PageStream(
+                envelope={
+                    "page": request_params.page,
+                    "size": request_params.size,
+                    "total_pages": total_pages,
+                },
+                rows=rows_in_db,
+                schema=inner_data_type,
+            )
+
+        with timed("validation"):
+            return output_list(
+                page=request_params.page,
+                size=request_params.size,
+                total_pages=total_pages,
+                page_data=[inner_data_type.model_validate(row) for row in rows_in_db],
+            )
 
 
 class DetailService(BaseRepoService):
     _output_detail: type[BaseModel]
+    _detail_load_options: tuple = ()
+    _detail_expansion: SchemaExpansion | None = None
+    _core_reads: bool = False
+    _detail_columns: tuple[str, ...] | None = None
+
+    async def detail(self, *, model_pk: Any, expand: list | None = None) -> BaseModel:
+        output_detail = self._output_detail
+        load_options = self._detail_load_options
+        columns = self._detail_columns
+        if self._detail_expansion is not None:
+            variant = self._detail_expansion.resolve(expand)
+            output_detail, load_options = variant.schema, variant.load_options
+            columns = variant.columns
+
+        row_in_db = await self._repo.get(
+            pkey_val=model_pk,
+            options=load_options,
+            columns=columns if self._core_reads else None,
+        )
+
+        with timed("validation"):
+            return output_detail.model_validate(row_in_db)
+
+
+class AggregateService(BaseRepoService):
+    _aggregate_cache: TTLCache | None = None
+
+    async def aggregate(
+        self,
+        request_params: BaseModel,
+        allow_none: list | None = None,
+        group_by: list | None = None,
+        **functions: list,
+    ) -> AggregateResult:
+        """group_by fields and {function: numeric fields} come from the query."""
+        group_by = list(dict.fromkeys(group_by or allocated_l))
+        aggregates = {}
+        for function in AggregateFunctionEnum:
+            field_names = functions.get(function.value)
+            if field_names:
+                aggregates[function.value] = list(dict.fromkeys(field_names))
+
+        cache_key = None
+        if self._aggregate_cache is not None:
+            cache_key = (
+                request_params.model_dump_json(),
+                tuple(sorted(allow_none or allocated_l)),
+                tuple(group_by),
+                tuple((name, tuple(fields)) for name, fields in aggregates.items()),
+            )
+            cached_result = self._aggregate_cache.get(cache_key)
+            if cached_result is not None:
+                return cached_result
+
+        params = request_params.model_dump(
+            exclude={ALLOW_NONE_FIELD_NAME}, exclude_unset=True
+        )
+
+        rows = await self._repo.aggregate(
+            filters=eval_filters(params, allow_none),
+            group_by=group_by,
+            aggregates=aggregates,
+        )
+
+        aggregate_rows = []
+        for row in rows:
+            row_values = iter(row)
+            aggregate_rows.append(
+                AggregateRow(
+                    group={
+                        group_field: next(row_values) for group_field in group_by
+                    },
+                    count=next(row_values),
+                    **{
+                        function_name: {
+                            field_name: next(row_values) for field_name in field_names
+                        }
+                        for function_name, field_names in aggregates.items()
+                    },
+                )
+            )
+
+        result = AggregateResult(data=aggregate_rows)
+        if cache_key is not None:
+            self._aggregate_cache.set(cache_key, result)
+
+        return result
+
+
+class FacetService(BaseRepoService):
+    _facets: FacetArguments | None = None
+
+    async def facets(
+        self,
+        request_params: BaseModel,
+        allow_none: list | None = None,
+        fields: list | None = None,
+    ) -> FacetResult:
+        """Distinct values of fields with their counts under the other filters."""
+        fields = list(dict.fromkeys(fields or allocated_l))
+
+        cache_key = None
+        if self._facet_cache is not None:
+            cache_key = (
+                request_params.model_dump_json(),
+                tuple(sorted(allow_none or allocated_l)),
+                tuple(fields),
+            )
+            cached_result = self._facet_cache.get(cache_key)
+            if cached_result is not None:
+                return cached_result
+
+        params = request_params.model_dump(
+            exclude={ALLOW_NONE_FIELD_NAME}, exclude_unset=True
+        )
+        filters = eval_filters(params, allow_none) or {}
+        limit = self._facets.limit
+
+        facets = {}
+        for field in fields:
+            # its own filter would leave the field a single value to pick
+            other_filters = {
+                field_name: field_value
+                for field_name, field_value in filters.items()
+                if field_name != field
+            }
+            rows = await self._repo.facet(
+                filters=other_filters or None, field=field, limit=limit + 1
+            )
+            facets[field] = Facet(
+                values=[
+                    FacetValue(value=value, count=count) for value, count in rows[:limit]
+                ],
+                truncated=len(rows) > limit,
+            )
+
+        result = FacetResult(data=facets)
+        if cache_key is not None:
+            self._facet_cache.set(cache_key, result)
+
+        return result
+
+
+class ChangesService(BaseRepoService):
+    _output_changes: type[ChangeFeed]
+    _changes_data_type: type[BaseModel]
+    _changes_load_options: tuple = ()
+    _changes: ChangesArguments | None = None
+    _changes_cursor: SeekCursor | None = None
+
+    async def changes(self, request_params: ChangesParams) -> ChangeFeed:
+        after = None
+        if request_params.since is not None:
+            try:
+                after = self._changes_cursor.decode(request_params.since)
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Invalid since cursor")
+
+        deleted_field = self._changes.soft_delete_field
+        rows = await self._repo.get_changes(
+            field=self._changes.field,
+            after=after,
+            limit=request_params.size + 1,
+            deleted_field=deleted_field,
+            options=self._changes_load_options,
+        )
 
-    async def detail(self, *, model_pk: Any) -> BaseModel:
-        row_in_db = await self._repo.get(pkey_val=model_pk)
+        has_more = len(rows) > request_params.size
+        rows = rows[: request_params.size]
 
-        return self._output_detail.model_validate(row_in_db)
+        changed = []
+        deleted = []
+        for row in rows:
+            if deleted_field is not None and row[3]:
+                deleted.append(row[2])
+            else:
+                changed.append(self._changes_data_type.model_validate(row[0]))
+
+        next_cursor = request_params.since
+        if rows:
+            next_cursor = self._changes_cursor.encode((rows[-1][1], rows[-1][2]))
+
+        return self._output_changes(
+            data=changed, deleted=deleted, next_cursor=next_cursor, has_more=has_more
+        )
 
 
 class DeleteService(BaseRepoService):
     async def delete(self, *, model_pk: Any) -> None:
         await self._repo.delete(pkey_val=model_pk)
+        self._written()
 
 
 class PostService(BaseRepoService):
     _input_create: type[BaseModel]
     _create_response: type[BaseModel]
+    _write_batcher: WriteBatcher | None = None
+    # relationships created with the object, see PostArguments.nested_create
+    _nested_create: tuple[str, ...] = ()
 
     async def post(self, body: BaseModel) -> BaseModel:
         assert isinstance(
             body, self._input_create
         ), f"service {self.__class__.__name__} can't recognize {body.__class__.__name__} schema"
 
-        row_id = await self._repo.create(model_data=body.model_dump())
+        if self._nested_create:
+            created = await self._repo.create_nested(
+                model_data=body.model_dump(exclude=set(self._nested_create)),
+                children={
+                    name: [child.model_dump() for child in getattr(body, name)]
+                    for name in self._nested_create
+                },
+            )
+            self._written()
+            return self._create_response(**created)
+
+        if self._write_batcher is not None:
+            row_id = await self._write_batcher.submit(body.model_dump())
+        else:
+            row_id = await self._repo.create(model_data=body.model_dump())
+
+        self._written()
         return self._create_response(id=row_id)
 
 
+class ImportService(BaseRepoService):
+    # single rows only, nested_create children are not imported
+    _input_import: type[BaseModel]
+    _import: ImportArguments | None = None
+
+    async def bulk_import(self, request: Request) -> ImportResult:
+        """Validate streamed NDJSON or CSV records and insert them in chunks."""
+        arguments = self._import
+        is_csv = "csv" in request.headers.get("content-type", "")
+        header = None
+
+        received = inserted = pending = failed = 0
+        errors = []
+        chunk = []
+        chunk_line = 0
+        aborted = False
+
+        try:
+            async for line_number, line in iter_lines(
+                request.stream(), arguments.max_line_bytes
+            ):
+                if not line.strip():
+                    continue
+
+                if is_csv and header is None:
+                    header = csv_header(line)
+                    continue
+
+                received += 1
+                try:
+                    if is_csv:
+                        record = self._input_import.model_validate(
+                            csv_record(header, line)
+                        )
+                    else:
+                        record = self._input_import.model_validate_json(line)
+                except ValidationError as error:
+                    failed += 1
+                    if len(errors) < arguments.max_errors:
+                        detail = error.errors(include_url=False, include_context=False)
+                        errors.append(ImportRowError(line=line_number, detail=detail))
+                    continue
+                except (UnicodeDecodeError, csv.Error) as error:
+                    failed += 1
+                    if len(errors) < arguments.max_errors:
+                        errors.append(ImportRowError(line=line_number, detail=str(error)))
+                    continue
+
+                if not chunk:
+                    chunk_line = line_number
+
+                chunk.append(record.model_dump())
+                if len(chunk) < arguments.chunk_size:
+                    continue
+
+                await self._repo.insert_many(
+                    model_data=chunk, commit=arguments.commit_per_chunk
+                )
+                pending += len(chunk)
+                chunk = []
+                if arguments.commit_per_chunk:
+                    inserted += pending
+                    pending = 0
+
+            if chunk:
+                await self._repo.insert_many(model_data=chunk, commit=False)
+                pending += len(chunk)
+
+            await self._repo.commit()
+            inserted += pending
+
+        except RecordTooLarge as error:
+            await self._repo.rollback()
+            aborted = True
+            errors.append(ImportRowError(line=error.line, detail=str(error)))
+
+        except SQLAlchemyError as error:
+            await self._repo.rollback()
+            aborted = True
+            detail = str(getattr(error, "orig", None) or error)
+            errors.append(ImportRowError(line=chunk_line, detail=detail))
+
+        if inserted:
+            self._written()
+
+        return ImportResult(
+            received=received,
+            inserted=inserted,
+            failed=failed,
+            errors=errors,
+            aborted=aborted,
+        )
+
+
 class PutService(BaseRepoService):
     _input_update: type[BaseModel]
 
@@ -134,11 +521,16 @@ class PutService(BaseRepoService):
         ), f"service {self.__class__.__name__} can't recognize {body.__class__.__name__} schema"
 
         await self._repo.update(pkey_val=model_pk, model_data=body.put_dump())
+        self._written()
 
 
 class BaseService(
     ListService,
     DetailService,
+    AggregateService,
+    FacetService,
+    ChangesService,
+    ImportService,
     DeleteService,
     PostService,
     PutService,
@@ -147,7 +539,13 @@ class BaseService(
 
 
 class SecondaryBaseService:
-    _output_list: type[BaseModel] | type[list[BaseModel]]
+    _output_list: type[BaseModel] | type[list[BaseModel]] | type[Page]
+    _list_load_options: tuple = ()
+    # set when the list returns pages of the target model, see SecondaryView.target
+    _inner_data_type: type[BaseModel] | None = None
+    # pass the columns of the target schema to the repo, see BuilderArguments.core_reads
+    _core_reads: bool = False
+    _list_columns: tuple[str, ...] | None = None
 
     _input_create: type[BaseModel]
 
@@ -155,16 +553,46 @@ class SecondaryBaseService:
         self._repo = repo
 
     async def list(
-        self, model_pk: int | UUID, request_params: dict | None = None
-    ) -> list[BaseModel]:
+        self, model_pk: int | UUID, request_params: PageParams | None = None
+    ) -> list[BaseModel] | Page:
         """Here must be logic for converting query params to bd limit, offset, filters."""
-        rows_in_db = await self._repo.get_by_first_pk(pkey_val=model_pk)
+        if self._inner_data_type is not None:
+            return await self._target_list(model_pk, request_params or PageParams())
+
+        rows_in_db = await self._repo.get_by_first_pk(
+            pkey_val=model_pk, options=self._list_load_options
+        )
 
         if isinstance(self._output_list, GenericAlias):
             return [self._output_list.__args__[0].model_validate(row) for row in rows_in_db]
 
         return [self._output_list.model_validate(row) for row in rows_in_db]
 
+    async def _target_list(
+        self, model_pk: int | UUID, request_params: PageParams
+    ) -> Page:
+        rows_in_db, count = await self._repo.get_targets_by_page(
+            pkey_val=model_pk,
+            page=request_params.page,
+            page_size=request_params.size,
+            options=self._list_load_options,
+            columns=self._list_columns if self._core_reads else None,
+        )
+
+        total_pages = count // request_params.size + int(
+            (count % request_params.size) > 0
+        )
+
+        with timed("validation"):
+            return self._output_list(
+                page=request_params.page,
+                size=request_params.size,
+                total_pages=total_pages,
+                page_data=[
+                    self._inner_data_type.model_validate(row) for row in rows_in_db
+                ],
+            )
+
     async def delete(
         self, *, model_pk: int | UUID, secondary_model_pk: int | UUID
     ) -> None:
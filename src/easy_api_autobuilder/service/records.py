@@ -0,0 +1,45 @@
+"""Records of a streamed upload, one per line."""
+import csv
+from typing import Any, AsyncIterator
+
+
+class RecordTooLarge(ValueError):
+    def __init__(self, line: int, max_line_bytes: int):
+        super().__init__(f"line {line} is over {max_line_bytes} bytes")
+        self.line = line
+
+
+async def iter_lines(
+    chunks: AsyncIterator[bytes], max_line_bytes: int
+) -> AsyncIterator[tuple[int, bytes]]:
+    """(line number, line) of a byte stream, holding at most one line in memory."""
+    line_number = 0
+    pending = b""
+    async for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            line_number += 1
+            if len(line) > max_line_bytes:
+                raise RecordTooLarge(line_number, max_line_bytes)
+
+            yield line_number, line.rstrip(b"\r")
+
+        if len(pending) > max_line_bytes:
+            raise RecordTooLarge(line_number + 1, max_line_bytes)
+
+    if pending:
+        yield line_number + 1, pending.rstrip(b"\r")
+
+
+def csv_record(header: list[str], line: bytes) -> dict[str, Any]:
+    """CSV line as a dict, empty cells are left out so schema defaults apply.
+
+    Quoted cells may not contain line breaks.
+    """
+    cells = next(csv.reader((line.decode(),)))
+    return {name: cell for name, cell in zip(header, cells) if cell != ""}
+
+
+def csv_header(line: bytes) -> list[str]:
+    return next(csv.reader((line.decode(),)))
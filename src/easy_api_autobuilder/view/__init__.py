@@ -1 +1,11 @@
-from easy_api_autobuilder.view.base import BaseView, ExcludeFieldAnnotation, SecondaryView, exclude_parameter
+from easy_api_autobuilder.view.admin import slow_query_router
+from easy_api_autobuilder.view.admission import AdmissionController
+from easy_api_autobuilder.view.base import (
+    BaseView,
+    ExcludeFieldAnnotation,
+    SecondaryView,
+    SessionBoundService,
+    exclude_parameter,
+)
+from easy_api_autobuilder.view.batch import batch_router
+from easy_api_autobuilder.view.warmup import warmup_handlers, warmup_lifespan
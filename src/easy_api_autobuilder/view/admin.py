@@ -0,0 +1,30 @@
+"""Admin routes of generated views."""
+from typing import Any, Sequence
+
+from fastapi import APIRouter, Response
+from fastapi.params import Depends as DependsClass
+
+from easy_api_autobuilder.repo import SlowQueryLog
+
+
+def slow_query_router(
+    slow_query_log: SlowQueryLog,
+    prefix: str = "/admin/slow-queries",
+    dependencies: Sequence[DependsClass] | None = None,
+) -> APIRouter:
+    """GET the slowest query shapes, DELETE to start over.
+
+    SQL and plans show the schema, guard the router with dependencies.
+    """
+    router = APIRouter(prefix=prefix, dependencies=dependencies)
+
+    async def top() -> list[dict[str, Any]]:  # noqa: WPS430
+        return slow_query_log.top()
+
+    async def clear() -> Response:  # noqa: WPS430
+        slow_query_log.clear()
+        return Response(status_code=204)
+
+    router.add_api_route("", top, methods={"GET"})
+    router.add_api_route("", clear, methods={"DELETE"}, status_code=204)
+    return router
@@ -0,0 +1,84 @@
+"""Per route admission control."""
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from fastapi import HTTPException
+
+
+class AdmissionController:
+    """Concurrency limit with a bounded wait queue.
+
+    Requests over the limit wait for a slot, up to queue_size of them and at most
+    queue_timeout seconds. Everything else gets 503 with Retry-After right away
+    instead of queueing on the connection pool.
+    """
+
+    def __init__(
+        self,
+        concurrency: int,
+        queue_size: int,
+        queue_timeout: float | None = None,
+        retry_after: int = 1,
+    ):
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.shed = 0
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "concurrency": self.concurrency,
+            "active": self.active,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "shed": self.shed,
+        }
+
+    def _overloaded(self) -> HTTPException:
+        self.shed += 1
+        return HTTPException(
+            status_code=503,
+            detail="Service overloaded",
+            headers={"Retry-After": str(self.retry_after)},
+        )
+
+    async def _acquire(self) -> None:
+        if not self._semaphore.locked():
+            await self._semaphore.acquire()
+            return
+
+        if self.waiting >= self.queue_size:
+            raise self._overloaded()
+
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            raise self._overloaded()
+        finally:
+            self.waiting -= 1
+
+    async def acquire(self) -> None:
+        """Wait for a slot, 503 when overloaded, see release()."""
+        await self._acquire()
+        self.active += 1
+        self.admitted += 1
+
+    def release(self) -> None:
+        self.active -= 1
+        self._semaphore.release()
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncIterator[None]:
+        await self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
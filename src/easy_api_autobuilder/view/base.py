@@ -1,12 +1,39 @@
 """BaseView definition."""
+import inspect
 from dataclasses import dataclass
-from typing import Annotated, Callable, Literal
+from typing import Annotated, Any, Callable, Literal
 
-from fastapi import APIRouter, Body, Depends, Response
+from fastapi import APIRouter, Depends, Response
 from fastapi.params import Depends as DependsClass
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import DeclarativeMeta
 
+from easy_api_autobuilder.arguments import (
+    AdmissionArguments,
+    ReadOnlyArguments,
+    StatementTimeoutArguments,
+)
+from easy_api_autobuilder.repo import BaseRepo, SlowQueryLog, session_context
+from easy_api_autobuilder.response import EncodedResponse, PageStreamResponse
 from easy_api_autobuilder.schema import BaseSchemaCreationStrategy, StrategyReturn
 from easy_api_autobuilder.service import BaseService, SecondaryBaseService
+from easy_api_autobuilder.view.admission import AdmissionController
+from easy_api_autobuilder.view.handlers import (
+    admitted_handler,
+    disconnect_cancelling_handler,
+    read_only_handler,
+    recorded_handler,
+    request_parameters,
+    response_finisher,
+    service_handler,
+    session_handler,
+    timed_handler,
+)
+from easy_api_autobuilder.view.warmup import (
+    open_connections,
+    warm_handler,
+    warmup_handlers,
+)
 
 get_handlers = frozenset(
     (
@@ -14,6 +41,23 @@ get_handlers = frozenset(
         "detail",
     )
 )
+# optional main handlers, {handler: (method, route)}
+static_routes = {
+    "aggregate": ("GET", "/aggregate"),
+    "facets": ("GET", "/facets"),
+    "changes": ("GET", "/changes"),
+    "bulk_import": ("POST", "/import"),
+}
+# handlers under the AdmissionArguments.expensive budget
+expensive_handlers = frozenset(
+    (
+        "list",
+        "aggregate",
+        "facets",
+        "changes",
+        "bulk_import",
+    )
+)
 not_pk_handler = frozenset(
     (
         "list",
@@ -31,11 +75,23 @@ ExcludeFieldAnnotation = Annotated[None, Depends(exclude_parameter)]
 secondary_route_sample = "{0}/{1}{2}"
 
 
+@dataclass
+class SessionBoundService:
+    """Service instance shared by every request of a route.
+
+    Its repo is built without a session and reads the request session from
+    session_context, so the only dependency FastAPI resolves is the session itself.
+    """
+
+    service: BaseService | SecondaryBaseService
+    session_deps: DependsClass
+
+
 @dataclass
 class SecondaryView:
     route: str
     service: type[SecondaryBaseService]
-    service_deps: DependsClass
+    service_deps: DependsClass | SessionBoundService
     schemas: BaseSchemaCreationStrategy
     secondary_handlers: frozenset = frozenset(
         (
@@ -44,6 +100,8 @@ class SecondaryView:
             "post",
         )
     )
+    # the list returns pages of this model instead of association rows
+    target: DeclarativeMeta | None = None
 
     def make_route(self, handler_name: str) -> str:
         if handler_name == "post":
@@ -72,14 +130,37 @@ class BaseView:
         self,
         router: APIRouter,
         main_service: type[BaseService],
-        main_service_deps: DependsClass,
+        main_service_deps: DependsClass | SessionBoundService,
         main_schemas: BaseSchemaCreationStrategy,
         secondary_views: tuple[SecondaryView, ...] | None = None,
+        response_class: type[Response] | None = None,
+        extra_handlers: tuple[str, ...] = (),
+        admission: AdmissionArguments | None = None,
+        statement_timeouts: StatementTimeoutArguments | None = None,
+        cancel_on_disconnect: bool = False,
+        repo: type[BaseRepo] | None = None,
+        session_factory: async_sessionmaker | None = None,
+        slow_query_log: SlowQueryLog | None = None,
+        read_only: ReadOnlyArguments | None = None,
     ):
         self.router = router
         self._main_service = main_service
         self._main_service_deps = main_service_deps
         self._main_schemas = main_schemas
+        self._response_class = response_class
+        self._extra_handlers = extra_handlers
+        self._admission = admission
+        self._statement_timeouts = statement_timeouts
+        self._cancel_on_disconnect = cancel_on_disconnect
+        self._read_only = read_only
+        # for warmup(), routes get theirs through main_service_deps
+        self._repo = repo
+        self._session_factory = session_factory
+        self.slow_query_log = slow_query_log
+        # {"METHOD /route": controller}
+        self.admission_controllers: dict[str, AdmissionController] = {}
+        # paths and components of the router, set by the builder, see OpenAPIDocument
+        self.openapi_fragment: dict | None = None
 
         self._secondary_views = (
             secondary_views if secondary_views is not None else tuple()
@@ -87,7 +168,56 @@ class BaseView:
 
         self._init()
 
+    async def close(self) -> None:
+        """Flush buffered writes, call on application shutdown."""
+        write_batcher = self._main_service._write_batcher
+        if write_batcher is not None:
+            await write_batcher.close()
+
+    async def warmup(self, connections: int = 1) -> dict[str, Any]:
+        """Run the read routes once and open connections, call on application startup.
+
+        Read statements get compiled and cached, response schemas validate and
+        serialize real rows and the pool holds connections before the first request.
+        Write routes run nothing, their statements compile on first use.
+        """
+        if self._repo is None or self._session_factory is None:
+            raise ValueError(
+                "warmup requires a view built with a repo and session_factory"
+            )
+
+        warmed = []
+        async with self._session_factory() as session:
+            token = session_context.set(session)
+            try:
+                repo = self._repo(session)
+                service = self._main_service(repo)
+                for handler_name in warmup_handlers:
+                    if handler_name not in {*self.handlers, *self._extra_handlers}:
+                        continue
+
+                    annotations = getattr(self._main_schemas, handler_name)
+                    if await warm_handler(service, repo, handler_name, annotations):
+                        warmed.append(handler_name)
+            finally:
+                session_context.reset(token)
+                await session.rollback()
+
+        await open_connections(self._session_factory, connections)
+        return {"handlers": warmed, "connections": connections}
+
+    def admission_stats(self) -> dict[str, dict[str, int]]:
+        """Active, waiting, admitted and shed requests per route."""
+        return {
+            route: controller.stats()
+            for route, controller in self.admission_controllers.items()
+        }
+
     def _init(self) -> None:
+        # static routes first, "/{model_pk}" would shadow them
+        for handler_name in self._extra_handlers:
+            self._create_main_handler(handler_name)
+
         for handler_name in self.handlers:
             self._create_main_handler(handler_name)
 
@@ -108,31 +238,109 @@ class BaseView:
         service_handler: str,
         annotations: StrategyReturn,
         route: str,
-        service_deps: DependsClass,
+        service_deps: DependsClass | SessionBoundService,
         service: type[BaseService | SecondaryBaseService],
     ) -> None:
-        method = (
-            service_handler.upper() if service_handler not in get_handlers else "GET"
-        )
+        if service_handler in static_routes:
+            method = static_routes[service_handler][0]
+        else:
+            method = (
+                service_handler.upper() if service_handler not in get_handlers else "GET"
+            )
         response_code = self._response_code(method)
+        response_class = self._route_response_class(annotations)
+        route_options = {}
+        if response_class is not None:
+            route_options["response_class"] = response_class
+
+        handler = self._create_handler(
+            service_handler,
+            annotations,
+            service_deps,
+            service,
+            response_code,
+            response_class,
+        )
+        handler = self._wrap_handler(handler, service_handler, annotations)
+        if self._read_only is not None and method == "GET":
+            handler = read_only_handler(handler, self._read_only)
+
+        if self.slow_query_log is not None:
+            handler = recorded_handler(
+                handler, self.slow_query_log, f"{method} {self.router.prefix}{route}"
+            )
+
+        if self._admission is not None:
+            handler = admitted_handler(
+                handler, self._admission_controller(service_handler, method, route)
+            )
 
         self.router.add_api_route(
             route,
-            self._create_handler(
-                service_handler,
-                annotations,
-                service_deps,
-                service,
-                response_code,
-            ),
+            handler,
             methods={method},
             status_code=response_code,
+            **route_options,
+        )
+
+    def _wrap_handler(
+        self, handler: Callable, service_handler: str, annotations: StrategyReturn
+    ) -> Callable:
+        if self._statement_timeouts is not None:
+            timeout = self._statement_timeouts.for_handler(service_handler)
+            if timeout is not None:
+                handler = timed_handler(handler, timeout)
+
+        # raw request handlers read the body themselves, leave receive() to them
+        if self._cancel_on_disconnect and not annotations.request.raw_request:
+            handler = disconnect_cancelling_handler(handler)
+
+        return handler
+
+    def _admission_controller(
+        self, service_handler: str, method: str, route: str
+    ) -> AdmissionController:
+        budget = self._admission.cheap
+        if service_handler in expensive_handlers:
+            budget = self._admission.expensive
+
+        controller = AdmissionController(
+            budget.concurrency,
+            budget.queue_size,
+            queue_timeout=self._admission.queue_timeout,
+            retry_after=self._admission.retry_after,
         )
+        self.admission_controllers[f"{method} {self.router.prefix}{route}"] = controller
+        return controller
+
+    def _route_response_class(self, annotations: StrategyReturn) -> type[Response] | None:
+        if annotations.response is Response:
+            return None
+
+        if annotations.stream:
+            return PageStreamResponse
+
+        if self._response_class is None and annotations.expansion is not None:
+            # the response model documents every relationship, serialize the
+            # expanded variant as it is instead of validating it against that model
+            return EncodedResponse
+
+        return self._response_class
+
+    def _main_route(self, service_handler: str) -> str:
+        if service_handler in static_routes:
+            return static_routes[service_handler][1]
+
+        if service_handler in not_pk_handler:
+            return ""
+
+        return "/{model_pk}"
 
     def _create_main_handler(
-        self, service_handler: Literal["list", "detail", "post", "put", "delete"]
+        self,
+        service_handler: str,
     ) -> None:
-        route = "" if service_handler in not_pk_handler else "/{model_pk}"
+        route = self._main_route(service_handler)
         annotations: StrategyReturn = getattr(self._main_schemas, service_handler)
 
         self._add_api_route(
@@ -159,84 +367,40 @@ class BaseView:
             secondary_view.service,
         )
 
-    def _create_handler(  # noqa: WPS231
+    def _create_handler(
         self,
-        service_handler: Literal["list", "detail", "post", "put", "delete"],
+        service_handler_name: Literal["list", "detail", "post", "put", "delete"],
         annotations: StrategyReturn,
-        service_deps: DependsClass,
+        service_deps: DependsClass | SessionBoundService,
         service_type: type[BaseService | SecondaryBaseService],
         response_code: int = 200,
+        response_class: type[Response] | None = None,
     ) -> Callable:
-        response_type = annotations.response
-
-        body_annotation = self._eval_body_annotation(annotations)
-        param_annotation = self._eval_params_annotation(annotations)
-        pk_annotation = (
-            annotations.request.model_pk
-            if annotations.request.model_pk
-            else ExcludeFieldAnnotation
+        finish = response_finisher(
+            annotations.response is Response, response_code, response_class
         )
-        secondary_pk_annotation = (
-            annotations.request.secondary_model_pk
-            if annotations.request.secondary_model_pk
-            else ExcludeFieldAnnotation
-        )
-        allow_none_default, allow_none_annotations = self._eval_allow_none_annotation(
-            annotations
-        )
-
-        async def inner(  # noqa: WPS430
-            service: Annotated[service_type, service_deps],
-            model_pk: pk_annotation,
-            secondary_model_pk: secondary_pk_annotation,
-            body: body_annotation,
-            request_params: param_annotation,
-            allow_none: allow_none_annotations = allow_none_default,
-        ) -> response_type:
-            args = {}
-            if model_pk:
-                args["model_pk"] = model_pk
 
-            if secondary_model_pk:
-                args["secondary_model_pk"] = secondary_model_pk
-
-            if request_params:
-                args["request_params"] = request_params
-
-            if body:
-                args["body"] = body
-
-            if allow_none:
-                args["allow_none"] = allow_none
-
-            view_handler = getattr(service, service_handler)
-            response = await view_handler(**args)
-
-            if response is None:
-                return Response(status_code=response_code)
-
-            return response
-
-        return inner
-
-    def _eval_body_annotation(self, annotations: StrategyReturn) -> Annotated | None:
-        return (
-            Annotated[annotations.request.body, Body()]
-            if annotations.request.body
-            else ExcludeFieldAnnotation
-        )
-
-    def _eval_params_annotation(self, annotations: StrategyReturn) -> Annotated | None:
-        return (
-            Annotated[annotations.request.params, Depends()]
-            if annotations.request.params
-            else ExcludeFieldAnnotation
+        if isinstance(service_deps, SessionBoundService):
+            handler = session_handler(
+                getattr(service_deps.service, service_handler_name), finish
+            )
+            first_parameter = inspect.Parameter(
+                "db_session",
+                inspect.Parameter.POSITIONAL_OR_KEYWORD,
+                annotation=Annotated[AsyncSession, service_deps.session_deps],
+            )
+        else:
+            handler = service_handler(
+                getattr(service_type, service_handler_name), finish
+            )
+            first_parameter = inspect.Parameter(
+                "service",
+                inspect.Parameter.POSITIONAL_OR_KEYWORD,
+                annotation=Annotated[service_type, service_deps],
+            )
+
+        handler.__signature__ = inspect.Signature(
+            [first_parameter, *request_parameters(annotations)],
+            return_annotation=annotations.response,
         )
-
-    def _eval_allow_none_annotation(
-        self, annotations: StrategyReturn
-    ) -> tuple[list | None, Annotated | None]:
-        if annotations.request.allow_none is None:
-            return None, ExcludeFieldAnnotation
-
-        return [], annotations.request.allow_none
+        return handler
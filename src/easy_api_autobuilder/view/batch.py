@@ -0,0 +1,202 @@
+"""Batch route running sub-requests against generated routes in process."""
+import asyncio
+import base64
+import json
+import logging
+from typing import Any, Sequence
+from urllib.parse import urlsplit
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.params import Depends as DependsClass
+from starlette.types import ASGIApp, Scope
+
+from easy_api_autobuilder.schema import (
+    BatchOperation,
+    BatchOperationResult,
+    BatchRequest,
+    BatchResult,
+)
+
+logger = logging.getLogger(__name__)
+
+# set by routing the batch request
+routed = frozenset(("route", "endpoint", "path_params"))
+# marks the scopes of operations, batches do not nest
+batch_scope_key = "easy_api_autobuilder.batch"
+
+# headers of the batch request sub-requests do not inherit
+batch_only_headers = frozenset(
+    (
+        "accept-encoding",
+        "content-length",
+        "content-type",
+        "transfer-encoding",
+    )
+)
+
+
+def operation_scope(scope: Scope, operation: BatchOperation, body: bytes) -> Scope:
+    """Scope of the batch request with the method, path and headers of operation.
+
+    app and state stay, the route of the batch request is matched anew.
+    """
+    url = urlsplit(operation.path)
+    headers = [
+        (name, header_value)
+        for name, header_value in scope["headers"]
+        if name.decode("latin-1") not in batch_only_headers
+    ]
+    headers.extend(
+        (name.lower().encode("latin-1"), header_value.encode("latin-1"))
+        for name, header_value in operation.headers.items()
+    )
+    if body:
+        headers.append((b"content-type", b"application/json"))
+        headers.append((b"content-length", str(len(body)).encode()))
+
+    return {
+        **{key: scope_value for key, scope_value in scope.items() if key not in routed},
+        "method": operation.method.upper(),
+        "path": url.path,
+        "raw_path": url.path.encode(),
+        "query_string": url.query.encode(),
+        "headers": headers,
+        batch_scope_key: True,
+    }
+
+
+def operation_result(
+    status: int, headers: list[tuple[bytes, bytes]], body: bytes
+) -> BatchOperationResult:
+    decoded_headers = {
+        name.decode("latin-1"): header_value.decode("latin-1")
+        for name, header_value in headers
+    }
+    content_type = decoded_headers.get("content-type", "")
+    if not body:
+        return BatchOperationResult(status=status, headers=decoded_headers)
+
+    if "json" in content_type:
+        return BatchOperationResult(
+            status=status, headers=decoded_headers, body=json.loads(body)
+        )
+
+    if content_type.startswith("text/"):
+        return BatchOperationResult(
+            status=status, headers=decoded_headers, body=body.decode(errors="replace")
+        )
+
+    return BatchOperationResult(
+        status=status,
+        headers=decoded_headers,
+        body=base64.b64encode(body).decode(),
+        base64=True,
+    )
+
+
+async def dispatch(
+    app: ASGIApp, scope: Scope, operation: BatchOperation, body: bytes
+) -> BatchOperationResult:
+    """Run the operation scope through app and collect its response."""
+    received = False
+    # never set, handlers waiting for a disconnect get cancelled by their route
+    finished = asyncio.Event()
+
+    async def receive() -> dict[str, Any]:  # noqa: WPS430
+        nonlocal received
+        if received:
+            await finished.wait()
+
+        received = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    status = 500
+    headers = []
+    chunks = []
+
+    async def send(message: dict[str, Any]) -> None:  # noqa: WPS430
+        nonlocal status, headers
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            headers = message.get("headers", [])
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    try:
+        await app(scope, receive, send)
+    except Exception:
+        # the app error middleware sent its 500 already, then raised
+        logger.exception(
+            "batch operation %s %s failed", operation.method, operation.path
+        )
+        return BatchOperationResult(
+            status=500, body={"detail": "Internal Server Error"}
+        )
+
+    return operation_result(status, headers, b"".join(chunks))
+
+
+def batch_router(
+    prefix: str = "/batch",
+    concurrency: int = 8,
+    max_operations: int = 50,
+    dependencies: Sequence[DependsClass] | None = None,
+) -> APIRouter:
+    """POST a list of operations on routes of the app, get their responses in order.
+
+    Operations run in process through the whole app, so middleware and the
+    dependencies of routers and include_router() apply as to direct requests,
+    sessions included. Paths are those clients use, e.g. /api/authors/1. GET
+    operations run concurrently; any other method waits for the operations before
+    it and runs alone, so writes keep their order. concurrency bounds the
+    operations running at once over all batch requests.
+    """
+    limit = asyncio.Semaphore(concurrency)
+    router = APIRouter(prefix=prefix, dependencies=dependencies)
+
+    async def limited(  # noqa: WPS430
+        request: Request, operation: BatchOperation
+    ) -> BatchOperationResult:
+        body = b""
+        if operation.body is not None:
+            body = json.dumps(operation.body).encode()
+
+        scope = operation_scope(request.scope, operation, body)
+        async with limit:
+            return await dispatch(request.app, scope, operation, body)
+
+    async def batch(  # noqa: WPS430
+        batch_request: BatchRequest, request: Request
+    ) -> BatchResult:
+        operations = batch_request.operations
+        if request.scope.get(batch_scope_key):
+            raise HTTPException(status_code=400, detail="batches do not nest")
+
+        if len(operations) > max_operations:
+            raise HTTPException(
+                status_code=413, detail=f"more than {max_operations} operations"
+            )
+
+        reads: list[asyncio.Task] = []
+        results: list[asyncio.Task] = []
+        try:
+            for operation in operations:
+                is_read = operation.method.upper() == "GET"
+                if not is_read and reads:
+                    await asyncio.wait(reads)
+                    reads = []
+
+                started = asyncio.ensure_future(limited(request, operation))
+                results.append(started)
+                if is_read:
+                    reads.append(started)
+                else:
+                    await asyncio.wait((started,))
+
+            return BatchResult(results=await asyncio.gather(*results))
+        finally:
+            for started in results:
+                started.cancel()
+
+    router.add_api_route("", batch, methods={"POST"}, response_model=BatchResult)
+    return router
@@ -0,0 +1,243 @@
+"""Route handlers specialized at build time.
+
+Every handler takes only the parameters its route declares and calls one service
+method resolved up front; FastAPI passes the declared parameters as keywords.
+"""
+import asyncio
+import inspect
+from contextlib import suppress
+from functools import partial
+from typing import Annotated, Any, Callable
+
+from fastapi import Body, Depends, HTTPException, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from easy_api_autobuilder.arguments import ReadOnlyArguments
+from easy_api_autobuilder.repo import (
+    SlowQueryLog,
+    StatementTimeout,
+    read_only,
+    session_context,
+    slow_query_context,
+    statement_timeout,
+)
+from easy_api_autobuilder.response import PageStreamResponse
+from easy_api_autobuilder.schema import StrategyReturn
+from easy_api_autobuilder.view.admission import AdmissionController
+
+
+def keyword_parameter(
+    name: str, annotation: Any, default: Any = inspect.Parameter.empty
+) -> inspect.Parameter:
+    return inspect.Parameter(
+        name, inspect.Parameter.KEYWORD_ONLY, annotation=annotation, default=default
+    )
+
+
+def request_parameters(annotations: StrategyReturn) -> list[inspect.Parameter]:
+    request = annotations.request
+    parameters = []
+
+    if request.raw_request:
+        parameters.append(keyword_parameter("request", Request))
+
+    if request.model_pk:
+        parameters.append(keyword_parameter("model_pk", request.model_pk))
+
+    if request.secondary_model_pk:
+        parameters.append(
+            keyword_parameter("secondary_model_pk", request.secondary_model_pk)
+        )
+
+    if request.body:
+        parameters.append(keyword_parameter("body", Annotated[request.body, Body()]))
+
+    if request.params:
+        parameters.append(
+            keyword_parameter("request_params", Annotated[request.params, Depends()])
+        )
+
+    if request.allow_none is not None:
+        parameters.append(keyword_parameter("allow_none", request.allow_none, []))
+
+    if request.expand is not None:
+        parameters.append(keyword_parameter("expand", request.expand, []))
+
+    for name, annotation in (request.query_lists or {}).items():
+        parameters.append(keyword_parameter(name, annotation, []))
+
+    return parameters
+
+
+def response_finisher(
+    empty_response: bool, response_code: int, response_class: type[Response] | None
+) -> Callable | None:
+    """Turn a service result into what the route returns, None to return it as is."""
+    if empty_response:
+
+        def empty(_result: Any) -> Response:  # noqa: WPS430
+            return Response(status_code=response_code)
+
+        return empty
+
+    if response_class is None:
+        return None
+
+    return partial(response_class, status_code=response_code)
+
+
+def service_handler(method: Callable, finish: Callable | None) -> Callable:
+    """Handler for a service instance resolved by a FastAPI dependency."""
+    if finish is None:
+
+        async def inner(service: Any, **kwargs: Any) -> Any:  # noqa: WPS430
+            return await method(service, **kwargs)
+
+        return inner
+
+    async def finished(service: Any, **kwargs: Any) -> Any:  # noqa: WPS430
+        return finish(await method(service, **kwargs))
+
+    return finished
+
+
+def session_handler(method: Callable, finish: Callable | None) -> Callable:
+    """Handler for a bound method of a route wide service, see SessionBoundService."""
+    if finish is None:
+
+        async def inner(db_session: AsyncSession, **kwargs: Any) -> Any:  # noqa: WPS430
+            token = session_context.set(db_session)
+            try:
+                return await method(**kwargs)
+            finally:
+                session_context.reset(token)
+
+        return inner
+
+    async def finished(db_session: AsyncSession, **kwargs: Any) -> Any:  # noqa: WPS430
+        token = session_context.set(db_session)
+        try:
+            return finish(await method(**kwargs))
+        finally:
+            session_context.reset(token)
+
+    return finished
+
+
+def admitted_handler(handler: Callable, controller: AdmissionController) -> Callable:
+    """Run the handler inside a slot of the route admission controller.
+
+    FastAPI reads and validates the body and resolves the route dependencies,
+    the request session among them, before calling the handler: a shed request
+    has paid for those, but has not queued on the connection pool yet. Streamed
+    pages query while their body is sent, they keep the slot until then.
+    """
+
+    async def inner(**kwargs: Any) -> Any:  # noqa: WPS430
+        await controller.acquire()
+        try:
+            result = await handler(**kwargs)
+        except BaseException:
+            controller.release()
+            raise
+
+        if isinstance(result, PageStreamResponse):
+            result.on_sent.append(controller.release)
+        else:
+            controller.release()
+        return result
+
+    inner.__signature__ = handler.__signature__
+    return inner
+
+
+def timed_handler(handler: Callable, timeout: float) -> Callable:
+    """Run the handler with a statement deadline for its repo calls, 504 past it."""
+
+    async def inner(**kwargs: Any) -> Any:  # noqa: WPS430
+        token = statement_timeout.set(timeout)
+        try:
+            return await handler(**kwargs)
+        except StatementTimeout as error:
+            raise HTTPException(status_code=504, detail=str(error))
+        finally:
+            statement_timeout.reset(token)
+
+    inner.__signature__ = handler.__signature__
+    return inner
+
+
+def recorded_handler(
+    handler: Callable, slow_query_log: SlowQueryLog, route: str
+) -> Callable:
+    """Send the repo statements of the handler to the slow query log."""
+
+    async def inner(**kwargs: Any) -> Any:  # noqa: WPS430
+        token = slow_query_context.set((slow_query_log, route))
+        try:
+            return await handler(**kwargs)
+        finally:
+            slow_query_context.reset(token)
+
+    inner.__signature__ = handler.__signature__
+    return inner
+
+
+def read_only_handler(handler: Callable, arguments: ReadOnlyArguments) -> Callable:
+    """Run the repo statements of the handler outside of a writable transaction."""
+
+    async def inner(**kwargs: Any) -> Any:  # noqa: WPS430
+        token = read_only.set(arguments)
+        try:
+            return await handler(**kwargs)
+        finally:
+            read_only.reset(token)
+
+    inner.__signature__ = handler.__signature__
+    return inner
+
+
+async def wait_for_disconnect(request: Request) -> None:
+    while True:
+        message = await request.receive()
+        if message["type"] == "http.disconnect":
+            return
+
+
+def disconnect_cancelling_handler(handler: Callable) -> Callable:
+    """Cancel the handler once the client disconnects.
+
+    The pending database call is cancelled with it, so the connection goes back to
+    the pool; whether the query stops server side is up to the driver. Only for
+    routes whose body FastAPI reads before calling the handler.
+    """
+
+    async def inner(http_request: Request, **kwargs: Any) -> Any:  # noqa: WPS430
+        handling = asyncio.ensure_future(handler(**kwargs))
+        disconnected = asyncio.ensure_future(wait_for_disconnect(http_request))
+        try:
+            await asyncio.wait(
+                (handling, disconnected), return_when=asyncio.FIRST_COMPLETED
+            )
+        finally:
+            disconnected.cancel()
+            if not handling.done():
+                handling.cancel()
+                with suppress(asyncio.CancelledError):
+                    await handling
+
+        if handling.cancelled():
+            # nobody is listening, 499 is nginx's "client closed request", non
+            # standard, for access logs and middleware to tell these apart
+            return Response(status_code=499)
+
+        return handling.result()
+
+    signature = handler.__signature__
+    inner.__signature__ = signature.replace(
+        parameters=[
+            *signature.parameters.values(),
+            keyword_parameter("http_request", Request),
+        ]
+    )
+    return inner
@@ -0,0 +1,93 @@
+"""Warm-up of generated routes before they take traffic."""
+import asyncio
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Iterable
+
+from pydantic_core import to_json
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from easy_api_autobuilder.constants.constants import PARAM_FACET_FIELDS_NAME
+from easy_api_autobuilder.repo import BaseRepo
+from easy_api_autobuilder.response import PageStream, encode_page
+from easy_api_autobuilder.schema import StrategyReturn
+from easy_api_autobuilder.service import BaseService
+
+# handlers that only read, safe to run on startup
+warmup_handlers = (
+    "list",
+    "detail",
+    "changes",
+    "aggregate",
+    "facets",
+)
+
+
+async def serialize(result: Any) -> None:
+    if isinstance(result, PageStream):
+        async for _chunk in encode_page(result):
+            pass
+
+        return
+
+    to_json(result)
+
+
+async def warm_handler(
+    service: BaseService,
+    repo: BaseRepo,
+    handler_name: str,
+    annotations: StrategyReturn,
+) -> bool:
+    """Run a read handler with default parameters, False when it had nothing to read."""
+    if handler_name == "detail":
+        model_pk = await repo.sample_pk()
+        if model_pk is None:
+            return False
+
+        result = await service.detail(model_pk=model_pk)
+    else:
+        kwargs = {}
+        if annotations.request.params is not None:
+            kwargs["request_params"] = annotations.request.params()
+        if handler_name == "facets":
+            # without fields a facets request reads nothing, warm them all
+            kwargs[PARAM_FACET_FIELDS_NAME] = list(
+                annotations.request.params.model_fields
+            )
+
+        result = await getattr(service, handler_name)(**kwargs)
+
+    await serialize(result)
+    return True
+
+
+async def open_connections(
+    session_factory: async_sessionmaker, connections: int
+) -> None:
+    """Check out connections at once, they stay idle in the pool once returned."""
+    async with AsyncExitStack() as stack:
+        sessions = [
+            await stack.enter_async_context(session_factory())
+            for _ in range(connections)
+        ]
+        await asyncio.gather(*(session.connection() for session in sessions))
+
+
+def warmup_lifespan(views: Iterable[Any], connections: int = 1) -> Callable[[Any], Any]:
+    """FastAPI lifespan warming views up on startup and closing them on shutdown.
+
+    views is iterated on startup, it can be filled after the app is created.
+    """
+
+    @asynccontextmanager
+    async def lifespan(_app: Any) -> AsyncIterator[None]:  # noqa: WPS430
+        for view in views:
+            await view.warmup(connections)
+
+        try:
+            yield
+        finally:
+            for view in views:
+                await view.close()
+
+    return lifespan
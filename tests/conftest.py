@@ -0,0 +1,159 @@
+"""Models, an aiosqlite database and an app built per test."""
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import (
+    CheckConstraint,
+    ForeignKey,
+    String,
+    Text,
+    event,
+    func,
+    insert,
+    select,
+    text,
+)
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
+
+from easy_api_autobuilder import BuilderArguments, DataMapperBuilder, SchemaRegistry
+
+# takes about a tenth of a second on SQLite
+slow_query = text(
+    "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c WHERE x < 1000000)"
+    " SELECT count(*) FROM c"
+)
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class AuthorModel(Base):
+    __tablename__ = "author"
+    id: Mapped[int] = mapped_column(primary_key=True)
+    name: Mapped[str] = mapped_column(String(64))
+    status: Mapped[str] = mapped_column(String(16), default="new")
+    amount: Mapped[int] = mapped_column(CheckConstraint("amount >= 0"), default=0)
+    books: Mapped[list["BookModel"]] = relationship()
+
+
+class BookModel(Base):
+    __tablename__ = "book"
+    id: Mapped[int] = mapped_column(primary_key=True)
+    title: Mapped[str] = mapped_column(String(64))
+    author_id: Mapped[int] = mapped_column(ForeignKey("author.id"))
+
+
+class TagModel(Base):
+    __tablename__ = "tag"
+    id: Mapped[int] = mapped_column(primary_key=True)
+    label: Mapped[str] = mapped_column(String(32))
+
+
+class AuthorTagModel(Base):
+    __tablename__ = "author_tag"
+    author_id: Mapped[int] = mapped_column(ForeignKey("author.id"), primary_key=True)
+    tag_id: Mapped[int] = mapped_column(ForeignKey("tag.id"), primary_key=True)
+
+
+class NoteModel(Base):
+    __tablename__ = "note"
+    id: Mapped[int] = mapped_column(primary_key=True)
+    title: Mapped[str] = mapped_column(String(64))
+    body: Mapped[str | None] = mapped_column(Text)
+
+
+@pytest.fixture
+async def engine(tmp_path: Path) -> AsyncIterator[AsyncEngine]:
+    # a file, connections discarded on timeouts must not take the tables along
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def session_factory(engine: AsyncEngine) -> async_sessionmaker:
+    return async_sessionmaker(engine, expire_on_commit=False)
+
+
+@pytest.fixture
+def app() -> FastAPI:
+    return FastAPI()
+
+
+@pytest.fixture
+def build(app: FastAPI, session_factory: async_sessionmaker) -> Callable[..., Any]:
+    """Build the routes of a model into app, each test with its own schemas."""
+    registry = SchemaRegistry()
+
+    def inner(
+        prefix: str,
+        model: type[Base],
+        arguments: BuilderArguments | None = None,
+        dependencies: list[Any] | None = None,
+        **kwargs: Any,
+    ) -> Any:
+        view = DataMapperBuilder(
+            prefix,
+            model,
+            arguments=arguments,
+            session_factory=session_factory,
+            registry=registry,
+            **kwargs,
+        ).build()
+        app.include_router(view.router, dependencies=dependencies)
+        return view
+
+    inner.registry = registry
+    return inner
+
+
+@pytest.fixture
+async def client(app: FastAPI) -> AsyncIterator[httpx.AsyncClient]:
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        yield client
+
+
+@pytest.fixture
+def count_rows(session_factory: async_sessionmaker) -> Callable[..., Any]:
+    async def inner(model: type[Base]) -> int:
+        async with session_factory() as session:
+            return await session.scalar(select(func.count()).select_from(model))
+
+    return inner
+
+
+@pytest.fixture
+async def authors(session_factory: async_sessionmaker) -> None:
+    """Six authors, statuses new, done, new..."""
+    async with session_factory() as session:
+        await session.execute(
+            insert(AuthorModel),
+            [
+                {"name": f"a{index}", "status": ("new", "done", "new")[index % 3]}
+                for index in range(1, 7)
+            ],
+        )
+        await session.commit()
+
+
+@pytest.fixture
+def statements(engine: AsyncEngine) -> list[tuple[str, str | None]]:
+    """(statement keyword, isolation level) of every statement run."""
+    statements = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def record(connection, cursor, statement, *args):  # noqa: WPS430
+        isolation_level = connection.get_execution_options().get("isolation_level")
+        statements.append((statement.split()[0], isolation_level))
+
+    return statements
@@ -0,0 +1,89 @@
+import asyncio
+from typing import Any
+
+import pytest
+
+from easy_api_autobuilder import (
+    AdmissionArguments,
+    AdmissionBudget,
+    BaseRepo,
+    BuilderArguments,
+)
+from tests.conftest import AuthorModel
+
+
+class BlockingRepo(BaseRepo):
+    """get() waits for release to be set."""
+
+    _cls_model = AuthorModel
+    entered: asyncio.Event
+    release: asyncio.Event
+
+    async def get(self, *, pkey_val: Any, **kwargs: Any) -> Any:
+        self.entered.set()
+        await self.release.wait()
+        return await super().get(pkey_val=pkey_val, **kwargs)
+
+
+@pytest.fixture
+def blocking():
+    BlockingRepo.entered = asyncio.Event()
+    BlockingRepo.release = asyncio.Event()
+    return BlockingRepo
+
+
+def admission(queue_size: int, queue_timeout: float | None = 5) -> BuilderArguments:
+    return BuilderArguments(
+        admission=AdmissionArguments(
+            cheap=AdmissionBudget(concurrency=1, queue_size=queue_size),
+            queue_timeout=queue_timeout,
+            retry_after=3,
+        )
+    )
+
+
+@pytest.mark.usefixtures("authors")
+async def test_overloaded_route_sheds(build, client, blocking):
+    view = build("/authors", AuthorModel, admission(queue_size=0), repo=blocking)
+
+    first = asyncio.create_task(client.get("/authors/1"))
+    await blocking.entered.wait()
+    response = await client.get("/authors/2")
+    blocking.release.set()
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "3"
+    assert (await first).status_code == 200
+    stats = view.admission_stats()["GET /authors/{model_pk}"]
+    assert (stats["admitted"], stats["shed"], stats["active"]) == (1, 1, 0)
+
+
+@pytest.mark.usefixtures("authors")
+async def test_queued_request_gets_a_slot(build, client, blocking):
+    build("/authors", AuthorModel, admission(queue_size=1), repo=blocking)
+
+    first = asyncio.create_task(client.get("/authors/1"))
+    await blocking.entered.wait()
+    second = asyncio.create_task(client.get("/authors/2"))
+    await asyncio.sleep(0.05)
+    blocking.release.set()
+
+    assert [(await first).status_code, (await second).status_code] == [200, 200]
+
+
+@pytest.mark.usefixtures("authors")
+async def test_queue_timeout_sheds(build, client, blocking):
+    build(
+        "/authors",
+        AuthorModel,
+        admission(queue_size=1, queue_timeout=0.01),
+        repo=blocking,
+    )
+
+    first = asyncio.create_task(client.get("/authors/1"))
+    await blocking.entered.wait()
+    response = await client.get("/authors/2")
+    blocking.release.set()
+
+    assert response.status_code == 503
+    assert (await first).status_code == 200
@@ -0,0 +1,59 @@
+import pytest
+from sqlalchemy import insert
+
+from easy_api_autobuilder import AggregateArguments, BuilderArguments
+from tests.conftest import AuthorModel
+
+
+@pytest.fixture
+async def amounts(session_factory):
+    async with session_factory() as session:
+        await session.execute(
+            insert(AuthorModel),
+            [
+                {"name": "a", "status": "new", "amount": 1},
+                {"name": "b", "status": "new", "amount": 2},
+                {"name": "c", "status": "done", "amount": 10},
+            ],
+        )
+        await session.commit()
+
+
+@pytest.mark.usefixtures("amounts")
+async def test_aggregate_groups(build, client):
+    build("/authors", AuthorModel, BuilderArguments(aggregate=AggregateArguments()))
+
+    response = await client.get(
+        "/authors/aggregate",
+        params={"group_by": ["status"], "sum": ["amount"], "max": ["amount"]},
+    )
+
+    rows = sorted(response.json()["data"], key=lambda row: row["group"]["status"])
+    assert [(row["group"], row["count"], row["sum"], row["max"]) for row in rows] == [
+        ({"status": "done"}, 1, {"amount": 10}, {"amount": 10}),
+        ({"status": "new"}, 2, {"amount": 3}, {"amount": 2}),
+    ]
+
+
+@pytest.mark.usefixtures("amounts")
+async def test_aggregate_filters_and_cache(build, client, statements):
+    arguments = BuilderArguments(aggregate=AggregateArguments(cache_ttl=60))
+    build("/authors", AuthorModel, arguments)
+    params = {"status": "new", "sum": ["amount"]}
+
+    response = await client.get("/authors/aggregate", params=params)
+    (row,) = response.json()["data"]
+    assert (row["count"], row["sum"]) == (2, {"amount": 3})
+
+    queries = len(statements)
+    response = await client.get("/authors/aggregate", params=params)
+    assert response.json()["data"] == [row]
+    assert len(statements) == queries
+
+
+async def test_aggregate_rejects_unknown_fields(build, client):
+    build("/authors", AuthorModel, BuilderArguments(aggregate=AggregateArguments()))
+
+    response = await client.get("/authors/aggregate", params={"sum": ["name"]})
+
+    assert response.status_code == 422
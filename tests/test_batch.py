@@ -0,0 +1,83 @@
+import pytest
+from fastapi import APIRouter, Depends, HTTPException, Request
+
+from easy_api_autobuilder import batch_router
+from tests.conftest import AuthorModel, BookModel
+
+
+@pytest.mark.usefixtures("authors")
+async def test_batch(build, client, app):
+    build("/authors", AuthorModel)
+    build("/books", BookModel)
+    app.include_router(batch_router(max_operations=5))
+    operations = [
+        {"method": "POST", "path": "/books", "body": {"title": "t", "author_id": 1}},
+        {"path": "/books/1"},
+        {"path": "/authors?size=2"},
+        {"method": "PUT", "path": "/books/1", "body": {"title": [1]}},
+        {"path": "/missing"},
+    ]
+
+    response = await client.post("/batch", json={"operations": operations})
+
+    results = response.json()["results"]
+    assert [result["status"] for result in results] == [201, 200, 200, 422, 404]
+    assert results[1]["body"]["title"] == "t"
+    assert len(results[2]["body"]["page_data"]) == 2
+
+    response = await client.post("/batch", json={"operations": operations * 2})
+    assert response.status_code == 413
+
+
+def deny() -> None:
+    raise HTTPException(status_code=403)
+
+
+@pytest.mark.usefixtures("authors")
+async def test_batch_keeps_include_dependencies(build, client, app, count_rows):
+    build("/authors", AuthorModel, dependencies=[Depends(deny)])
+    app.include_router(batch_router())
+    operations = [
+        {"path": "/authors"},
+        {"method": "POST", "path": "/authors", "body": {"name": "b"}},
+    ]
+
+    response = await client.post("/batch", json={"operations": operations})
+
+    assert [result["status"] for result in response.json()["results"]] == [403, 403]
+    assert await count_rows(AuthorModel) == 6
+
+
+async def test_batch_paths_of_the_app(build, client, app):
+    authors = build("/authors", AuthorModel)
+    api = APIRouter()
+    api.include_router(authors.router)
+    app.include_router(api, prefix="/api")
+    app.include_router(batch_router())
+    operations = [
+        {"method": "POST", "path": "/api/authors", "body": {"name": "b"}},
+        {"path": "/api/authors/1"},
+        {"method": "PATCH", "path": "/api/authors/1"},
+        {"method": "POST", "path": "/batch", "body": {"operations": []}},
+    ]
+
+    response = await client.post("/batch", json={"operations": operations})
+
+    results = response.json()["results"]
+    assert [result["status"] for result in results] == [201, 200, 405, 400]
+    assert results[1]["body"]["name"] == "b"
+
+
+async def test_batch_runs_app_middleware(build, client, app):
+    build("/authors", AuthorModel)
+    app.include_router(batch_router())
+    seen = []
+
+    @app.middleware("http")
+    async def record(request: Request, call_next):  # noqa: WPS430
+        seen.append(request.url.path)
+        return await call_next(request)
+
+    await client.post("/batch", json={"operations": [{"path": "/authors"}]})
+
+    assert seen == ["/batch", "/authors"]
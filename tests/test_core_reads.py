@@ -0,0 +1,55 @@
+import pytest
+
+from easy_api_autobuilder import (
+    BaseRepo,
+    BuilderArguments,
+    DetailArguments,
+    SchemaCreationArguments,
+)
+from tests.conftest import AuthorModel
+
+
+@pytest.fixture
+def read_columns(monkeypatch):
+    """{repo method: columns it was asked for}."""
+    calls = {}
+    for name in ("get", "get_by_page"):
+        method = getattr(BaseRepo, name)
+
+        async def recorded(self, *args, method=method, name=name, **kwargs):  # noqa: WPS430
+            calls[name] = kwargs.get("columns")
+            return await method(self, *args, **kwargs)
+
+        monkeypatch.setattr(BaseRepo, name, recorded)
+
+    return calls
+
+
+@pytest.mark.usefixtures("authors")
+async def test_core_reads_match_orm_reads(build, client, read_columns):
+    flat = SchemaCreationArguments(detail_args=DetailArguments(nested=False))
+    build("/orm", AuthorModel, BuilderArguments(schema_creation_args=flat))
+    build(
+        "/core",
+        AuthorModel,
+        BuilderArguments(schema_creation_args=flat, core_reads=True),
+    )
+
+    for path in ("", "/2"):
+        orm = await client.get(f"/orm{path}")
+        assert read_columns.popitem()[1] is None
+        core = await client.get(f"/core{path}")
+        assert read_columns.popitem()[1] is not None
+
+        assert core.json() == orm.json()
+
+
+@pytest.mark.usefixtures("authors")
+async def test_core_reads_keep_orm_for_relationships(build, client, read_columns):
+    # the default detail schema nests books
+    build("/authors", AuthorModel, BuilderArguments(core_reads=True))
+
+    response = await client.get("/authors/1")
+
+    assert response.json()["books"] == []
+    assert read_columns["get"] is None
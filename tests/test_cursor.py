@@ -0,0 +1,38 @@
+import datetime
+from uuid import UUID, uuid4
+
+import pytest
+
+from easy_api_autobuilder import SeekCursor
+
+
+@pytest.mark.parametrize(
+    ("field_type", "pk_type", "cursor_values"),
+    [
+        (datetime.datetime, int, (datetime.datetime(2024, 5, 1, 12, 30), 7)),
+        (int, UUID, (3, uuid4())),
+        (str, int, ("a/b+c", 1)),
+    ],
+)
+def test_round_trip(field_type, pk_type, cursor_values):
+    cursor = SeekCursor(field_type, pk_type)
+
+    encoded = cursor.encode(cursor_values)
+
+    assert cursor.decode(encoded) == cursor_values
+    # travels as a query parameter
+    assert "+" not in encoded
+    assert "/" not in encoded
+
+
+@pytest.mark.parametrize("encoded", ["not base64!", "", "bm90IGpzb24="])
+def test_decode_rejects_garbage(encoded):
+    with pytest.raises(ValueError):
+        SeekCursor(int, int).decode(encoded)
+
+
+def test_decode_rejects_cursor_of_other_types():
+    encoded = SeekCursor(str, int).encode(("name", 1))
+
+    with pytest.raises(ValueError):
+        SeekCursor(datetime.datetime, int).decode(encoded)
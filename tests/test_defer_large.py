@@ -0,0 +1,57 @@
+import pytest
+from sqlalchemy import event, insert
+
+from easy_api_autobuilder import BuilderArguments, ListArguments, SchemaCreationArguments
+from tests.conftest import NoteModel
+
+
+def deferred(**kwargs) -> BuilderArguments:
+    return BuilderArguments(
+        schema_creation_args=SchemaCreationArguments(
+            list_args=ListArguments(defer_large=True, **kwargs)
+        )
+    )
+
+
+@pytest.fixture
+async def notes(session_factory):
+    async with session_factory() as session:
+        await session.execute(insert(NoteModel), [{"title": "t", "body": "long"}])
+        await session.commit()
+
+
+@pytest.fixture
+def selects(engine):
+    statements = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def record(connection, cursor, statement, *args):  # noqa: WPS430
+        if statement.startswith("SELECT note"):
+            statements.append(statement)
+
+    return statements
+
+
+@pytest.mark.usefixtures("notes")
+async def test_list_leaves_large_columns_out(build, client, selects):
+    build("/notes", NoteModel, deferred())
+
+    response = await client.get("/notes")
+
+    assert response.json()["page_data"] == [{"id": 1, "title": "t"}]
+    (select_page,) = selects
+    assert "note.body" not in select_page
+
+    # the detail schema keeps them
+    response = await client.get("/notes/1")
+    assert response.json()["body"] == "long"
+
+
+@pytest.mark.usefixtures("notes")
+async def test_included_large_columns_stay(build, client, selects):
+    build("/notes", NoteModel, deferred(included={"body"}))
+
+    response = await client.get("/notes")
+
+    assert response.json()["page_data"][0]["body"] == "long"
+    assert "note.body" in selects[0]
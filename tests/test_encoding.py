@@ -0,0 +1,63 @@
+import pytest
+
+from easy_api_autobuilder import BuilderArguments, ResponseEncodingEnum
+from easy_api_autobuilder.response.response import quality_values
+from tests.conftest import AuthorModel
+
+msgpack = pytest.importorskip("msgpack")
+
+
+@pytest.fixture
+def encoded(build, authors):
+    arguments = BuilderArguments(
+        response_encoding=ResponseEncodingEnum.MSGPACK, gzip_min_size=1
+    )
+    build("/authors", AuthorModel, arguments)
+
+
+def test_quality_values():
+    qualities = quality_values("application/json;q=0.5, Application/MsgPack, */*;q=x")
+
+    assert qualities == {"application/json": 0.5, "application/msgpack": 1.0}
+
+
+@pytest.mark.usefixtures("encoded")
+@pytest.mark.parametrize(
+    ("accept", "media_type"),
+    [
+        ("", "application/json"),
+        ("*/*", "application/json"),
+        ("application/msgpack", "application/msgpack"),
+        ("application/json;q=0.5, application/x-msgpack", "application/x-msgpack"),
+        ("application/msgpack;q=0.5, application/json", "application/json"),
+        ("application/msgpack;q=0, */*", "application/json"),
+    ],
+)
+async def test_accept_negotiation(client, accept, media_type):
+    response = await client.get("/authors/1", headers={"accept": accept})
+
+    assert response.headers["content-type"] == media_type
+    if media_type == "application/json":
+        assert response.json()["name"] == "a1"
+    else:
+        assert msgpack.unpackb(response.content)["name"] == "a1"
+
+
+@pytest.mark.usefixtures("encoded")
+@pytest.mark.parametrize(
+    ("accept_encoding", "gzipped"),
+    [
+        ("gzip", True),
+        ("br, *", True),
+        ("gzip;q=0", False),
+        ("gzip;q=0, *", False),
+        ("identity", False),
+    ],
+)
+async def test_gzip_negotiation(client, accept_encoding, gzipped):
+    response = await client.get(
+        "/authors/1", headers={"accept-encoding": accept_encoding}
+    )
+
+    assert (response.headers.get("content-encoding") == "gzip") is gzipped
+    assert response.json()["name"] == "a1"
@@ -0,0 +1,58 @@
+import pytest
+from sqlalchemy import insert
+
+from easy_api_autobuilder import (
+    BuilderArguments,
+    DetailArguments,
+    ListArguments,
+    SchemaCreationArguments,
+)
+from tests.conftest import AuthorModel, BookModel
+
+expandable = BuilderArguments(
+    schema_creation_args=SchemaCreationArguments(
+        list_args=ListArguments(expand=True),
+        detail_args=DetailArguments(expand=True, nested=False),
+    )
+)
+
+
+@pytest.fixture
+async def books(authors, session_factory):
+    async with session_factory() as session:
+        await session.execute(
+            insert(BookModel),
+            [{"title": "t1", "author_id": 1}, {"title": "t2", "author_id": 1}],
+        )
+        await session.commit()
+
+
+@pytest.mark.usefixtures("books")
+async def test_detail_expand(build, client):
+    build("/authors", AuthorModel, expandable)
+
+    response = await client.get("/authors/1")
+    assert "books" not in response.json()
+
+    response = await client.get("/authors/1", params={"expand": "books"})
+    assert [book["title"] for book in response.json()["books"]] == ["t1", "t2"]
+
+
+@pytest.mark.usefixtures("books")
+async def test_list_expand(build, client, statements):
+    build("/authors", AuthorModel, expandable)
+
+    response = await client.get("/authors", params={"expand": "books", "size": 2})
+
+    page_data = response.json()["page_data"]
+    assert [len(author["books"]) for author in page_data] == [2, 0]
+    # count, page and one selectin load of the books, not one per author
+    assert len(statements) == 3
+
+
+async def test_unknown_expand(build, client):
+    build("/authors", AuthorModel, expandable)
+
+    response = await client.get("/authors", params={"expand": "bogus"})
+
+    assert response.status_code == 422
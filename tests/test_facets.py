@@ -0,0 +1,36 @@
+import pytest
+
+from easy_api_autobuilder import BuilderArguments, FacetArguments
+from tests.conftest import AuthorModel
+
+
+@pytest.mark.usefixtures("authors")
+async def test_facets(build, client, statements):
+    build("/authors", AuthorModel, BuilderArguments(facets=FacetArguments(limit=1)))
+
+    response = await client.get("/authors/facets", params={"fields": ["status"]})
+
+    facet = {"values": [{"value": "new", "count": 4}], "truncated": True}
+    assert response.json() == {"data": {"status": facet}}
+
+    queries = len(statements)
+    await client.get("/authors/facets", params={"fields": ["status"]})
+    assert len(statements) == queries
+
+    # writes of the route clear the cache
+    await client.post("/authors", json={"name": "b", "status": "done"})
+    response = await client.get(
+        "/authors/facets", params={"fields": ["status"], "name": "b"}
+    )
+    assert response.json()["data"]["status"]["values"] == [
+        {"value": "done", "count": 1}
+    ]
+
+
+@pytest.mark.usefixtures("authors")
+async def test_facets_unknown_field(build, client):
+    build("/authors", AuthorModel, BuilderArguments(facets=FacetArguments()))
+
+    response = await client.get("/authors/facets", params={"fields": ["bogus"]})
+
+    assert response.status_code == 422
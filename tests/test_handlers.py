@@ -0,0 +1,46 @@
+import inspect
+
+from fastapi.routing import APIRoute
+
+from easy_api_autobuilder import BuilderArguments
+from tests.conftest import AuthorModel
+
+
+def handler_parameters(view) -> dict[str, list[str]]:
+    return {
+        f"{next(iter(route.methods))} {route.path}": list(
+            inspect.signature(route.endpoint).parameters
+        )
+        for route in view.router.routes
+        if isinstance(route, APIRoute)
+    }
+
+
+def test_handlers_take_only_their_parameters(build):
+    view = build("/authors", AuthorModel)
+
+    parameters = handler_parameters(view)
+
+    assert parameters["GET /authors/{model_pk}"] == ["service", "model_pk"]
+    assert parameters["POST /authors"] == ["service", "body"]
+    assert parameters["PUT /authors/{model_pk}"] == ["service", "model_pk", "body"]
+    assert parameters["DELETE /authors/{model_pk}"] == ["service", "model_pk"]
+    assert parameters["GET /authors"][:2] == ["service", "request_params"]
+
+
+def test_stateless_handlers_take_the_session(build):
+    view = build("/authors", AuthorModel, BuilderArguments(stateless_services=True))
+
+    parameters = handler_parameters(view)
+
+    assert parameters["GET /authors/{model_pk}"] == ["db_session", "model_pk"]
+
+
+async def test_delete_answers_empty(build, client):
+    build("/authors", AuthorModel)
+    await client.post("/authors", json={"name": "a"})
+
+    response = await client.delete("/authors/1")
+
+    assert response.status_code == 204
+    assert response.content == b""
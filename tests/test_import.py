@@ -0,0 +1,154 @@
+import json
+from typing import AsyncIterator
+
+import pytest
+from sqlalchemy import event
+
+from easy_api_autobuilder import BuilderArguments, ImportArguments
+from easy_api_autobuilder.service.records import RecordTooLarge, iter_lines
+from tests.conftest import AuthorModel
+
+ndjson = {"content-type": "application/x-ndjson"}
+
+
+def import_arguments(**kwargs) -> BuilderArguments:
+    return BuilderArguments(bulk_import=ImportArguments(**kwargs))
+
+
+def records(*rows: dict) -> bytes:
+    return b"".join(json.dumps(row).encode() + b"\n" for row in rows)
+
+
+async def chunked(*chunks: bytes) -> AsyncIterator[bytes]:
+    for chunk in chunks:
+        yield chunk
+
+
+async def collect(chunks: AsyncIterator[bytes], max_line_bytes: int = 100) -> list:
+    return [line async for line in iter_lines(chunks, max_line_bytes)]
+
+
+async def test_iter_lines_joins_lines_split_over_chunks():
+    lines = await collect(chunked(b'{"a"', b': 1}\r\n{"b": 2}\n', b"", b'{"c": 3}'))
+
+    assert lines == [(1, b'{"a": 1}'), (2, b'{"b": 2}'), (3, b'{"c": 3}')]
+
+
+async def test_iter_lines_rejects_oversized_line():
+    with pytest.raises(RecordTooLarge) as error:
+        await collect(chunked(b"short\n", b"x" * 20, b"x" * 20), max_line_bytes=30)
+
+    assert error.value.line == 2
+
+
+async def test_import_ndjson(build, client, count_rows):
+    build("/authors", AuthorModel, import_arguments(chunk_size=2))
+
+    response = await client.post(
+        "/authors/import",
+        content=records(*({"name": f"a{index}"} for index in range(5))),
+        headers=ndjson,
+    )
+
+    assert response.status_code == 201
+    assert response.json() == {
+        "received": 5,
+        "inserted": 5,
+        "failed": 0,
+        "errors": [],
+        "aborted": False,
+    }
+    assert await count_rows(AuthorModel) == 5
+
+
+async def test_import_inserts_per_chunk(build, client, engine):
+    build("/authors", AuthorModel, import_arguments(chunk_size=2))
+    inserts = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def record(connection, cursor, statement, *args):  # noqa: WPS430
+        if statement.startswith("INSERT"):
+            inserts.append(statement)
+
+    await client.post(
+        "/authors/import",
+        content=records(*({"name": f"a{index}"} for index in range(5))),
+        headers=ndjson,
+    )
+
+    assert len(inserts) == 3
+
+
+async def test_import_reports_invalid_records(build, client, count_rows):
+    build("/authors", AuthorModel, import_arguments(max_errors=1))
+    body = b'{"name": "a"}\n{broken\n\n{"amount": 1}\n{"name": "b"}\n'
+
+    response = await client.post("/authors/import", content=body, headers=ndjson)
+
+    result = response.json()
+    assert result["received"] == 4
+    assert result["inserted"] == 2
+    assert result["failed"] == 2
+    assert not result["aborted"]
+    # bad JSON on line 2, the missing name of line 4 is over max_errors
+    assert [error["line"] for error in result["errors"]] == [2]
+    assert await count_rows(AuthorModel) == 2
+
+
+async def test_import_aborts_on_oversized_line(build, client, count_rows):
+    build("/authors", AuthorModel, import_arguments(max_line_bytes=64))
+    body = records({"name": "a"}, {"name": "x" * 100})
+
+    response = await client.post("/authors/import", content=body, headers=ndjson)
+
+    result = response.json()
+    assert result["aborted"]
+    assert result["inserted"] == 0
+    assert result["errors"][0]["line"] == 2
+    assert await count_rows(AuthorModel) == 0
+
+
+@pytest.mark.parametrize(
+    ("commit_per_chunk", "inserted"),
+    [(False, 0), (True, 2)],
+)
+async def test_import_failed_chunk(
+    build, client, count_rows, commit_per_chunk, inserted
+):
+    build(
+        "/authors",
+        AuthorModel,
+        import_arguments(chunk_size=2, commit_per_chunk=commit_per_chunk),
+    )
+    # the check constraint fails the second chunk
+    body = records(
+        {"name": "a"}, {"name": "b"}, {"name": "c"}, {"name": "d", "amount": -1}
+    )
+
+    response = await client.post("/authors/import", content=body, headers=ndjson)
+
+    result = response.json()
+    assert result["aborted"]
+    assert result["inserted"] == inserted
+    assert result["errors"][0]["line"] == 3
+    assert await count_rows(AuthorModel) == inserted
+
+
+async def test_import_csv(build, client):
+    build("/authors", AuthorModel, import_arguments())
+    body = 'name,amount,status\r\nc1,5,\r\n"c,2",7,old\r\nc3,bad,x\n'
+
+    response = await client.post(
+        "/authors/import", content=body, headers={"content-type": "text/csv"}
+    )
+
+    result = response.json()
+    assert result["inserted"] == 2
+    assert [error["line"] for error in result["errors"]] == [4]
+
+    response = await client.get("/authors", params={"name": "c,2"})
+    assert response.json()["page_data"][0]["amount"] == 7
+
+    # empty cells keep the schema default
+    response = await client.get("/authors", params={"name": "c1"})
+    assert response.json()["page_data"][0]["status"] == "new"
@@ -0,0 +1,39 @@
+import pytest
+from sqlalchemy import event
+
+from easy_api_autobuilder import (
+    BuilderArguments,
+    DataMapperBuilder,
+    ListQueryStrategyEnum,
+)
+from tests.conftest import AuthorModel
+
+concurrent = BuilderArguments(list_query_strategy=ListQueryStrategyEnum.CONCURRENT)
+
+
+@pytest.mark.usefixtures("authors")
+async def test_concurrent_list_matches_consistent(build, client, engine):
+    connections = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def record(connection, cursor, statement, *args):  # noqa: WPS430
+        connections.append(connection.connection.dbapi_connection)
+
+    build("/authors", AuthorModel, concurrent)
+    build("/consistent", AuthorModel)
+    params = {"page": 1, "size": 3, "status": "new"}
+
+    response = await client.get("/authors", params=params)
+    count_connection, page_connection = connections
+    consistent = await client.get("/consistent", params=params)
+
+    assert response.json() == consistent.json()
+    assert response.json()["total_pages"] == 2
+    assert len(response.json()["page_data"]) == 3
+    # count and page query on two pooled connections at once
+    assert count_connection is not page_connection
+
+
+def test_concurrent_requires_session_factory():
+    with pytest.raises(ValueError):
+        DataMapperBuilder("/authors", AuthorModel, arguments=concurrent).build()
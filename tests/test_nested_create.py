@@ -0,0 +1,78 @@
+import json
+
+import pytest
+from sqlalchemy import select
+
+from easy_api_autobuilder import (
+    BuilderArguments,
+    ImportArguments,
+    PostArguments,
+    SchemaCreationArguments,
+)
+from tests.conftest import AuthorModel, BookModel
+
+
+def nested_arguments(nested_create: set[str]) -> BuilderArguments:
+    return BuilderArguments(
+        schema_creation_args=SchemaCreationArguments(
+            post_args=PostArguments(nested_create=nested_create)
+        )
+    )
+
+
+async def test_post_creates_children(build, client, session_factory):
+    build("/authors", AuthorModel, nested_arguments({"books"}))
+
+    response = await client.post(
+        "/authors", json={"name": "a", "books": [{"title": "t1"}, {"title": "t2"}]}
+    )
+
+    assert response.status_code == 201
+    assert response.json() == {"id": 1, "books": [1, 2]}
+    async with session_factory() as session:
+        books = await session.execute(select(BookModel.title, BookModel.author_id))
+        assert books.all() == [("t1", 1), ("t2", 1)]
+
+
+async def test_post_without_children(build, client, count_rows):
+    build("/authors", AuthorModel, nested_arguments({"books"}))
+
+    response = await client.post("/authors", json={"name": "a"})
+
+    assert response.json() == {"id": 1, "books": []}
+    assert await count_rows(BookModel) == 0
+
+
+async def test_post_validates_children(build, client, count_rows):
+    build("/authors", AuthorModel, nested_arguments({"books"}))
+
+    response = await client.post("/authors", json={"name": "a", "books": [{}]})
+
+    assert response.status_code == 422
+    assert await count_rows(AuthorModel) == 0
+
+
+def test_rejects_unknown_relationship(build):
+    with pytest.raises(ValueError):
+        build("/authors", AuthorModel, nested_arguments({"tags"}))
+
+
+async def test_import_ignores_nested_create_children(build, client, count_rows):
+    arguments = BuilderArguments(
+        schema_creation_args=SchemaCreationArguments(
+            post_args=PostArguments(nested_create={"books"})
+        ),
+        bulk_import=ImportArguments(),
+    )
+    build("/authors", AuthorModel, arguments)
+    # children are not part of the import schema, not even validated
+    body = b"".join(
+        json.dumps(record).encode() + b"\n"
+        for record in ({"name": "a", "books": [{"title": "t"}, {}]}, {"name": "b"})
+    )
+
+    response = await client.post("/authors/import", content=body)
+
+    assert response.json()["inserted"] == 2
+    assert await count_rows(AuthorModel) == 2
+    assert await count_rows(BookModel) == 0
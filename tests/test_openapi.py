@@ -0,0 +1,74 @@
+import json
+
+import pytest
+from fastapi.openapi.utils import get_openapi
+
+from easy_api_autobuilder import (
+    BuilderArguments,
+    DataMapperBuilder,
+    OpenAPIArguments,
+    OpenAPIDocument,
+    SchemaRegistry,
+)
+from easy_api_autobuilder.builder import base as builder_module
+from tests.conftest import AuthorModel
+
+
+def schema_fragment(path: str, properties: dict) -> dict:
+    return {
+        "paths": {path: {"get": {"operationId": path}}},
+        "components": {"schemas": {"Author": {"properties": properties}}},
+    }
+
+
+def test_add_merges_same_components():
+    document = OpenAPIDocument()
+
+    document.add(schema_fragment("/a", {"id": {"type": "integer"}}))
+    document.add(schema_fragment("/b", {"id": {"type": "integer"}}), prefix="/v1")
+
+    assert set(document.document["paths"]) == {"/a", "/v1/b"}
+    assert list(document.document["components"]["schemas"]) == ["Author"]
+
+
+def test_add_rejects_conflicting_components():
+    document = OpenAPIDocument()
+    document.add(schema_fragment("/a", {"id": {"type": "integer"}}))
+
+    with pytest.raises(ValueError, match="components/schemas/Author"):
+        document.add(schema_fragment("/b", {"id": {"type": "string"}}))
+
+
+def test_install_matches_fastapi(build, app):
+    view = build("/authors", AuthorModel, BuilderArguments(openapi=OpenAPIArguments()))
+
+    @app.get("/health")
+    def health() -> dict:  # noqa: WPS430
+        return {}
+
+    expected = get_openapi(title=app.title, version=app.version, routes=app.routes)
+    OpenAPIDocument.for_app(app).install(app, [view])
+    document = app.openapi()
+
+    assert document["paths"] == expected["paths"]
+    assert document["components"] == expected["components"]
+
+
+def test_fragments_cached_on_disk(build, session_factory, tmp_path, monkeypatch):
+    arguments = BuilderArguments(openapi=OpenAPIArguments(cache_dir=str(tmp_path)))
+    view = build("/authors", AuthorModel, arguments)
+    assert len(list(tmp_path.glob("*.json"))) == 1
+
+    def not_generated(router):  # noqa: WPS430
+        raise AssertionError("fragment generated again")
+
+    monkeypatch.setattr(builder_module, "router_fragment", not_generated)
+    cached = DataMapperBuilder(
+        "/authors",
+        AuthorModel,
+        arguments=arguments,
+        session_factory=session_factory,
+        registry=SchemaRegistry(),
+    ).build()
+
+    assert cached.openapi_fragment == json.loads(json.dumps(view.openapi_fragment))
@@ -0,0 +1,69 @@
+import time
+
+import pytest
+
+from easy_api_autobuilder import ProfilingMiddleware, profile_token
+from tests.conftest import AuthorModel
+
+secret = "secret"
+
+
+def phases(response) -> set[str]:
+    server_timing = response.headers.get("server-timing")
+    if server_timing is None:
+        return set()
+
+    return {metric.split(";")[0] for metric in server_timing.split(", ")}
+
+
+@pytest.fixture
+def profiled(build, app):
+    build("/authors", AuthorModel)
+
+    def inner(**kwargs):  # noqa: WPS430
+        app.add_middleware(ProfilingMiddleware, secret=secret, **kwargs)
+
+    return inner
+
+
+@pytest.mark.usefixtures("authors")
+async def test_signed_request_gets_server_timing(profiled, client):
+    profiled()
+
+    response = await client.get(
+        "/authors", headers={"x-profile": profile_token(secret, "GET", "/authors")}
+    )
+
+    assert {"db", "validation", "total"} <= phases(response)
+
+
+@pytest.mark.parametrize(
+    "token",
+    [
+        None,
+        profile_token("other", "GET", "/authors"),
+        profile_token(secret, "GET", "/authors/1"),
+        profile_token(secret, "GET", "/authors", int(time.time()) - 3600),
+        "bogus",
+    ],
+)
+async def test_unsigned_requests_are_not_profiled(profiled, client, token):
+    profiled()
+    headers = {} if token is None else {"x-profile": token}
+
+    response = await client.get("/authors", headers=headers)
+
+    assert response.status_code == 200
+    assert phases(response) == set()
+
+
+async def test_sampled_requests_save_profiles(profiled, client, tmp_path):
+    output_dir = tmp_path / "profiles"
+    profiled(sample_rate=1, output_dir=output_dir, prefixes=("/authors",))
+
+    response = await client.get("/authors")
+    await client.get("/openapi.json")
+
+    assert "total" in phases(response)
+    (profile,) = output_dir.iterdir()
+    assert profile.name.endswith("-GET-authors.pstats")
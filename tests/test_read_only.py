@@ -0,0 +1,57 @@
+import pytest
+
+from easy_api_autobuilder import (
+    BuilderArguments,
+    ReadOnlyArguments,
+    StatementTimeout,
+    read_only,
+    read_only_options,
+    statement_timeout,
+)
+from easy_api_autobuilder.repo.timeouts import execute
+from tests.conftest import AuthorModel, slow_query
+
+@pytest.mark.usefixtures("authors")
+async def test_read_only_autocommit(build, client, statements):
+    arguments = BuilderArguments(read_only=ReadOnlyArguments(autocommit=True))
+    build("/authors", AuthorModel, arguments)
+
+    response = await client.get("/authors", params={"size": 2})
+    assert response.status_code == 200
+    assert {level for _, level in statements} == {"AUTOCOMMIT"}
+
+    statements.clear()
+    response = await client.post("/authors", json={"name": "b"})
+    assert response.status_code == 201
+    assert ("INSERT", None) in statements
+
+
+def test_read_only_options():
+    assert read_only_options(ReadOnlyArguments(autocommit=True), "sqlite") == {
+        "isolation_level": "AUTOCOMMIT"
+    }
+    # server side cursors need a transaction
+    assert read_only_options(
+        ReadOnlyArguments(autocommit=True), "postgresql", server_side=True
+    ) == {"postgresql_readonly": True}
+    assert read_only_options(ReadOnlyArguments(consistent=True), "postgresql") == {
+        "postgresql_readonly": True,
+        "isolation_level": "REPEATABLE READ",
+    }
+    assert read_only_options(ReadOnlyArguments(consistent=True), "sqlite") == {}
+
+
+async def test_statement_timeout_in_autocommit(session_factory):
+    read_only_token = read_only.set(ReadOnlyArguments(autocommit=True))
+    timeout_token = statement_timeout.set(0.01)
+    try:
+        async with session_factory() as session:
+            with pytest.raises(StatementTimeout):
+                await execute(session, slow_query)
+
+            connection = await session.connection()
+            options = connection.sync_connection.get_execution_options()
+            assert options["isolation_level"] == "AUTOCOMMIT"
+    finally:
+        statement_timeout.reset(timeout_token)
+        read_only.reset(read_only_token)
@@ -0,0 +1,64 @@
+import pytest
+
+from easy_api_autobuilder import (
+    BuilderArguments,
+    DetailArguments,
+    SchemaCreationArguments,
+    SchemaRegistry,
+)
+from easy_api_autobuilder.page import Page
+from easy_api_autobuilder.schema.registry import arguments_hash
+from tests.conftest import AuthorModel
+
+
+def without_status() -> BuilderArguments:
+    return BuilderArguments(
+        schema_creation_args=SchemaCreationArguments(
+            detail_args=DetailArguments(excluded={"status", "books"})
+        )
+    )
+
+
+def test_arguments_hash_ignores_ordering():
+    assert arguments_hash({"a": {1, 2, 3}, "b": 1}) == arguments_hash(
+        {"b": 1, "a": {3, 2, 1}}
+    )
+    assert arguments_hash({"a": {1}}) != arguments_hash({"a": {2}})
+
+
+def test_registry_builds_once():
+    registry = SchemaRegistry()
+
+    assert registry.enum("Fields", ["a", "b"]) is registry.enum("Fields", ["a", "b"])
+    assert registry.specialize(Page, list[int]) is registry.specialize(
+        Page, list[int]
+    )
+    # a taken name is suffixed, not replaced
+    assert registry.enum("Fields", ["c"]).__name__.startswith("Fields_")
+    assert registry.stats() == {"built": 3, "reused": 2, "entries": 3}
+
+
+def test_same_arguments_share_schemas(build):
+    build("/authors", AuthorModel)
+    built = build.registry.stats()["built"]
+
+    build("/again", AuthorModel)
+
+    assert build.registry.stats()["built"] == built
+
+
+@pytest.mark.usefixtures("authors")
+async def test_different_arguments_get_own_schemas(build, client, app):
+    build("/authors", AuthorModel)
+    build("/short", AuthorModel, without_status())
+
+    full = await client.get("/authors/1")
+    short = await client.get("/short/1")
+
+    assert full.json()["status"] == "done"
+    assert "status" not in short.json()
+    schemas = (await client.get("/openapi.json")).json()["components"]["schemas"]
+    assert {"AuthorSchemaDetail", "AuthorSchemaList"} <= set(schemas)
+    # the other detail schema under a suffixed name, the list schema shared
+    assert len([name for name in schemas if name.startswith("AuthorSchemaDetail")]) == 2
+    assert not any(name.startswith("AuthorSchemaList_") for name in schemas)
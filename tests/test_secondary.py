@@ -0,0 +1,64 @@
+import pytest
+from sqlalchemy import insert
+
+from easy_api_autobuilder import BuilderArguments, SecondaryBaseRepo
+from tests.conftest import AuthorModel, AuthorTagModel, TagModel
+
+
+@pytest.fixture
+def target_columns(monkeypatch):
+    """columns the target lists ask the repo for."""
+    calls = []
+    get_targets_by_page = SecondaryBaseRepo.get_targets_by_page
+
+    async def recorded(self, *args, **kwargs):  # noqa: WPS430
+        calls.append(kwargs.get("columns"))
+        return await get_targets_by_page(self, *args, **kwargs)
+
+    monkeypatch.setattr(SecondaryBaseRepo, "get_targets_by_page", recorded)
+    return calls
+
+
+@pytest.mark.usefixtures("authors")
+async def test_secondary_target_list(build, client, session_factory):
+    async with session_factory() as session:
+        await session.execute(
+            insert(TagModel),
+            [{"id": index, "label": f"t{index}"} for index in (1, 2, 3)],
+        )
+        await session.execute(
+            insert(AuthorTagModel),
+            [{"author_id": 1, "tag_id": 1}, {"author_id": 1, "tag_id": 3}],
+        )
+        await session.commit()
+
+    build(
+        "/authors",
+        AuthorModel,
+        secondary={"tags": (AuthorTagModel, None, TagModel)},
+    )
+
+    response = await client.get("/authors/1/tags")
+    assert response.status_code == 200
+    assert [tag["label"] for tag in response.json()["page_data"]] == ["t1", "t3"]
+
+    response = await client.get("/authors/2/tags")
+    assert response.json()["page_data"] == []
+
+
+@pytest.mark.parametrize(("core_reads", "projected"), [(False, False), (True, True)])
+@pytest.mark.usefixtures("authors")
+async def test_secondary_target_list_core_reads(
+    build, client, target_columns, core_reads, projected
+):
+    build(
+        "/authors",
+        AuthorModel,
+        BuilderArguments(core_reads=core_reads),
+        secondary={"tags": (AuthorTagModel, None, TagModel)},
+    )
+
+    response = await client.get("/authors/1/tags")
+
+    assert response.json()["page_data"] == []
+    assert (target_columns[0] is not None) is projected
@@ -0,0 +1,100 @@
+import pytest
+from sqlalchemy import insert, select, update
+
+from easy_api_autobuilder import (
+    BuilderArguments,
+    SlowQueryArguments,
+    SlowQueryLog,
+    StatementTimeout,
+    statement_timeout,
+)
+from easy_api_autobuilder.repo.slow_queries import slow_query_context
+from easy_api_autobuilder.repo.timeouts import execute
+from tests.conftest import AuthorModel, slow_query
+
+
+@pytest.fixture
+def slow_query_log():
+    slow_query_log = SlowQueryLog(threshold=0)
+    token = slow_query_context.set((slow_query_log, "test"))
+    yield slow_query_log
+    slow_query_context.reset(token)
+
+
+def logged(slow_query_log: SlowQueryLog, prefix: str) -> dict:
+    (shape,) = (
+        shape for shape in slow_query_log.top() if shape["sql"].startswith(prefix)
+    )
+    return shape
+
+
+async def test_insert_keeps_inserted_primary_key(session_factory, slow_query_log):
+    async with session_factory() as session:
+        result = await execute(session, insert(AuthorModel).values(name="a"))
+
+        assert result.inserted_primary_key[0] == 1
+        assert logged(slow_query_log, "INSERT")["rows"] == 1
+
+
+async def test_insert_returning_keeps_rows(session_factory, slow_query_log):
+    query = insert(AuthorModel).values(name="a").returning(AuthorModel.id)
+    async with session_factory() as session:
+        result = await execute(session, query)
+
+        assert result.scalar_one() == 1
+        assert logged(slow_query_log, "INSERT")["rows"] == 1
+
+
+async def test_update_logs_rowcount(session_factory, slow_query_log):
+    async with session_factory() as session:
+        await execute(session, insert(AuthorModel), [{"name": "a"}, {"name": "b"}])
+        await execute(session, update(AuthorModel).values(status="done"))
+
+    # ORM bulk insert, one row per parameter set
+    assert logged(slow_query_log, "INSERT")["rows"] == 2
+    assert logged(slow_query_log, "UPDATE")["rows"] == 2
+
+
+async def test_select_rows_stay_readable(session_factory, slow_query_log):
+    async with session_factory() as session:
+        await execute(session, insert(AuthorModel), [{"name": "a"}, {"name": "b"}])
+        result = await execute(session, select(AuthorModel.name))
+
+        assert result.scalars().all() == ["a", "b"]
+        assert logged(slow_query_log, "SELECT")["rows"] == 2
+
+
+async def test_routes_log_statements(build, client):
+    arguments = BuilderArguments(slow_queries=SlowQueryArguments(threshold_ms=0))
+    view = build("/authors", AuthorModel, arguments)
+
+    response = await client.post("/authors", json={"name": "a"})
+    assert response.json() == {"id": 1}
+
+    response = await client.put("/authors/1", json={"name": "b"})
+    assert response.status_code == 200
+    response = await client.get("/authors/1")
+    assert response.json()["name"] == "b"
+
+    routes = {
+        shape["sql"].split()[0]: (shape["route"], shape["rows"])
+        for shape in view.slow_query_log.top()
+    }
+    assert routes["INSERT"] == ("POST /authors", 1)
+    assert routes["UPDATE"] == ("PUT /authors/{model_pk}", 1)
+
+
+async def test_failed_statement_is_logged(session_factory, slow_query_log):
+    slow_query_log.explain = True
+    token = statement_timeout.set(0.01)
+    try:
+        async with session_factory() as session:
+            with pytest.raises(StatementTimeout):
+                await execute(session, slow_query)
+    finally:
+        statement_timeout.reset(token)
+
+    (shape,) = slow_query_log.top()
+    assert shape["error"] == "StatementTimeout"
+    assert shape["rows"] is None
+    assert shape["plan"] is None
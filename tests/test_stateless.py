@@ -0,0 +1,47 @@
+from typing import Any
+
+from easy_api_autobuilder import BaseRepo, BuilderArguments
+from tests.conftest import AuthorModel
+
+
+class CountingRepo(BaseRepo):
+    _cls_model = AuthorModel
+    instances = 0
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        CountingRepo.instances += 1
+
+
+async def test_stateless_services_are_built_once(build, client):
+    CountingRepo.instances = 0
+    arguments = BuilderArguments(stateless_services=True)
+    build("/authors", AuthorModel, arguments, repo=CountingRepo)
+    built = CountingRepo.instances
+
+    response = await client.post("/authors", json={"name": "a"})
+    assert response.status_code == 201
+    response = await client.put("/authors/1", json={"name": "b"})
+    assert response.status_code == 200
+    response = await client.get("/authors/1")
+    assert response.json()["name"] == "b"
+    response = await client.get("/authors")
+    assert response.json()["total_pages"] == 1
+    response = await client.delete("/authors/1")
+    assert response.status_code < 300
+    response = await client.get("/authors")
+    assert response.json()["page_data"] == []
+
+    # requests share the repo, each on its own session
+    assert CountingRepo.instances == built
+
+
+async def test_services_per_request_by_default(build, client):
+    CountingRepo.instances = 0
+    build("/authors", AuthorModel, repo=CountingRepo)
+    built = CountingRepo.instances
+
+    await client.post("/authors", json={"name": "a"})
+    await client.get("/authors/1")
+
+    assert CountingRepo.instances == built + 2
@@ -0,0 +1,154 @@
+import pytest
+from sqlalchemy import event, select
+
+from easy_api_autobuilder import (
+    AdmissionArguments,
+    BuilderArguments,
+    ListArguments,
+    ListQueryStrategyEnum,
+    ReadOnlyArguments,
+    SchemaCreationArguments,
+    SlowQueryArguments,
+    StatementTimeout,
+    statement_timeout,
+)
+from easy_api_autobuilder.repo.timeouts import stream
+from tests.conftest import AuthorModel, slow_query
+
+streamed = SchemaCreationArguments(list_args=ListArguments(stream=True))
+
+
+@pytest.mark.usefixtures("authors")
+async def test_streamed_list_matches_buffered(build, client):
+    build("/authors", AuthorModel, BuilderArguments(schema_creation_args=streamed))
+    build("/buffered", AuthorModel)
+
+    response = await client.get("/authors", params={"page": 1, "size": 4})
+    buffered = await client.get("/buffered", params={"page": 1, "size": 4})
+
+    assert response.status_code == 200
+    assert response.json() == buffered.json()
+    assert response.json()["total_pages"] == 2
+    assert len(response.json()["page_data"]) == 4
+
+
+async def test_streamed_empty_list(build, client):
+    build("/authors", AuthorModel, BuilderArguments(schema_creation_args=streamed))
+
+    response = await client.get("/authors")
+
+    assert response.json()["page_data"] == []
+
+
+@pytest.mark.usefixtures("authors")
+async def test_streamed_list_count_and_rows_share_a_transaction(build, client, engine):
+    transactions = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def record(connection, cursor, statement, *args):  # noqa: WPS430
+        transactions.append(connection.get_transaction())
+
+    arguments = BuilderArguments(
+        schema_creation_args=streamed,
+        read_only=ReadOnlyArguments(consistent=True),
+    )
+    build("/authors", AuthorModel, arguments)
+
+    response = await client.get("/authors", params={"page": 1, "size": 4})
+
+    assert len(response.json()["page_data"]) == 4
+    count_transaction, page_transaction = transactions
+    assert count_transaction is page_transaction is not None
+
+
+def test_consistent_rejects_concurrent_lists(build):
+    arguments = BuilderArguments(
+        list_query_strategy=ListQueryStrategyEnum.CONCURRENT,
+        read_only=ReadOnlyArguments(consistent=True),
+    )
+
+    with pytest.raises(ValueError):
+        build("/authors", AuthorModel, arguments)
+
+
+@pytest.mark.usefixtures("authors")
+async def test_streamed_rows_are_logged_for_the_route(build, client):
+    arguments = BuilderArguments(
+        schema_creation_args=streamed,
+        slow_queries=SlowQueryArguments(threshold_ms=0),
+    )
+    view = build("/authors", AuthorModel, arguments)
+
+    await client.get("/authors", params={"page": 1, "size": 4})
+
+    # the page query runs after the route returned, still under its log and route
+    (shape,) = (
+        shape
+        for shape in view.slow_query_log.top()
+        if "count" not in shape["sql"] and shape["sql"].startswith("SELECT")
+    )
+    assert shape["route"] == "GET /authors"
+    assert shape["rows"] == 4
+
+
+@pytest.mark.usefixtures("authors")
+async def test_streamed_list_keeps_admission_slot(build, app):
+    arguments = BuilderArguments(
+        schema_creation_args=streamed, admission=AdmissionArguments()
+    )
+    view = build("/authors", AuthorModel, arguments)
+    (controller,) = (
+        controller
+        for route, controller in view.admission_controllers.items()
+        if route == "GET /authors"
+    )
+    active_while_sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            active_while_sent.append(controller.active)
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.4"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/authors",
+        "raw_path": b"/authors",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"test")],
+        "server": ("test", 80),
+        "client": ("test", 1),
+    }
+    await app(scope, receive, send)
+
+    assert active_while_sent[0] == 1
+    assert controller.active == 0
+
+
+async def test_stream_over_deadline(session_factory):
+    token = statement_timeout.set(0.01)
+    try:
+        async with session_factory() as session:
+            with pytest.raises(StatementTimeout):
+                async for _partition in stream(session, slow_query, lambda rows: rows):
+                    pass
+    finally:
+        statement_timeout.reset(token)
+
+
+@pytest.mark.usefixtures("authors")
+async def test_stream_partitions(session_factory):
+    query = select(AuthorModel.name).execution_options(yield_per=4)
+    async with session_factory() as session:
+        partitions = [
+            partition
+            async for partition in stream(session, query, lambda rows: rows.scalars())
+        ]
+
+    assert partitions == [["a1", "a2", "a3", "a4"], ["a5", "a6"]]
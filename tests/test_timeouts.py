@@ -0,0 +1,65 @@
+from typing import Any
+
+import pytest
+from sqlalchemy import text
+
+from easy_api_autobuilder import (
+    BaseRepo,
+    BuilderArguments,
+    StatementTimeout,
+    StatementTimeoutArguments,
+    statement_timeout,
+)
+from easy_api_autobuilder.repo.timeouts import execute
+from tests.conftest import AuthorModel, slow_query
+
+class SlowRepo(BaseRepo):
+    _cls_model = AuthorModel
+
+    async def get(self, *, pkey_val: Any, **kwargs: Any) -> Any:
+        await self._execute(slow_query)
+        return await super().get(pkey_val=pkey_val, **kwargs)
+
+
+@pytest.fixture
+def timeout():
+    token = statement_timeout.set(0.01)
+    yield
+    statement_timeout.reset(token)
+
+
+def test_for_handler():
+    arguments = StatementTimeoutArguments(default=5, routes={"detail": 1, "list": None})
+
+    assert arguments.for_handler("detail") == 1
+    assert arguments.for_handler("list") is None
+    assert arguments.for_handler("post") == 5
+
+
+@pytest.mark.usefixtures("timeout")
+async def test_execute_raises_over_deadline(session_factory):
+    async with session_factory() as session:
+        with pytest.raises(StatementTimeout):
+            await execute(session, slow_query)
+
+
+@pytest.mark.usefixtures("timeout")
+async def test_execute_under_deadline(session_factory):
+    async with session_factory() as session:
+        assert (await execute(session, text("SELECT 1"))).scalar() == 1
+
+
+async def test_route_over_deadline(build, client):
+    arguments = BuilderArguments(
+        statement_timeouts=StatementTimeoutArguments(default=5, routes={"detail": 0.01})
+    )
+    build("/authors", AuthorModel, arguments, repo=SlowRepo)
+
+    response = await client.post("/authors", json={"name": "a"})
+    assert response.status_code == 201
+
+    response = await client.get(f"/authors/{response.json()['id']}")
+    assert response.status_code == 504
+
+    response = await client.get("/authors")
+    assert response.status_code == 200
@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+from fastapi import Depends
+from sqlalchemy import event
+
+from easy_api_autobuilder import (
+    BuilderArguments,
+    DataMapperBuilder,
+    FacetArguments,
+    WriteBehindArguments,
+    warmup_lifespan,
+)
+from tests.conftest import AuthorModel
+
+
+@pytest.mark.usefixtures("authors")
+async def test_warmup_runs_read_routes(build, engine):
+    view = build("/authors", AuthorModel)
+
+    result = await view.warmup(connections=2)
+
+    assert result == {"handlers": ["list", "detail"], "connections": 2}
+    assert engine.pool.checkedin() == 2
+
+
+async def test_warmup_skips_detail_of_empty_table(build):
+    view = build("/authors", AuthorModel)
+
+    result = await view.warmup()
+
+    assert result["handlers"] == ["list"]
+
+
+async def test_warmup_requires_session_factory(session_factory):
+    async def session():  # noqa: WPS430
+        async with session_factory() as db_session:
+            yield db_session
+
+    view = DataMapperBuilder(
+        "/authors", AuthorModel, session_dependency=Depends(session)
+    ).build()
+
+    with pytest.raises(ValueError):
+        await view.warmup()
+
+
+async def test_lifespan_flushes_writes_on_shutdown(build, app, count_rows):
+    arguments = BuilderArguments(
+        write_behind=WriteBehindArguments(max_latency_ms=60_000)
+    )
+    view = build("/authors", AuthorModel, arguments)
+
+    async with warmup_lifespan([view])(app):
+        create = asyncio.create_task(
+            view._main_service._write_batcher.submit({"name": "a"})
+        )
+        await asyncio.sleep(0)
+        assert await count_rows(AuthorModel) == 0
+
+    assert await create == 1
+    assert await count_rows(AuthorModel) == 1
+
+
+@pytest.mark.usefixtures("authors")
+async def test_warmup_runs_facets(build, engine):
+    grouped = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def record(connection, cursor, statement, *args):  # noqa: WPS430
+        if "GROUP BY" in statement:
+            grouped.append(statement)
+
+    view = build("/authors", AuthorModel, BuilderArguments(facets=FacetArguments()))
+
+    result = await view.warmup()
+
+    assert "facets" in result["handlers"]
+    # a facet query per filterable field, not an empty facets request
+    assert grouped
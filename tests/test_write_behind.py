@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+
+from easy_api_autobuilder import (
+    BuilderArguments,
+    StatementTimeout,
+    WriteBatcher,
+    WriteBehindArguments,
+    statement_timeout,
+)
+from tests.conftest import AuthorModel
+
+
+class RetryingBatcher(WriteBatcher):
+    retried = False
+
+    async def _flush_one_by_one(self, batch):
+        self.retried = True
+        await super()._flush_one_by_one(batch)
+
+
+async def test_concurrent_posts_share_a_commit(build, client, engine, count_rows):
+    commits = []
+    event.listen(engine.sync_engine, "commit", commits.append)
+    arguments = BuilderArguments(write_behind=WriteBehindArguments(max_latency_ms=50))
+    build("/authors", AuthorModel, arguments)
+
+    responses = await asyncio.gather(
+        *(client.post("/authors", json={"name": f"a{index}"}) for index in range(5))
+    )
+
+    assert sorted(response.json()["id"] for response in responses) == [1, 2, 3, 4, 5]
+    assert await count_rows(AuthorModel) == 5
+    assert len(commits) == 1
+
+
+async def test_bad_row_fails_alone(session_factory, count_rows):
+    batcher = RetryingBatcher(AuthorModel, session_factory, max_latency=0.05)
+
+    results = await asyncio.gather(
+        batcher.submit({"name": "a", "amount": 1}),
+        batcher.submit({"name": "b", "amount": -1}),
+        batcher.submit({"name": "c", "amount": 2}),
+        return_exceptions=True,
+    )
+
+    assert batcher.retried
+    assert results[0] != results[2]
+    assert isinstance(results[1], IntegrityError)
+    assert await count_rows(AuthorModel) == 2
+
+
+async def test_timeout_fails_the_batch(session_factory, count_rows):
+    batcher = RetryingBatcher(AuthorModel, session_factory, max_latency=0.05)
+    # the flush runs under the deadline of the route that started it
+    token = statement_timeout.set(0)
+    try:
+        results = await asyncio.gather(
+            batcher.submit({"name": "a"}),
+            batcher.submit({"name": "b"}),
+            return_exceptions=True,
+        )
+    finally:
+        statement_timeout.reset(token)
+
+    assert not batcher.retried
+    assert [type(result) for result in results] == [StatementTimeout] * 2
+    assert await count_rows(AuthorModel) == 0
+
+
+async def test_cancelled_submit_is_dropped(session_factory, count_rows):
+    batcher = WriteBatcher(AuthorModel, session_factory, max_latency=10)
+    submit = asyncio.create_task(batcher.submit({"name": "a"}))
+    await asyncio.sleep(0)
+
+    submit.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await submit
+    await batcher.close()
+
+    assert await count_rows(AuthorModel) == 0